@@ -1,10 +1,24 @@
 import bisect
+import contextlib
 import csv
+import hashlib
+import io
+import json
 import math
+import os
 import re
-from dataclasses import dataclass
+import shutil
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from itertools import islice, product
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
 try:
     from pythonfmu import Fmi2Causality, Fmi2Variability
     from pythonfmu.fmi2slave import Fmi2Slave
@@ -15,12 +29,11 @@ except ModuleNotFoundError:
     PYTHONFMU_AVAILABLE = False
 
 
-DATASET_FILES = {
-    2: "Test-18000s-ch1-ch2-5s_260204221347248_CH2.csv",
-    6: "Trial-interval-Every3600s-For30s-CH3-Ch6_260123103224255_CH6.csv",
-}
-
-RAW_DATA_DIR = Path("data") / "ae_event_statistics" / "raw"
+AE_DATA_DIR = Path("data") / "ae_event_statistics"
+RAW_DATA_DIR = AE_DATA_DIR / "raw"
+DATASET_MANIFEST = AE_DATA_DIR / "datasets.json"
+# Raw files not listed in the manifest are indexed by their channel suffix, e.g. "..._CH6.csv" -> 6.
+CHANNEL_FILE_PATTERN = re.compile(r"_CH(\d+)\.csv$", re.IGNORECASE)
 
 METRIC_COLUMNS = {
     "amplitude": "Amplitude",
@@ -32,6 +45,43 @@ METRIC_COLUMNS = {
     "average_frequency": "AverageFreq",
 }
 
+TABLE_COLUMNS = ("elapsed_seconds", *METRIC_COLUMNS)
+
+DEFAULT_CHUNK_ROWS = 16384
+# Byte ranges for parallel summaries: at least this large, read in blocks of PARALLEL_BLOCK_BYTES.
+PARALLEL_MIN_RANGE_BYTES = 4 * 1024**2
+PARALLEL_BLOCK_BYTES = 2 * 1024**2
+
+# summarize_events outputs "<column>_p<q>" for each listed percentile and "<column>_max" for SUMMARY_MAXIMA.
+SUMMARY_PERCENTILES = {
+    "amplitude": (50, 95),
+    "rms": (50, 95),
+    "asl": (50, 95),
+    "frequency_centroid": (50,),
+    "peak_frequency": (50,),
+    "average_frequency": (50,),
+}
+SUMMARY_MAXIMA = ("amplitude", "rms", "asl")
+# Columns whose sorted order save_event_table stores: every percentile column (rolling ones are a subset).
+RANKED_COLUMNS = tuple(SUMMARY_PERCENTILES)
+# Frequency band lower edges in kHz for the band histograms; the last band is open-ended.
+FREQUENCY_BAND_EDGES_KHZ = (0.0, 100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0, 800.0, 900.0)
+BAND_COLUMNS = ("frequency_centroid", "peak_frequency")
+ROLLING_OUTPUTS = (
+    "current_time_seconds",
+    "rolling_event_rate_hz",
+    "rolling_amplitude_p95",
+    "rolling_rms_p95",
+    "rolling_asl_p95",
+    "cumulative_energy",
+)
+
+CACHE_DIR_ENV = "AE_EVENT_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "AE_EVENT_CACHE_MAX_BYTES"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024**3
+CACHE_DIGEST_BYTES = 1024**2
+TABLE_FORMAT = 3
+
 
 @dataclass(frozen=True)
 class AEEvent:
@@ -45,16 +95,57 @@ class AEEvent:
     average_frequency: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class AEEventTable:
-    events: tuple[AEEvent, ...]
+    """Columnar AE hit table: one contiguous float64 array per entry in TABLE_COLUMNS."""
+
+    columns: dict[str, np.ndarray]
     invalid_rows: int
     metadata: dict[str, str]
     source_path: Path
+    # column name -> (sorted values, rank of each row in that order); see ranked_column().
+    ranked: dict[str, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    # Absolute arrival time (seconds on the acquisition clock) of elapsed_seconds == 0.
+    start_seconds: float = 0.0
+
+    @classmethod
+    def from_events(cls, events, invalid_rows=0, metadata=None, source_path=None):
+        events = list(events)
+        columns = {
+            name: np.fromiter((getattr(event, name) for event in events), dtype=np.float64, count=len(events))
+            for name in TABLE_COLUMNS
+        }
+        return cls(columns, invalid_rows, dict(metadata or {}), Path(source_path or ""))
+
+    def __len__(self):
+        return len(self.times)
+
+    def column(self, name):
+        return self.columns[name]
 
     @property
     def times(self):
-        return [event.elapsed_seconds for event in self.events]
+        return self.columns["elapsed_seconds"]
+
+    def ranked_column(self, name):
+        """Return ``(sorted_values, ranks)`` for a column, computing it on first use.
+
+        Tables opened from a converted dataset carry these arrays memory-mapped,
+        so order statistics need no per-process sort or copy.
+        """
+        if name not in self.ranked:
+            values = self.columns[name]
+            order = np.argsort(values, kind="stable")
+            ranks = np.empty(len(values), dtype=np.int64)
+            ranks[order] = np.arange(len(values))
+            self.ranked[name] = (values[order], ranks)
+        return self.ranked[name]
+
+    @cached_property
+    def events(self):
+        # Row view for callers that still iterate AEEvent objects; built on first access only.
+        rows = zip(*(self.columns[name].tolist() for name in TABLE_COLUMNS))
+        return tuple(AEEvent(*row) for row in rows)
 
 
 def parse_arrival_time(raw):
@@ -71,114 +162,884 @@ def parse_arrival_time(raw):
     return (((day * 24 + hour) * 60 + minute) * 60 + second) + fraction
 
 
-def resolve_dataset_path(dataset_id, root=None):
-    dataset_id = int(dataset_id)
-    filename = DATASET_FILES.get(dataset_id)
-    if not filename:
-        raise ValueError(f"unsupported AE dataset_id {dataset_id}")
+def parse_arrival_times(raw_values):
+    """Vectorised parse_arrival_time over a column of strings.
+
+    Returns ``(seconds, valid)`` with NaN in ``seconds`` where ``valid`` is False.
+    A byte scanner decodes plain ``D:HH:MM:SS:fff ffffff`` values; anything else
+    (signs, tabs, non-ASCII digits, over-long fields, malformed rows) is retried
+    with parse_arrival_time, so the result is bit-for-bit identical to calling
+    the scalar function per row.
+    """
+    raw_values = list(raw_values)
+    seconds = np.full(len(raw_values), np.nan)
+    try:
+        valid = _decode_arrival_times(np.array(raw_values, dtype=np.bytes_), seconds)
+    except UnicodeEncodeError:
+        valid = np.zeros(len(raw_values), dtype=bool)
+
+    for index in np.flatnonzero(~valid):
+        try:
+            seconds[index] = parse_arrival_time(raw_values[index])
+        except Exception:
+            continue
+        valid[index] = True
+    return seconds, valid
+
+
+def _decode_arrival_times(text, seconds):
+    count = len(text)
+    if not count or not text.itemsize:
+        return np.zeros(count, dtype=bool)
+
+    grid = text.view(np.uint8).reshape(count, text.itemsize)
+    field_index = np.zeros(count, dtype=np.int8)
+    field_digits = np.zeros(count, dtype=np.int8)
+    whole = np.zeros((4, count), dtype=np.int64)
+    mantissa = np.zeros(count, dtype=np.int64)
+    scale = np.zeros(count, dtype=np.int8)
+    ok = np.ones(count, dtype=bool)
+    ended = np.zeros(count, dtype=bool)
+
+    for column in grid.T:
+        value = column.astype(np.int64) - 48
+        digit = (value >= 0) & (value <= 9)
+        colon = column == 58
+        padding = column == 0
+        ok &= ~(ended & ~padding)
+        ended |= padding
+        in_fraction = field_index == 4
+
+        # Day/hour/minute/second: plain ASCII digits only, at most 9 per field.
+        integer_digit = digit & ~in_fraction & ~padding
+        for index in range(4):
+            target = integer_digit & (field_index == index)
+            whole[index] = np.where(target, whole[index] * 10 + value, whole[index])
+        field_digits += integer_digit
+        ok &= field_digits <= 9
+
+        # Fraction: digits accumulate into an exact mantissa, other characters are dropped.
+        fraction_digit = digit & in_fraction & ~padding
+        mantissa = np.where(fraction_digit, mantissa * 10 + value, mantissa)
+        scale += fraction_digit
+        ok &= scale <= 15
+
+        ok &= ~(colon & (in_fraction | (field_digits == 0)))
+        advance = colon & ~in_fraction
+        field_index += advance
+        field_digits[advance] = 0
+
+        leading_space = (column == 32) & (field_index == 0) & (field_digits == 0)
+        ok &= ~(~digit & ~colon & ~padding & ~in_fraction & ~leading_space)
+
+    ok &= field_index == 4
+    day, hour, minute, second = whole
+    total = ((day * 24 + hour) * 60 + minute) * 60 + second
+    # mantissa < 2**53 and 10**scale is exact, so the division is correctly
+    # rounded exactly like float("0.<digits>").
+    fraction = mantissa / np.power(10.0, scale)
+    np.copyto(seconds, total.astype(np.float64) + fraction, where=ok)
+    return ok
+
+
+@dataclass(frozen=True)
+class AEDataset:
+    dataset_id: int
+    path: Path
+
+    @cached_property
+    def metadata(self):
+        """CSV header metadata (sensor location, sampling rate, ...), read once on first use."""
+        with self.path.open("r", encoding="utf-8-sig", errors="replace", newline="") as handle:
+            metadata, _ = _read_header(handle, self.path)
+        return metadata
+
+    @property
+    def sensor_location(self):
+        return self.metadata.get("Sensor location", "")
+
+    @property
+    def sampling_rate_hz(self):
+        return parse_sampling_rate(self.metadata.get("Sensor sampling rate", ""))
+
+
+class DatasetCatalog:
+    """Maps AE dataset ids (and numbered groups of ids) to raw hit files.
+
+    Built once per search root from ``data/ae_event_statistics/datasets.json``
+    plus a scan of the raw directory for ``*_CH<n>.csv`` files. Roots are
+    searched in order and the first existing file for an id wins.
+    """
 
+    def __init__(self, datasets, groups=None):
+        self._datasets = dict(datasets)
+        self._groups = {int(group_id): tuple(ids) for group_id, ids in (groups or {}).items()}
+
+    @classmethod
+    def discover(cls, roots):
+        candidates = {}
+        groups = {}
+        for root in roots:
+            root = Path(root)
+            manifest_path = root / DATASET_MANIFEST
+            if manifest_path.is_file():
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+                for dataset_id, entry in manifest.get("datasets", {}).items():
+                    candidates.setdefault(int(dataset_id), []).append(root / AE_DATA_DIR / entry["file"])
+                for group_id, entry in manifest.get("groups", {}).items():
+                    groups.setdefault(int(group_id), [int(value) for value in entry["datasets"]])
+            raw_dir = root / RAW_DATA_DIR
+            if raw_dir.is_dir():
+                for path in sorted(raw_dir.glob("*.csv")):
+                    match = CHANNEL_FILE_PATTERN.search(path.name)
+                    if match:
+                        candidates.setdefault(int(match.group(1)), []).append(path)
+
+        datasets = {}
+        for dataset_id, paths in candidates.items():
+            path = next((path for path in paths if path.is_file()), paths[0])
+            datasets[dataset_id] = AEDataset(dataset_id, path)
+        return cls(datasets, groups)
+
+    def __contains__(self, dataset_id):
+        return int(dataset_id) in self._datasets
+
+    def ids(self):
+        return sorted(self._datasets)
+
+    def get(self, dataset_id):
+        dataset = self._datasets.get(int(dataset_id))
+        if dataset is None:
+            raise ValueError(f"unsupported AE dataset_id {dataset_id}")
+        return dataset
+
+    def group(self, group_id):
+        ids = self._groups.get(int(group_id))
+        if ids is None:
+            raise ValueError(f"unknown AE dataset group {group_id}")
+        return list(ids)
+
+
+@lru_cache(maxsize=None)
+def dataset_catalog(root=None):
+    """Catalog for ``root`` (then cwd, /app and the repository root), built once per process."""
     roots = []
     if root:
         roots.append(Path(root))
     roots.extend([Path.cwd(), Path("/app"), Path(__file__).resolve().parents[1]])
+    return DatasetCatalog.discover(roots)
+
+
+def resolve_dataset_path(dataset_id, root=None):
+    return dataset_catalog(str(root) if root else None).get(dataset_id).path
 
-    for candidate_root in roots:
-        candidate = candidate_root / RAW_DATA_DIR / filename
-        if candidate.exists():
-            return candidate
 
-    return Path.cwd() / RAW_DATA_DIR / filename
+def parse_sampling_rate(raw):
+    """Sampling rate in Hz from a header value such as ``=1/1000000`` (sample interval) or ``1000000``."""
+    text = str(raw).strip().lstrip("=").replace(" ", "")
+    try:
+        if "/" in text:
+            numerator, denominator = (float(part) for part in text.split("/", 1))
+            return denominator / numerator if numerator else 0.0
+        return float(text) if text else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _capture_spans(tables):
+    return [(table.start_seconds, table.start_seconds + float(table.times[-1])) for table in tables if len(table)]
+
+
+def channels_overlap(tables):
+    """True if the channels were recorded together: every first hit precedes every other last hit.
+
+    Arrival times only carry day-of-month and time of day, so channels from
+    separate captures would land on one clock days apart.
+    """
+    spans = _capture_spans(tables)
+    return not spans or max(start for start, _ in spans) <= min(end for _, end in spans)
 
 
-def load_event_table(path):
+def merge_event_tables(tables):
+    """Merge channel tables into one time-sorted table on their shared acquisition clock.
+
+    The channels must overlap in time (see channels_overlap).
+    """
+    tables = list(tables)
+    if len(tables) == 1:
+        return tables[0]
+
+    if not channels_overlap(tables):
+        raise ValueError("AE channels do not overlap in time; they are separate captures and cannot be merged")
+    spans = _capture_spans(tables)
+    origin = min(start for start, _ in spans) if spans else 0.0
+    shifted = [table.times + (table.start_seconds - origin) for table in tables]
+    times = np.concatenate(shifted) if shifted else np.empty(0)
+    order = np.argsort(times, kind="stable")
+    columns = {"elapsed_seconds": times[order]}
+    for name in METRIC_COLUMNS:
+        columns[name] = np.concatenate([table.column(name) for table in tables])[order]
+
+    first, *rest = tables
+    metadata = {
+        key: value
+        for key, value in first.metadata.items()
+        if all(table.metadata.get(key) == value for table in rest)
+    }
+    invalid_rows = sum(table.invalid_rows for table in tables)
+    return AEEventTable(columns, invalid_rows, metadata, Path(""), start_seconds=origin)
+
+
+def converted_dataset_path(raw_path):
+    """Directory holding the save_event_table conversion of a raw file (``raw/`` -> ``converted/``)."""
+    raw_path = Path(raw_path)
+    return raw_path.parent.parent / "converted" / raw_path.stem
+
+
+def open_dataset(dataset_id, root=None):
+    """Load a dataset, preferring an up-to-date converted copy, then the parse cache."""
+    path = resolve_dataset_path(dataset_id, root)
+    converted = converted_dataset_path(path)
+    if is_current_conversion(converted, path):
+        return open_event_table(converted, path)
+    return load_cached_event_table(path)
+
+
+def load_event_table(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream an AE hit CSV into an AEEventTable, holding at most one chunk of row text."""
     path = Path(path)
-    lines = path.read_text(encoding="utf-8-sig", errors="replace").splitlines()
-    header_index = None
-    for index, line in enumerate(lines):
-        if line.startswith("Arrival time,"):
-            header_index = index
-            break
-    if header_index is None:
-        raise ValueError(f"{path} does not contain an AE event header")
+    values = {name: array("d") for name in TABLE_COLUMNS}
+    invalid_rows = 0
+    with path.open("r", encoding="utf-8-sig", errors="replace", newline="") as handle:
+        metadata, header = _read_header(handle, path)
+        positions = _column_positions(header)
+        while True:
+            chunk = list(islice(handle, max(1, int(chunk_rows))))
+            if not chunk:
+                break
+            invalid_rows += _parse_rows(csv.reader(chunk), positions, values)
+
+    return _build_table(values, invalid_rows, metadata, path)
 
+
+def _read_header(lines, path):
     metadata = {}
-    for line in lines[:header_index]:
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("Arrival time,"):
+            return metadata, next(csv.reader([line]))
         if "," not in line or not line.strip():
             continue
         key, value = line.split(",", 1)
         key = key.strip().rstrip(":")
         if key:
             metadata[key] = value.strip()
+    raise ValueError(f"{path} does not contain an AE event header")
 
-    events = []
+
+def _column_positions(header):
+    # Later duplicates win, matching csv.DictReader; missing columns make every row invalid.
+    index = {name: position for position, name in enumerate(header)}
+    return [index.get("Arrival time")] + [index.get(column) for column in METRIC_COLUMNS.values()]
+
+
+def _parse_rows(rows, positions, values):
+    if any(position is None for position in positions):
+        return sum(1 for row in rows if row)
+
+    width = max(positions) + 1
+    pick = itemgetter(*positions)
+    fields = []
     invalid_rows = 0
-    first_arrival = None
-    reader = csv.DictReader(lines[header_index:])
-    for row in reader:
-        try:
-            absolute_time = parse_arrival_time(row["Arrival time"])
-            values = {
-                name: _parse_float(row[column])
-                for name, column in METRIC_COLUMNS.items()
-            }
-        except Exception:
+    for row in rows:
+        if len(row) >= width:
+            fields.append(pick(row))
+        elif row:
             invalid_rows += 1
-            continue
+    if not fields:
+        return invalid_rows
 
-        if first_arrival is None:
-            first_arrival = absolute_time
-        events.append(
-            AEEvent(
-                elapsed_seconds=absolute_time - first_arrival,
-                amplitude=values["amplitude"],
-                rms=values["rms"],
-                asl=values["asl"],
-                energy=values["energy"],
-                frequency_centroid=values["frequency_centroid"],
-                peak_frequency=values["peak_frequency"],
-                average_frequency=values["average_frequency"],
-            )
+    arrival, *metrics = zip(*fields)
+    del fields
+    parsed, valid = parse_arrival_times(arrival)
+    columns = [parsed]
+    for raw_values in metrics:
+        column, column_valid = _parse_floats(raw_values)
+        columns.append(column)
+        valid &= column_valid
+
+    for name, column in zip(TABLE_COLUMNS, columns):
+        values[name].frombytes(column[valid].tobytes())
+    return invalid_rows + int(np.count_nonzero(~valid))
+
+
+def _build_table(values, invalid_rows, metadata, path):
+    columns = {name: np.asarray(values[name], dtype=np.float64) for name in TABLE_COLUMNS}
+    times = columns["elapsed_seconds"]
+    start_seconds = 0.0
+    if len(times):
+        # Elapsed time is measured from the first valid row in file order, then rows are time-sorted.
+        start_seconds = float(times[0])
+        times -= times[0]
+        order = np.argsort(times, kind="stable")
+        if np.any(order[1:] < order[:-1]):
+            columns = {name: column[order] for name, column in columns.items()}
+    return AEEventTable(columns, invalid_rows, metadata, path, start_seconds=start_seconds)
+
+
+def load_cached_event_table(path, cache_dir=None, max_bytes=None):
+    """load_event_table backed by an on-disk columnar cache.
+
+    Entries are keyed by the source path, size, mtime and a digest of the
+    first/last CACHE_DIGEST_BYTES of the file. Hits are memory-mapped read-only;
+    misses are parsed, written for the next run and evict the least recently
+    used entries beyond ``max_bytes``. Cache I/O errors fall back to parsing.
+    """
+    path = Path(path)
+    directory = _cache_directory(cache_dir)
+    if directory is None:
+        return load_event_table(path)
+
+    try:
+        entry = directory / _cache_entry_name(path)
+    except OSError:
+        return load_event_table(path)
+
+    try:
+        table = _read_cache_entry(entry, path)
+    except (OSError, ValueError, KeyError):
+        table = None
+    if table is not None:
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        return table
+
+    table = load_event_table(path)
+    with contextlib.suppress(OSError, ValueError):
+        _write_cache_entry(entry, table)
+        _evict_cache_entries(directory, _cache_max_bytes(max_bytes), keep=entry)
+        # Serve the mapped copy so the parsed arrays (and the rankings computed
+        # while writing) are released instead of held per process.
+        table = open_event_table(entry, path)
+    return table
+
+
+def _cache_directory(cache_dir):
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "cads-fmi-demo" / "ae_event_tables"
+    if str(cache_dir).strip().lower() in {"", "0", "off", "none"}:
+        return None
+    return Path(cache_dir)
+
+
+def _cache_max_bytes(max_bytes):
+    if max_bytes is None:
+        max_bytes = os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_CACHE_MAX_BYTES)
+    return int(max_bytes)
+
+
+def _cache_entry_name(path):
+    resolved = path.resolve()
+    stat = resolved.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    with resolved.open("rb") as handle:
+        digest.update(handle.read(CACHE_DIGEST_BYTES))
+        if stat.st_size > CACHE_DIGEST_BYTES:
+            handle.seek(max(CACHE_DIGEST_BYTES, stat.st_size - CACHE_DIGEST_BYTES))
+            digest.update(handle.read())
+    fingerprint = hashlib.blake2b(
+        f"{TABLE_FORMAT}:{resolved}:{stat.st_size}:{stat.st_mtime_ns}:{digest.hexdigest()}".encode(),
+        digest_size=12,
+    ).hexdigest()
+    # Entries share a per-source prefix so a rewrite of the file drops its stale entry.
+    source_key = hashlib.blake2b(str(resolved).encode(), digest_size=8).hexdigest()
+    return f"{source_key}-{fingerprint}"
+
+
+def save_event_table(table, directory):
+    """Write a table as memory-mappable .npy columns plus the RANKED_COLUMNS orderings and a manifest."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in TABLE_COLUMNS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(table.column(name)))
+    for name in RANKED_COLUMNS:
+        sorted_values, ranks = table.ranked_column(name)
+        np.save(directory / f"{name}.sorted.npy", np.ascontiguousarray(sorted_values))
+        np.save(directory / f"{name}.rank.npy", np.ascontiguousarray(ranks))
+
+    manifest = {
+        "format": TABLE_FORMAT,
+        "source_path": str(table.source_path),
+        "rows": len(table),
+        "invalid_rows": table.invalid_rows,
+        "start_seconds": table.start_seconds,
+        "metadata": table.metadata,
+        "ranked": list(RANKED_COLUMNS),
+    }
+    source = Path(table.source_path)
+    if source.is_file():
+        stat = source.stat()
+        manifest.update(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+    (directory / "table.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def open_event_table(directory, source_path=None):
+    """Open a table written by save_event_table with every array memory-mapped read-only.
+
+    Pages are shared through the OS page cache, so any number of FMU instances
+    or processes reading the same dataset hold a single copy in memory.
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / "table.json").read_text(encoding="utf-8"))
+    if manifest.get("format") != TABLE_FORMAT:
+        raise ValueError(f"{directory} has unsupported table format {manifest.get('format')!r}")
+
+    rows = int(manifest["rows"])
+    columns = {name: _open_array(directory / f"{name}.npy", rows) for name in TABLE_COLUMNS}
+    ranked = {
+        name: (
+            _open_array(directory / f"{name}.sorted.npy", rows),
+            _open_array(directory / f"{name}.rank.npy", rows),
         )
+        for name in manifest.get("ranked", [])
+    }
+    source_path = Path(source_path or manifest.get("source_path", ""))
+    return AEEventTable(
+        columns,
+        int(manifest["invalid_rows"]),
+        dict(manifest["metadata"]),
+        source_path,
+        ranked=ranked,
+        start_seconds=float(manifest["start_seconds"]),
+    )
+
+
+def is_current_conversion(directory, source_path):
+    """True when ``directory`` holds a conversion of ``source_path`` as it is on disk now."""
+    try:
+        manifest = json.loads((Path(directory) / "table.json").read_text(encoding="utf-8"))
+        stat = Path(source_path).stat()
+    except (OSError, ValueError):
+        return False
+    return (
+        manifest.get("format") == TABLE_FORMAT
+        and manifest.get("source_size") == stat.st_size
+        and manifest.get("source_mtime_ns") == stat.st_mtime_ns
+    )
+
 
-    events.sort(key=lambda event: event.elapsed_seconds)
-    return AEEventTable(tuple(events), invalid_rows, metadata, path)
+def _open_array(path, rows):
+    array_ = np.load(path, mmap_mode="r")
+    if len(array_) != rows:
+        raise ValueError(f"{path} has {len(array_)} rows, expected {rows}")
+    return array_
 
 
-def summarize_events(table):
-    events = table.events
-    duration = events[-1].elapsed_seconds if events else 0.0
-    event_count = len(events)
+def _read_cache_entry(entry, path):
+    if not (entry / "table.json").exists():
+        return None
+    return open_event_table(entry, path)
+
+
+def _write_cache_entry(entry, table):
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=entry.parent))
+    try:
+        save_event_table(table, staging)
+        source_key = entry.name.split("-", 1)[0]
+        for stale in entry.parent.glob(f"{source_key}-*"):
+            if stale != entry:
+                shutil.rmtree(stale, ignore_errors=True)
+        os.replace(staging, entry)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _evict_cache_entries(directory, max_bytes, keep):
+    entries = []
+    for entry in directory.iterdir():
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        size = sum(item.stat().st_size for item in entry.iterdir())
+        entries.append((entry.stat().st_mtime, size, entry))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        if entry == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def summarize_events(table, quantile_accuracy=0.0):
+    """Whole-capture statistics with a single order-statistics pass per metric column.
+
+    With ``quantile_accuracy`` > 0 the percentiles come from a QuantileSketch
+    with that relative error bound instead of an exact sort.
+    """
+    times = table.times
+    event_count = len(times)
+    duration = float(times[-1]) if event_count else 0.0
     summary = {
         "event_count": event_count,
         "invalid_rows": table.invalid_rows,
         "duration_seconds": duration,
         "event_rate_hz": event_count / duration if duration > 0 else 0.0,
-        "energy_sum": sum(event.energy for event in events),
+        "energy_sum": float(np.sum(table.column("energy"))),
     }
 
-    for source, prefix in [
-        ("amplitude", "amplitude"),
-        ("rms", "rms"),
-        ("asl", "asl"),
-    ]:
-        values = [getattr(event, source) for event in events]
-        summary[f"{prefix}_p50"] = percentile(values, 50)
-        summary[f"{prefix}_p95"] = percentile(values, 95)
-        summary[f"{prefix}_max"] = max(values) if values else 0.0
-
-    for source, output_name in [
-        ("frequency_centroid", "frequency_centroid_p50"),
-        ("peak_frequency", "peak_frequency_p50"),
-        ("average_frequency", "average_frequency_p50"),
-    ]:
-        summary[output_name] = percentile([getattr(event, source) for event in events], 50)
+    for source, quantiles in SUMMARY_PERCENTILES.items():
+        if quantile_accuracy > 0:
+            values, maximum = _column_sketch_statistics(table, source, quantiles, quantile_accuracy)
+        else:
+            values, maximum = _column_order_statistics(table, source, quantiles)
+        for q, value in zip(quantiles, values):
+            summary[f"{source}_p{q}"] = value
+        if source in SUMMARY_MAXIMA:
+            summary[f"{source}_max"] = maximum
 
     return summary
 
 
+def _column_sketch_statistics(table, name, quantiles, quantile_accuracy):
+    values = table.column(name)
+    sketch = QuantileSketch(quantile_accuracy)
+    for start in range(0, len(values), DEFAULT_CHUNK_ROWS):
+        sketch.add(values[start : start + DEFAULT_CHUNK_ROWS])
+    finite = values[np.isfinite(values)]
+    maximum = float(np.max(finite)) if len(finite) else 0.0
+    return [sketch.quantile(q) for q in quantiles], maximum
+
+
+def _column_order_statistics(table, name, quantiles):
+    ranked = table.ranked.get(name)
+    if ranked is None:
+        return percentiles(table.column(name), quantiles, with_max=True)
+    # Already sorted (e.g. memory-mapped): read the finite range in place.
+    sorted_values = ranked[0]
+    lower = int(np.searchsorted(sorted_values, -np.inf, side="right"))
+    upper = int(np.searchsorted(sorted_values, np.inf, side="left"))
+    values = [
+        _interpolate_rank(lambda k: float(sorted_values[lower + k]), upper - lower, q)
+        for q in quantiles
+    ]
+    return values, float(sorted_values[upper - 1]) if upper > lower else 0.0
+
+
+def summarize_file(path, workers=None, quantile_accuracy=0.0, min_range_bytes=PARALLEL_MIN_RANGE_BYTES):
+    """summarize_events(load_event_table(path)) computed over byte ranges in worker processes.
+
+    The data rows are split on line boundaries into up to ``workers`` ranges of
+    at least ``min_range_bytes``; each range is parsed into a PartialSummary
+    and the partials are merged in file order. Exact partials carry the
+    distinct values of each column with their counts; with
+    ``quantile_accuracy`` > 0 they carry QuantileSketch instances.
+    """
+    path = Path(path)
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    with path.open("rb") as handle:
+        lines = (line.decode("utf-8-sig", errors="replace") for line in handle)
+        _, header = _read_header(lines, path)
+        data_start = handle.tell()
+    positions = _column_positions(header)
+    ranges = _line_ranges(path, data_start, workers, min_range_bytes)
+
+    tasks = [(path, start, end, positions, quantile_accuracy) for start, end in ranges]
+    if len(tasks) == 1:
+        partials = [_summarize_range(*tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            partials = list(pool.map(_summarize_range, *zip(*tasks)))
+
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged.merge(partial)
+    return merged.summary()
+
+
+def _line_ranges(path, start, count, min_range_bytes):
+    """Split [start, EOF) into at most ``count`` byte ranges that begin on a line start."""
+    size = path.stat().st_size
+    count = max(1, min(count, (size - start) // max(1, int(min_range_bytes))))
+    bounds = [start]
+    with path.open("rb") as handle:
+        for index in range(1, count):
+            handle.seek(start + (size - start) * index // count - 1)
+            handle.readline()
+            position = handle.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _summarize_range(path, start, end, positions, quantile_accuracy):
+    partial = PartialSummary(quantile_accuracy)
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = handle.read(min(remaining, PARALLEL_BLOCK_BYTES))
+            if not block:
+                break
+            if len(block) < remaining and not block.endswith(b"\n"):
+                # Ranges end on a line start, so finishing this line stays inside the range.
+                block += handle.readline()
+            remaining -= len(block)
+            values = {name: array("d") for name in TABLE_COLUMNS}
+            rows = csv.reader(io.StringIO(block.decode("utf-8", errors="replace"), newline=""))
+            partial.invalid_rows += _parse_rows(rows, positions, values)
+            partial.add({name: np.frombuffer(column, dtype=np.float64) for name, column in values.items()})
+    return partial
+
+
+class PartialSummary:
+    """Mergeable summarize_events aggregates for a contiguous run of AE rows.
+
+    Partials must be merged in file order: elapsed time is measured from the
+    first valid row of the earliest non-empty partial. Exact percentiles come
+    from _ValueCounts, so adding rows and taking a summary cost O(new rows)
+    plus O(distinct values), never O(rows so far).
+    """
+
+    def __init__(self, quantile_accuracy=0.0):
+        self.quantile_accuracy = quantile_accuracy
+        self.event_count = 0
+        self.invalid_rows = 0
+        self.first_arrival = None
+        self.last_arrival = -math.inf
+        self.energy_sum = 0.0
+        self.maxima = dict.fromkeys(SUMMARY_PERCENTILES, -math.inf)
+        if quantile_accuracy > 0:
+            self.columns = {name: QuantileSketch(quantile_accuracy) for name in SUMMARY_PERCENTILES}
+        else:
+            self.columns = {name: _ValueCounts() for name in SUMMARY_PERCENTILES}
+
+    def add(self, columns):
+        """Aggregate parsed rows; ``elapsed_seconds`` holds absolute arrival times in file order."""
+        arrivals = columns["elapsed_seconds"]
+        if not len(arrivals):
+            return
+        if self.first_arrival is None:
+            self.first_arrival = float(arrivals[0])
+        self.last_arrival = max(self.last_arrival, float(np.max(arrivals)))
+        self.event_count += len(arrivals)
+        self.energy_sum += float(np.sum(columns["energy"]))
+        for name, aggregate in self.columns.items():
+            values = columns[name]
+            finite = values[np.isfinite(values)]
+            if len(finite):
+                self.maxima[name] = max(self.maxima[name], float(np.max(finite)))
+            aggregate.add(values if self.quantile_accuracy > 0 else finite)
+
+    def merge(self, other):
+        """Fold in the partial that follows this one in the file."""
+        if self.first_arrival is None:
+            self.first_arrival = other.first_arrival
+        self.last_arrival = max(self.last_arrival, other.last_arrival)
+        self.event_count += other.event_count
+        self.invalid_rows += other.invalid_rows
+        self.energy_sum += other.energy_sum
+        for name, aggregate in self.columns.items():
+            self.maxima[name] = max(self.maxima[name], other.maxima[name])
+            aggregate.merge(other.columns[name])
+        return self
+
+    def summary(self):
+        duration = self.last_arrival - self.first_arrival if self.event_count else 0.0
+        summary = {
+            "event_count": self.event_count,
+            "invalid_rows": self.invalid_rows,
+            "duration_seconds": duration,
+            "event_rate_hz": self.event_count / duration if duration > 0 else 0.0,
+            "energy_sum": self.energy_sum,
+        }
+        for source, quantiles in SUMMARY_PERCENTILES.items():
+            aggregate = self.columns[source]
+            if self.quantile_accuracy > 0:
+                values = [aggregate.quantile(q) for q in quantiles]
+            else:
+                values = [_interpolate_rank(aggregate.select, aggregate.count, q) for q in quantiles]
+            for q, value in zip(quantiles, values):
+                summary[f"{source}_p{q}"] = value
+            if source in SUMMARY_MAXIMA:
+                maximum = self.maxima[source]
+                summary[f"{source}_max"] = maximum if maximum > -math.inf else 0.0
+        return summary
+
+
+class _ValueCounts:
+    """Exact multiset of finite values kept as sorted distinct values with their counts.
+
+    AE metrics are quantised by the acquisition system (0.1 dB, 0.1 kHz, ...),
+    so the number of distinct values u stays small however many hits arrive.
+    Adding k values costs O(k log u) when they were seen before and an O(u)
+    insert otherwise; select() takes one O(u) cumulative sum after a change.
+    Columns of unquantised values make u grow with the row count; use
+    quantile_accuracy > 0 for those.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.float64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.count = 0
+        self._cumulative = None
+
+    def add(self, values):
+        if len(values):
+            self._add_counts(*np.unique(values, return_counts=True))
+
+    def merge(self, other):
+        if other.count:
+            self._add_counts(other.values, other.counts)
+        return self
+
+    def select(self, k):
+        """Return the k-th smallest (0-based) value."""
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self.counts)
+        return float(self.values[np.searchsorted(self._cumulative, k, side="right")])
+
+    def _add_counts(self, distinct, counts):
+        positions = np.searchsorted(self.values, distinct)
+        known = positions < len(self.values)
+        known[known] = self.values[positions[known]] == distinct[known]
+        self.counts[positions[known]] += counts[known]
+        if not known.all():
+            new = ~known
+            self.values = np.insert(self.values, positions[new], distinct[new])
+            self.counts = np.insert(self.counts, positions[new], counts[new])
+        self.count += int(counts.sum())
+        self._cumulative = None
+
+
+class EventTableFollower:
+    """Tail an AE hit CSV that the acquisition system is still appending to.
+
+    poll() parses only the complete lines written after the last consumed byte
+    offset, so its cost follows the number of new hits; the prefix is never
+    read again. ``table`` is an AEEventTable over the rows consumed so far and
+    summary() the matching summarize_events dict, both grown in place.
+    """
+
+    def __init__(self, path, quantile_accuracy=0.0):
+        self.path = Path(path)
+        self.quantile_accuracy = quantile_accuracy
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.appended = []
+        self.restarted = False
+        self.metadata = {}
+        self._positions = None
+        self._count = 0
+        self._buffers = {name: np.empty(DEFAULT_CHUNK_ROWS, dtype=np.float64) for name in TABLE_COLUMNS}
+        self._partial = PartialSummary(self.quantile_accuracy)
+        self._update_table()
+
+    def poll(self):
+        """Consume newly appended lines; return the index of the first changed row, or None.
+
+        Rows normally land at the end of the table; a hit older than the last
+        consumed one is merged into place and the returned index points there.
+        Until the next poll, ``appended`` holds the new rows as column dicts,
+        and ``restarted`` is set if the file shrank and was re-read from row 0.
+        """
+        first_changed = None
+        self.appended = []
+        self.restarted = False
+        with self.path.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size < self.offset:
+                self.reset()
+                self.restarted = True
+                first_changed = 0
+            handle.seek(self.offset)
+            while True:
+                block = handle.read(PARALLEL_BLOCK_BYTES)
+                if block and not block.endswith(b"\n"):
+                    block += handle.readline()
+                complete = block.rfind(b"\n") + 1
+                if not complete:
+                    break
+                changed = self._consume(block[:complete])
+                if changed is False:
+                    break
+                self.offset += complete
+                if changed is not None and (first_changed is None or changed < first_changed):
+                    first_changed = changed
+                if complete < len(block):
+                    break
+        if first_changed is not None:
+            self._update_table()
+        return first_changed
+
+    def summary(self):
+        return self._partial.summary()
+
+    def _consume(self, data):
+        lines = io.StringIO(data.decode("utf-8-sig" if not self.offset else "utf-8", errors="replace"), newline="")
+        if self._positions is None:
+            try:
+                self.metadata, header = _read_header(lines, self.path)
+            except ValueError:
+                # The header has not been written completely yet; retry from the same offset.
+                return False
+            self._positions = _column_positions(header)
+
+        values = {name: array("d") for name in TABLE_COLUMNS}
+        self._partial.invalid_rows += _parse_rows(csv.reader(lines), self._positions, values)
+        columns = {name: np.frombuffer(column, dtype=np.float64) for name, column in values.items()}
+        if not len(columns["elapsed_seconds"]):
+            return None
+        self._partial.add(columns)
+        return self._append(columns)
+
+    def _append(self, columns):
+        added = len(columns["elapsed_seconds"])
+        count = self._count + added
+        capacity = len(self._buffers["elapsed_seconds"])
+        if count > capacity:
+            capacity = max(count, 2 * capacity)
+            for name, buffer in self._buffers.items():
+                grown = np.empty(capacity, dtype=np.float64)
+                grown[: self._count] = buffer[: self._count]
+                self._buffers[name] = grown
+
+        times = columns["elapsed_seconds"] - self._partial.first_arrival
+        self.appended.append({**columns, "elapsed_seconds": times})
+        existing = self._buffers["elapsed_seconds"][: self._count]
+        first_changed = self._count
+        earliest = float(np.min(times))
+        if self._count and earliest < existing[-1]:
+            # Late hit: re-sort the affected tail together with the new rows.
+            first_changed = int(np.searchsorted(existing, earliest, side="right"))
+        order = np.argsort(np.concatenate([existing[first_changed:], times]), kind="stable")
+        for name, buffer in self._buffers.items():
+            new_values = times if name == "elapsed_seconds" else columns[name]
+            buffer[first_changed:count] = np.concatenate([buffer[first_changed : self._count], new_values])[order]
+        self._count = count
+        return first_changed
+
+    def _update_table(self):
+        self.table = AEEventTable(
+            {name: buffer[: self._count] for name, buffer in self._buffers.items()},
+            self._partial.invalid_rows,
+            self.metadata,
+            self.path,
+            start_seconds=self._partial.first_arrival or 0.0,
+        )
+
+
 def rolling_metrics(table, current_time, window_seconds):
-    events = table.events
-    if not events:
+    times = table.times
+    if not len(times):
         return {
             "current_time_seconds": current_time,
             "rolling_event_rate_hz": 0.0,
@@ -188,38 +1049,610 @@ def rolling_metrics(table, current_time, window_seconds):
             "cumulative_energy": 0.0,
         }
 
-    times = table.times
-    end_index = bisect.bisect_right(times, current_time + 1e-12)
+    end_index = int(np.searchsorted(times, current_time + 1e-12, side="right"))
     window_start = max(0.0, current_time - max(window_seconds, 0.0))
-    start_index = bisect.bisect_left(times, window_start - 1e-12, 0, end_index)
-    window_events = events[start_index:end_index]
+    start_index = int(np.searchsorted(times[:end_index], window_start - 1e-12, side="left"))
+    window = slice(start_index, end_index)
     elapsed_window = current_time - window_start
-    cumulative_events = events[:end_index]
 
     return {
         "current_time_seconds": current_time,
-        "rolling_event_rate_hz": len(window_events) / elapsed_window if elapsed_window > 0 else 0.0,
-        "rolling_amplitude_p95": percentile([event.amplitude for event in window_events], 95),
-        "rolling_rms_p95": percentile([event.rms for event in window_events], 95),
-        "rolling_asl_p95": percentile([event.asl for event in window_events], 95),
-        "cumulative_energy": sum(event.energy for event in cumulative_events),
+        "rolling_event_rate_hz": (end_index - start_index) / elapsed_window if elapsed_window > 0 else 0.0,
+        "rolling_amplitude_p95": percentile(table.column("amplitude")[window], 95),
+        "rolling_rms_p95": percentile(table.column("rms")[window], 95),
+        "rolling_asl_p95": percentile(table.column("asl")[window], 95),
+        "cumulative_energy": float(np.sum(table.column("energy")[:end_index])),
     }
 
 
+class RollingWindow:
+    """Incremental rolling_metrics for a time-sorted table queried at non-decreasing times.
+
+    Window bounds only move forward, so each step touches just the events that
+    enter or leave the window. Percentiles come from per-metric order statistics
+    and match percentile() exactly, or from a QuantileSketch when
+    ``quantile_accuracy`` > 0. A query earlier than the previous one rewinds
+    the window from the start of the table.
+
+    With ``follow`` the table may grow between updates (see extend()); exact
+    percentiles then come from a sorted copy of the window instead of ranks
+    over the whole table, and late hits are inserted into the current window
+    instead of rebuilding it.
+    """
+
+    PERCENTILE_COLUMNS = ("amplitude", "rms", "asl")
+
+    def __init__(self, table, window_seconds, quantile_accuracy=0.0, follow=False):
+        self.table = table
+        self.window_seconds = float(window_seconds)
+        self.follow = follow
+        self._times = table.times
+        self._energy = table.column("energy")
+        if quantile_accuracy > 0:
+            self._order_stats = {
+                name: _SketchStatistics(table.column(name), quantile_accuracy)
+                for name in self.PERCENTILE_COLUMNS
+            }
+        elif follow:
+            self._order_stats = {name: _SortedWindowStatistics(table.column(name)) for name in self.PERCENTILE_COLUMNS}
+        else:
+            self._order_stats = {
+                name: _OrderStatistics(table.column(name), *table.ranked_column(name))
+                for name in self.PERCENTILE_COLUMNS
+            }
+        self.reset()
+
+    def reset(self):
+        self._start = 0
+        self._end = 0
+        self._last_time = -math.inf
+        self._cumulative_energy = 0.0
+        for stats in self._order_stats.values():
+            stats.clear()
+
+    def extend(self, table, first_changed=None, added=None):
+        """Continue over ``table``, the followed table after rows from ``first_changed`` on changed.
+
+        ``added`` holds the new rows (EventTableFollower.appended). Those at or
+        before the last update time are folded into the window state in place;
+        without ``added`` such a change resets the window.
+        """
+        if not self.follow:
+            raise ValueError("RollingWindow.extend requires follow=True")
+        self.table = table
+        self._times = table.times
+        self._energy = table.column("energy")
+        for name, stats in self._order_stats.items():
+            stats.values = table.column(name)
+        if first_changed is None or first_changed >= self._end:
+            return
+        if added is None:
+            self.reset()
+            return
+
+        window_start = max(0.0, self._last_time - max(self.window_seconds, 0.0))
+        for columns in added:
+            times = columns["elapsed_seconds"]
+            ended = times <= self._last_time + 1e-12
+            self._cumulative_energy += float(np.sum(columns["energy"][ended]))
+            in_window = ended & (times >= window_start - 1e-12)
+            for name, stats in self._order_stats.items():
+                stats.add_values(columns[name][in_window])
+        self._end = int(np.searchsorted(self._times, self._last_time + 1e-12, side="right"))
+        self._start = min(int(np.searchsorted(self._times, window_start - 1e-12, side="left")), self._end)
+
+    def update(self, current_time):
+        current_time = float(current_time)
+        if current_time < self._last_time:
+            self.reset()
+        self._last_time = current_time
+
+        times = self._times
+        end_index = int(np.searchsorted(times, current_time + 1e-12, side="right"))
+        window_start = max(0.0, current_time - max(self.window_seconds, 0.0))
+        start_index = int(np.searchsorted(times, window_start - 1e-12, side="left"))
+        start_index = max(self._start, min(start_index, end_index))
+
+        if end_index > self._end:
+            self._cumulative_energy += float(np.sum(self._energy[self._end:end_index]))
+            for stats in self._order_stats.values():
+                stats.add_range(max(self._end, start_index), end_index)
+        for stats in self._order_stats.values():
+            stats.remove_range(self._start, min(start_index, self._end))
+        self._start = start_index
+        self._end = end_index
+
+        elapsed_window = current_time - window_start
+        stats = self._order_stats
+        return {
+            "current_time_seconds": current_time,
+            "rolling_event_rate_hz": (end_index - start_index) / elapsed_window if elapsed_window > 0 else 0.0,
+            "rolling_amplitude_p95": stats["amplitude"].percentile(95),
+            "rolling_rms_p95": stats["rms"].percentile(95),
+            "rolling_asl_p95": stats["asl"].percentile(95),
+            "cumulative_energy": self._cumulative_energy,
+        }
+
+
+@dataclass(frozen=True, eq=False)
+class RollingTrace:
+    """rolling_metrics precomputed for the FMU step grid 0, step, 2 * step, ...
+
+    Row k of ``values`` holds the ROLLING_OUTPUTS at min(k * step, duration),
+    i.e. exactly what AEEventStats reports after a step ending at k * step.
+    """
+
+    values: np.ndarray
+    window_seconds: float
+    step_seconds: float
+
+    def sample(self, current_time):
+        """ROLLING_OUTPUTS at ``current_time``, or None when it is not on the step grid."""
+        index = round(current_time / self.step_seconds)
+        if index < 0 or abs(index * self.step_seconds - current_time) > 1e-9 * max(1.0, abs(current_time)):
+            return None
+        row = self.values[min(index, len(self.values) - 1)]
+        return dict(zip(ROLLING_OUTPUTS, row.tolist()))
+
+
+def compute_rolling_trace(table, window_seconds, step_seconds):
+    """Sweep rolling_metrics over the whole step grid at once.
+
+    Window bounds come from vectorised searchsorted calls and cumulative
+    energy from a prefix sum. Windowed percentiles sort each window slice, or
+    take one forward pass of the Fenwick order statistics when the windows
+    overlap so much that per-slice sorting would cost more.
+    """
+    step_seconds = float(step_seconds)
+    if step_seconds <= 0:
+        raise ValueError(f"step_seconds must be positive, got {step_seconds}")
+    window_seconds = float(window_seconds)
+    times = table.times
+    duration = float(times[-1]) if len(times) else 0.0
+    sample_times = np.minimum(np.arange(math.ceil(duration / step_seconds) + 1) * step_seconds, duration)
+
+    ends = np.searchsorted(times, sample_times + 1e-12, side="right")
+    window_starts = np.maximum(0.0, sample_times - max(window_seconds, 0.0))
+    starts = np.minimum(np.searchsorted(times, window_starts - 1e-12, side="left"), ends)
+    elapsed_window = sample_times - window_starts
+    counts = (ends - starts).astype(np.float64)
+
+    values = np.zeros((len(sample_times), len(ROLLING_OUTPUTS)))
+    values[:, 0] = sample_times
+    np.divide(counts, elapsed_window, out=values[:, 1], where=elapsed_window > 0)
+    values[:, 5] = np.concatenate([[0.0], np.cumsum(table.column("energy"))])[ends]
+
+    for column, name in enumerate(RollingWindow.PERCENTILE_COLUMNS, start=2):
+        values[:, column] = _windowed_percentiles(table, name, starts.tolist(), ends.tolist(), 95)
+
+    return RollingTrace(values, window_seconds, step_seconds)
+
+
+def _windowed_percentiles(table, name, starts, ends, q):
+    column = table.column(name)
+    # Sorting each window slice in NumPy beats per-event Fenwick updates in Python
+    # unless the windows overlap heavily (long window, fine grid).
+    if sum(ends) - sum(starts) <= 64 * len(column):
+        return [percentile(column[start:end], q) for start, end in zip(starts, ends)]
+
+    stats = _OrderStatistics(column, *table.ranked_column(name))
+    results = []
+    start = end = 0
+    for window_start, window_end in zip(starts, ends):
+        stats.add_range(max(end, window_start), window_end)
+        stats.remove_range(start, min(window_start, end))
+        start, end = window_start, window_end
+        results.append(stats.percentile(q))
+    return results
+
+
+def rolling_trace_path(raw_path, window_seconds, step_seconds):
+    """Directory for the RollingTrace of a raw file, next to its converted table.
+
+    The parameters are written with repr(), which round-trips every float, so
+    distinct window or step values never share a directory.
+    """
+    return converted_dataset_path(raw_path) / f"rolling-w{float(window_seconds)!r}-s{float(step_seconds)!r}"
+
+
+def save_rolling_trace(trace, directory, source_path=None):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "trace.npy", np.ascontiguousarray(trace.values))
+    manifest = {
+        "format": TABLE_FORMAT,
+        "columns": list(ROLLING_OUTPUTS),
+        "rows": len(trace.values),
+        "window_seconds": trace.window_seconds,
+        "step_seconds": trace.step_seconds,
+    }
+    if source_path is not None and Path(source_path).is_file():
+        stat = Path(source_path).stat()
+        manifest.update(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+    (directory / "trace.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def open_rolling_trace(directory, source_path=None, window_seconds=None, step_seconds=None):
+    """Memory-map a saved RollingTrace.
+
+    Returns None if it is missing, older than ``source_path``, or was computed
+    for a different ``window_seconds``/``step_seconds`` (compared exactly).
+    """
+    directory = Path(directory)
+    try:
+        manifest = json.loads((directory / "trace.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != TABLE_FORMAT or manifest.get("columns") != list(ROLLING_OUTPUTS):
+            return None
+        for key, requested in (("window_seconds", window_seconds), ("step_seconds", step_seconds)):
+            if requested is not None and float(manifest[key]) != float(requested):
+                return None
+        if source_path is not None:
+            stat = Path(source_path).stat()
+            if (manifest.get("source_size"), manifest.get("source_mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+                return None
+        values = _open_array(directory / "trace.npy", int(manifest["rows"]))
+    except (OSError, ValueError, KeyError):
+        return None
+    return RollingTrace(values, float(manifest["window_seconds"]), float(manifest["step_seconds"]))
+
+
+class EventHistograms:
+    """Time-binned hit counts and energy plus per-band frequency hit counts.
+
+    Every quantity is one np.bincount over a batch of rows. add() accumulates
+    batches, so a followed table is binned as it grows. Time bins are
+    [k * bin_seconds, (k + 1) * bin_seconds) on the elapsed clock; band k
+    holds frequencies in [band_edges[k], band_edges[k + 1]), the last band
+    being open-ended.
+    """
+
+    def __init__(self, bin_seconds=60.0, band_edges=FREQUENCY_BAND_EDGES_KHZ):
+        bin_seconds = float(bin_seconds)
+        if bin_seconds <= 0:
+            raise ValueError(f"bin_seconds must be positive, got {bin_seconds}")
+        self.bin_seconds = bin_seconds
+        self.band_edges = np.asarray(band_edges, dtype=np.float64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.energy = np.zeros(0, dtype=np.float64)
+        self.band_counts = {name: np.zeros(len(self.band_edges), dtype=np.int64) for name in BAND_COLUMNS}
+
+    @classmethod
+    def from_table(cls, table, bin_seconds=60.0, band_edges=FREQUENCY_BAND_EDGES_KHZ):
+        histograms = cls(bin_seconds, band_edges)
+        histograms.add(table.columns)
+        return histograms
+
+    def add(self, columns):
+        """Bin a batch of rows (``elapsed_seconds``, ``energy`` and the BAND_COLUMNS)."""
+        times = np.asarray(columns["elapsed_seconds"])
+        if not len(times):
+            return
+        bins = np.maximum(np.floor(times / self.bin_seconds), 0).astype(np.int64)
+        size = max(len(self.counts), int(bins.max()) + 1)
+        self.counts = _grow(self.counts, size) + np.bincount(bins, minlength=size)
+        self.energy = _grow(self.energy, size) + np.bincount(bins, weights=columns["energy"], minlength=size)
+        for name, counts in self.band_counts.items():
+            values = np.asarray(columns[name])
+            values = values[np.isfinite(values)]
+            bands = np.maximum(np.searchsorted(self.band_edges, values, side="right") - 1, 0)
+            counts += np.bincount(bands, minlength=len(counts))
+
+    def completed_bin(self, current_time):
+        """(count, energy) of the last bin that ends at or before ``current_time``."""
+        index = math.floor(current_time / self.bin_seconds + 1e-9) - 1
+        if 0 <= index < len(self.counts):
+            return int(self.counts[index]), float(self.energy[index])
+        return 0, 0.0
+
+    def band_labels(self):
+        return band_labels(self.band_edges)
+
+    def to_dict(self):
+        """JSON-ready section for a workflow result file."""
+        return {
+            "bin_seconds": self.bin_seconds,
+            "bin_start_seconds": (np.arange(len(self.counts)) * self.bin_seconds).tolist(),
+            "event_count": self.counts.tolist(),
+            "energy_sum": self.energy.tolist(),
+            "band_edges_khz": self.band_edges.tolist(),
+            "band_counts": {
+                name: dict(zip(self.band_labels(), counts.tolist())) for name, counts in self.band_counts.items()
+            },
+        }
+
+
+def band_labels(band_edges):
+    """Labels such as ``100_200khz`` and ``500khz_plus`` for the bands of EventHistograms."""
+    edges = [f"{float(edge):g}" for edge in band_edges]
+    return [f"{lower}_{upper}khz" for lower, upper in zip(edges, edges[1:])] + [f"{edges[-1]}khz_plus"]
+
+
+def _grow(values, size):
+    if len(values) >= size:
+        return values
+    return np.concatenate([values, np.zeros(size - len(values), dtype=values.dtype)])
+
+
+class _OrderStatistics:
+    """Fenwick tree over the global value ranks of one column; O(log n) add/remove/select.
+
+    The sorted values and ranks are only read (and may be memory-mapped); the
+    tree of window counts is the only per-instance state.
+    """
+
+    def __init__(self, values, sorted_values, ranks):
+        self._values = values
+        self._sorted = sorted_values
+        self._ranks = ranks
+        self._top_bit = 1 << max(len(values).bit_length() - 1, 0)
+        self.clear()
+
+    def clear(self):
+        self._tree = array("i", bytes(4 * (len(self._ranks) + 1)))
+        self.count = 0
+
+    def add_range(self, start, stop):
+        self._apply(start, stop, 1)
+
+    def remove_range(self, start, stop):
+        self._apply(start, stop, -1)
+
+    def _apply(self, start, stop, delta):
+        if stop <= start:
+            return
+        ranks = self._ranks[start:stop]
+        finite = np.isfinite(self._values[start:stop])
+        if not finite.all():
+            ranks = ranks[finite]
+        tree = self._tree
+        size = len(tree)
+        for position in (ranks + 1).tolist():
+            while position < size:
+                tree[position] += delta
+                position += position & -position
+        self.count += delta * len(ranks)
+
+    def select(self, k):
+        """Return the k-th smallest (0-based) value currently in the set."""
+        tree = self._tree
+        position = 0
+        remaining = k + 1
+        step = self._top_bit
+        while step:
+            candidate = position + step
+            if candidate < len(tree) and tree[candidate] < remaining:
+                position = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return float(self._sorted[position])
+
+    def percentile(self, q):
+        return _interpolate_rank(self.select, self.count, q)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative error bound (DDSketch-style log buckets).
+
+    Every value is counted in the bucket ``ceil(log_gamma(|x|))`` with
+    ``gamma = (1 + a) / (1 - a)``, so any quantile is returned within relative
+    error ``a = relative_accuracy`` of a value at that rank. Memory depends on
+    the value range only, not on how many values were added; counts can be
+    removed again (sliding windows) and sketches with the same accuracy merge
+    by adding counts.
+    """
+
+    ZERO_THRESHOLD = 1e-12
+
+    def __init__(self, relative_accuracy=0.01):
+        relative_accuracy = float(relative_accuracy)
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = _SketchStore()
+        self._negative = _SketchStore()
+        self._zero_count = 0
+
+    @property
+    def count(self):
+        return self._positive.total + self._negative.total + self._zero_count
+
+    def add(self, values):
+        self._update(values, 1)
+
+    def remove(self, values):
+        """Remove values previously added (used when they leave a sliding window)."""
+        self._update(values, -1)
+
+    def merge(self, other):
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        self._positive.merge(other._positive)
+        self._negative.merge(other._negative)
+        self._zero_count += other._zero_count
+        return self
+
+    def quantile(self, q):
+        """Approximate percentile(values, q) of the values currently in the sketch."""
+        count = self.count
+        if not count:
+            return 0.0
+        buckets = np.concatenate(
+            [
+                -self._bucket_values(self._negative)[::-1],
+                [0.0],
+                self._bucket_values(self._positive),
+            ]
+        )
+        cumulative = np.cumsum(
+            np.concatenate([self._negative.counts[::-1], [self._zero_count], self._positive.counts])
+        )
+        return _interpolate_rank(
+            lambda k: float(buckets[np.searchsorted(cumulative, k, side="right")]), count, q
+        )
+
+    def _update(self, values, weight):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        magnitude = np.abs(values)
+        zero = magnitude <= self.ZERO_THRESHOLD
+        self._zero_count += weight * int(np.count_nonzero(zero))
+        for store, selected in ((self._positive, values > 0), (self._negative, values < 0)):
+            selected &= ~zero
+            if selected.any():
+                store.add(np.ceil(np.log(magnitude[selected]) / self._log_gamma).astype(np.int64), weight)
+
+    def _bucket_values(self, store):
+        indices = np.arange(store.offset, store.offset + len(store.counts), dtype=np.float64)
+        return 2.0 * np.power(self._gamma, indices) / (self._gamma + 1.0)
+
+
+class _SketchStore:
+    """Dense bucket counts for consecutive log-bucket indices starting at ``offset``."""
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def add(self, indices, weight):
+        self._cover(int(indices.min()), int(indices.max()))
+        self.counts += weight * np.bincount(indices - self.offset, minlength=len(self.counts))
+
+    def merge(self, other):
+        if not len(other.counts):
+            return
+        self._cover(other.offset, other.offset + len(other.counts) - 1)
+        start = other.offset - self.offset
+        self.counts[start : start + len(other.counts)] += other.counts
+
+    def _cover(self, lowest, highest):
+        if not len(self.counts):
+            self.counts = np.zeros(highest - lowest + 1, dtype=np.int64)
+            self.offset = lowest
+            return
+        new_offset = min(lowest, self.offset)
+        new_end = max(highest + 1, self.offset + len(self.counts))
+        if new_offset == self.offset and new_end == self.offset + len(self.counts):
+            return
+        counts = np.zeros(new_end - new_offset, dtype=np.int64)
+        start = self.offset - new_offset
+        counts[start : start + len(self.counts)] = self.counts
+        self.counts = counts
+        self.offset = new_offset
+
+
+class _SortedWindowStatistics:
+    """Exact window percentiles from a sorted list of the values in the window.
+
+    Adds and removes cost O(log w) searches plus a list shift of the window
+    size w, independent of the table length, so the table may keep growing.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.clear()
+
+    def clear(self):
+        self._sorted = []
+
+    @property
+    def count(self):
+        return len(self._sorted)
+
+    def add_range(self, start, stop):
+        for value in self._finite(start, stop):
+            bisect.insort(self._sorted, value)
+
+    def add_values(self, values):
+        for value in values[np.isfinite(values)].tolist():
+            bisect.insort(self._sorted, value)
+
+    def remove_range(self, start, stop):
+        for value in self._finite(start, stop):
+            del self._sorted[bisect.bisect_left(self._sorted, value)]
+
+    def percentile(self, q):
+        return _interpolate_rank(self._sorted.__getitem__, len(self._sorted), q)
+
+    def _finite(self, start, stop):
+        if stop <= start:
+            return []
+        values = self.values[start:stop]
+        return values[np.isfinite(values)].tolist()
+
+
+class _SketchStatistics:
+    """QuantileSketch behind the _OrderStatistics interface used by RollingWindow."""
+
+    def __init__(self, values, relative_accuracy):
+        self.values = values
+        self._relative_accuracy = relative_accuracy
+        self.clear()
+
+    def clear(self):
+        self._sketch = QuantileSketch(self._relative_accuracy)
+
+    @property
+    def count(self):
+        return self._sketch.count
+
+    def add_range(self, start, stop):
+        if stop > start:
+            self._sketch.add(self.values[start:stop])
+
+    def add_values(self, values):
+        self._sketch.add(values)
+
+    def remove_range(self, start, stop):
+        if stop > start:
+            self._sketch.remove(self.values[start:stop])
+
+    def percentile(self, q):
+        return self._sketch.quantile(q)
+
+
 def percentile(values, q):
-    values = sorted(value for value in values if math.isfinite(value))
-    if not values:
+    return percentiles(values, (q,))[0]
+
+
+def percentiles(values, quantiles, with_max=False):
+    """percentile() for several q at once from a single sorted copy.
+
+    With ``with_max`` returns ``(values, maximum)``, the maximum being taken
+    over the finite values. One np.sort beats np.partition here: AE metrics
+    are coarsely quantised, and introselect on the heavily tied columns is
+    several times slower than NumPy's vectorised sort.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    values = np.sort(values if finite.all() else values[finite])
+    count = len(values)
+    results = [_interpolate_rank(lambda k: float(values[k]), count, q) for q in quantiles]
+    if with_max:
+        return results, float(values[-1]) if count else 0.0
+    return results
+
+
+def _interpolate_rank(select, count, q):
+    if not count:
         return 0.0
-    if len(values) == 1:
-        return values[0]
+    if count == 1:
+        return select(0)
 
-    rank = (q / 100.0) * (len(values) - 1)
+    rank = (q / 100.0) * (count - 1)
     lower = math.floor(rank)
     upper = math.ceil(rank)
     if lower == upper:
-        return values[int(rank)]
+        return select(int(rank))
     weight = rank - lower
-    return values[lower] * (1.0 - weight) + values[upper] * weight
+    return select(lower) * (1.0 - weight) + select(upper) * weight
 
 
 def _parse_float(raw):
@@ -229,10 +1662,38 @@ def _parse_float(raw):
     return value
 
 
+def _parse_floats(raw_values):
+    """Vectorised _parse_float; returns ``(values, valid)`` with the same accept/reject rules."""
+    try:
+        values = np.fromiter(map(float, raw_values), dtype=np.float64, count=len(raw_values))
+    except ValueError:
+        values = np.array([_parse_float_or_nan(raw) for raw in raw_values], dtype=np.float64)
+    return values, np.isfinite(values)
+
+
+def _parse_float_or_nan(raw):
+    try:
+        return _parse_float(raw)
+    except ValueError:
+        return math.nan
+
+
+@dataclass
+class _GroupChannel:
+    """One channel of a dataset group, analysed on its own elapsed clock."""
+
+    dataset_id: int
+    table: AEEventTable
+    summary: dict
+    window: RollingWindow
+    histograms: EventHistograms
+
+
 if PYTHONFMU_AVAILABLE:
 
     class AEEventStats(Fmi2Slave):
-        OUTPUTS = (
+        # summarize_events outputs; in group mode also reported per channel as channel<k>_<name>.
+        SUMMARY_OUTPUTS = (
             "event_count",
             "invalid_rows",
             "duration_seconds",
@@ -250,23 +1711,62 @@ if PYTHONFMU_AVAILABLE:
             "frequency_centroid_p50",
             "peak_frequency_p50",
             "average_frequency_p50",
+        )
+        # Per-channel outputs are registered for the largest shipped group only (CH2 + CH6).
+        MAX_GROUP_CHANNELS = 2
+        CHANNEL_FIELDS = ("dataset_id", *SUMMARY_OUTPUTS, *ROLLING_OUTPUTS[1:], "bin_event_count", "bin_energy_sum")
+        CHANNEL_OUTPUTS = tuple(
+            f"channel{index}_{name}" for index, name in product(range(1, MAX_GROUP_CHANNELS + 1), CHANNEL_FIELDS)
+        )
+        OUTPUTS = SUMMARY_OUTPUTS + (
             "current_time_seconds",
             "rolling_event_rate_hz",
             "rolling_amplitude_p95",
             "rolling_rms_p95",
             "rolling_asl_p95",
             "cumulative_energy",
+            "channel_count",
+            # 1 if the outputs above describe one merged hit stream; 0 for a group of separate captures.
+            "channels_merged",
+            # Hits and energy in the last completed bin_seconds bin; trace these for a time histogram.
+            "bin_event_count",
+            "bin_energy_sum",
+            "bin_event_rate_hz",
         )
+        # Whole-capture hit counts per frequency band, e.g. frequency_centroid_band_100_200khz_count.
+        BAND_OUTPUTS = tuple(
+            f"{name}_band_{label}_count" for name in BAND_COLUMNS for label in band_labels(FREQUENCY_BAND_EDGES_KHZ)
+        )
+        OUTPUTS += BAND_OUTPUTS + CHANNEL_OUTPUTS
 
-        INTEGER_OUTPUTS = {"event_count", "invalid_rows"}
+        INTEGER_OUTPUTS = {
+            "event_count",
+            "invalid_rows",
+            "channel_count",
+            "channels_merged",
+            "bin_event_count",
+            *BAND_OUTPUTS,
+            *(name for name in CHANNEL_OUTPUTS if name.endswith(("_dataset_id", "_event_count", "_invalid_rows"))),
+        }
 
         def __init__(self, **kwargs):
             super().__init__(**kwargs)
 
             self.dataset_id = 2
+            self.dataset_group = 0
             self.window_seconds = 300.0
+            self.quantile_accuracy = 0.0
+            self.follow = 0
+            self.bin_seconds = 60.0
             self._table = None
             self._summary = None
+            self._channels = []
+            self._window = None
+            self._follower = None
+            self._trace = None
+            self._trace_step = None
+            self._histograms = None
+            self._analysed = False
 
             self.register_variable(
                 Integer(
@@ -276,6 +1776,14 @@ if PYTHONFMU_AVAILABLE:
                     start=self.dataset_id,
                 )
             )
+            self.register_variable(
+                Integer(
+                    "dataset_group",
+                    causality=Fmi2Causality.parameter,
+                    variability=Fmi2Variability.fixed,
+                    start=self.dataset_group,
+                )
+            )
             self.register_variable(
                 Real(
                     "window_seconds",
@@ -285,6 +1793,36 @@ if PYTHONFMU_AVAILABLE:
                 )
             )
 
+            # 0 = exact percentiles; e.g. 0.01 = sketch-based percentiles within 1 % relative error.
+            self.register_variable(
+                Real(
+                    "quantile_accuracy",
+                    causality=Fmi2Causality.parameter,
+                    variability=Fmi2Variability.fixed,
+                    start=self.quantile_accuracy,
+                )
+            )
+
+            # 1 = follow a growing acquisition file: each step parses only the hits appended since.
+            self.register_variable(
+                Integer(
+                    "follow",
+                    causality=Fmi2Causality.parameter,
+                    variability=Fmi2Variability.fixed,
+                    start=self.follow,
+                )
+            )
+
+            self.register_variable(
+                Real(
+                    "bin_seconds",
+                    causality=Fmi2Causality.parameter,
+                    variability=Fmi2Variability.fixed,
+                    start=self.bin_seconds,
+                    setter=self._set_bin_seconds,
+                )
+            )
+
             for name in self.OUTPUTS:
                 setattr(self, name, 0)
                 variable_type = Integer if name in self.INTEGER_OUTPUTS else Real
@@ -298,9 +1836,21 @@ if PYTHONFMU_AVAILABLE:
                     )
                 )
 
+        def _set_bin_seconds(self, value):
+            if not float(value) > 0.0:
+                raise ValueError(f"bin_seconds must be positive, got {value}")
+            self.bin_seconds = value
+
         def enter_initialization_mode(self):
             self._table = None
             self._summary = None
+            self._channels = []
+            self._window = None
+            self._follower = None
+            self._trace = None
+            self._trace_step = None
+            self._histograms = None
+            self._analysed = False
             for name in self.OUTPUTS:
                 setattr(self, name, 0)
 
@@ -310,25 +1860,134 @@ if PYTHONFMU_AVAILABLE:
 
         def do_step(self, current_time, step_size):
             self._ensure_analysis()
+            if self._follower is not None:
+                self._poll_follower()
+            elif step_size != self._trace_step:
+                self._open_trace(step_size)
             self._update_to_time(current_time + step_size)
             return True
 
         def _ensure_analysis(self):
-            if self._table is not None and self._summary is not None:
+            if self._analysed:
                 return
 
+            # A non-zero dataset_group reports each channel's summary, rolling and bin values as
+            # channel<k>_* outputs; channels recorded together are also analysed as one merged stream.
+            if int(self.dataset_group):
+                dataset_ids = dataset_catalog().group(int(self.dataset_group))
+                if len(dataset_ids) > self.MAX_GROUP_CHANNELS:
+                    raise ValueError(
+                        f"dataset_group {int(self.dataset_group)} has {len(dataset_ids)} channels; "
+                        f"at most {self.MAX_GROUP_CHANNELS} are supported"
+                    )
+            else:
+                dataset_ids = [int(self.dataset_id)]
+            accuracy = max(0.0, float(self.quantile_accuracy))
+            if int(self.follow):
+                if len(dataset_ids) != 1:
+                    raise ValueError("follow mode supports a single dataset_id, not a dataset_group")
+                self._follower = EventTableFollower(resolve_dataset_path(dataset_ids[0]), quantile_accuracy=accuracy)
+                self._follower.poll()
+                self._table = self._follower.table
+                self._summary = self._follower.summary()
+            else:
+                tables = [open_dataset(dataset_id) for dataset_id in dataset_ids]
+                if int(self.dataset_group):
+                    self._channels = [
+                        _GroupChannel(
+                            dataset_id,
+                            table,
+                            summarize_events(table, quantile_accuracy=accuracy),
+                            RollingWindow(table, float(self.window_seconds), quantile_accuracy=accuracy),
+                            EventHistograms.from_table(table, float(self.bin_seconds)),
+                        )
+                        for dataset_id, table in zip(dataset_ids, tables)
+                    ]
+                # Separate captures share no clock, so they only get the per-channel outputs.
+                if channels_overlap(tables):
+                    self._table = merge_event_tables(tables)
+                    self._summary = summarize_events(self._table, quantile_accuracy=accuracy)
+            if self._table is not None:
+                self._window = RollingWindow(
+                    self._table,
+                    float(self.window_seconds),
+                    quantile_accuracy=accuracy,
+                    follow=self._follower is not None,
+                )
+                self._histograms = EventHistograms.from_table(self._table, float(self.bin_seconds))
+            self._set_summary_outputs()
+            self.channel_count = len(dataset_ids)
+            self.channels_merged = int(self._table is not None)
+            self._analysed = True
+
+        def _open_trace(self, step_size):
+            # A RollingTrace precomputed by scripts/convert_ae_event_tables.py for this
+            # window and step size is served by index instead of updating the window.
+            # Traces hold exact percentiles, so sketch mode always uses the window.
+            self._trace_step = step_size
+            self._trace = None
+            if int(self.dataset_group) or step_size <= 0 or float(self.quantile_accuracy) > 0:
+                return
             path = resolve_dataset_path(int(self.dataset_id))
-            self._table = load_event_table(path)
-            self._summary = summarize_events(self._table)
-            for name, value in self._summary.items():
-                setattr(self, name, int(value) if name in self.INTEGER_OUTPUTS else float(value))
+            window_seconds = float(self.window_seconds)
+            directory = rolling_trace_path(path, window_seconds, step_size)
+            self._trace = open_rolling_trace(directory, path, window_seconds, step_size)
+
+        def _poll_follower(self):
+            first_changed = self._follower.poll()
+            if first_changed is None:
+                return
+            self._table = self._follower.table
+            self._summary = self._follower.summary()
+            if self._follower.restarted:
+                self._window.extend(self._table, first_changed)
+                self._histograms = EventHistograms.from_table(self._table, float(self.bin_seconds))
+            else:
+                self._window.extend(self._table, first_changed, self._follower.appended)
+                for columns in self._follower.appended:
+                    self._histograms.add(columns)
+            self._set_summary_outputs()
+
+        def _set_summary_outputs(self):
+            if self._summary is not None:
+                for name, value in self._summary.items():
+                    setattr(self, name, int(value) if name in self.INTEGER_OUTPUTS else float(value))
+            for index, channel in enumerate(self._channels, start=1):
+                setattr(self, f"channel{index}_dataset_id", channel.dataset_id)
+                for name, value in channel.summary.items():
+                    name = f"channel{index}_{name}"
+                    setattr(self, name, int(value) if name in self.INTEGER_OUTPUTS else float(value))
+            histograms = self._histograms
+            if histograms is not None:
+                for column, counts in histograms.band_counts.items():
+                    for label, count in zip(histograms.band_labels(), counts.tolist()):
+                        setattr(self, f"{column}_band_{label}_count", count)
 
         def _update_to_time(self, current_time):
-            assert self._table is not None
-            assert self._summary is not None
+            assert self._analysed
+
+            current_time = float(current_time)
+            self.current_time_seconds = current_time
+            for index, channel in enumerate(self._channels, start=1):
+                bounded_time = max(0.0, min(current_time, float(channel.summary["duration_seconds"])))
+                for name, value in channel.window.update(bounded_time).items():
+                    if name != "current_time_seconds":
+                        setattr(self, f"channel{index}_{name}", float(value))
+                count, energy = channel.histograms.completed_bin(current_time)
+                setattr(self, f"channel{index}_bin_event_count", count)
+                setattr(self, f"channel{index}_bin_energy_sum", energy)
+            if self._window is None:
+                return
 
             duration = self._summary["duration_seconds"]
-            bounded_time = max(0.0, min(float(current_time), float(duration)))
-            values = rolling_metrics(self._table, bounded_time, float(self.window_seconds))
+            bounded_time = max(0.0, min(current_time, float(duration)))
+            values = self._trace.sample(current_time) if self._trace is not None else None
+            if values is None:
+                values = self._window.update(bounded_time)
             for name, value in values.items():
                 setattr(self, name, float(value))
+
+            count, energy = self._histograms.completed_bin(current_time)
+            self.bin_event_count = count
+            self.bin_energy_sum = energy
+            self.bin_event_rate_hz = count / self._histograms.bin_seconds
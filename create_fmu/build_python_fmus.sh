@@ -77,7 +77,7 @@ log_step "Patching pythonfmu exporter (ensures libpython linkage)"
 python "$SCRIPT_DIR/patch_pythonfmu_export.py"
 
 log_step "Building Producer/Consumer/AEEventStats FMUs via pythonfmu"
-python -m pythonfmu build -f "$SCRIPT_DIR/producer_fmu.py" -d "$FMU_DIR"
+python -m pythonfmu build -f "$SCRIPT_DIR/producer_fmu.py" -d "$FMU_DIR" "$SCRIPT_DIR/npz_stream.py"
 python -m pythonfmu build -f "$SCRIPT_DIR/consumer_fmu.py" -d "$FMU_DIR"
 python -m pythonfmu build -f "$SCRIPT_DIR/ae_event_stats_fmu.py" -d "$FMU_DIR"
 
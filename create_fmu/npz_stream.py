@@ -0,0 +1,15 @@
+"""Streaming writes of NPZ archives too large to build in memory."""
+
+import numpy as np
+
+
+def open_npy_member(archive, name, dtype, length):
+    """Open ``<name>.npy`` in a ``zipfile.ZipFile`` for writing and write its header.
+
+    The caller then writes the ``length`` items of ``dtype`` as raw bytes, in
+    as many pieces as it likes, and closes the returned member.
+    """
+    member = archive.open(f"{name}.npy", "w", force_zip64=True)
+    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (length,)}
+    np.lib.format.write_array_header_1_0(member, header)
+    return member
@@ -1,8 +1,239 @@
 from pythonfmu import Fmi2Causality, Fmi2Variability
 from pythonfmu.fmi2slave import Fmi2Slave
 from pythonfmu.variables import Real, Boolean, Integer
-import os, csv, math, random, statistics
-from datetime import datetime, timedelta
+import os, codecs, csv, math, statistics, tempfile, zipfile
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from npz_stream import open_npy_member
+
+ROLLING_TAIL = 100
+GENERATE_CHUNK = 1 << 20
+SAMPLE_INTERVAL = np.timedelta64(100_000, "us")  # 0.1 s between measurements
+
+# output_format codes (the runner only sets numeric start values)
+OUTPUT_NONE = 0
+OUTPUT_CSV = 1
+OUTPUT_NPZ = 2
+
+# source codes: generate the random walk, or read measurements written elsewhere
+SOURCE_GENERATE = 0
+SOURCE_CSV = 1
+SOURCE_NPZ = 2
+SOURCE_TIMESCALE = 3
+SOURCE_S3 = 4
+DEFAULT_BATCH_ROWS = 65536
+
+
+def random_walk_chunks(num_points, seed, chunk_size=GENERATE_CHUNK, start=100.0):
+    """Yield (offset, values) blocks of the synthetic measurement random walk.
+
+    Each value adds uniform(-0.5, 0.5) noise and a 0.01*sin(i/25) drift to the
+    previous one, starting from `start`; values are rounded to the three
+    decimals written to the CSV. The sum runs left to right from the previous
+    chunk's exact level, so the same seed gives bit-identical values for any
+    chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    level = start
+    for offset in range(0, num_points, chunk_size):
+        index = np.arange(offset, min(offset + chunk_size, num_points))
+        steps = rng.uniform(-0.5, 0.5, index.size) + 0.01*np.sin(index/25.0)
+        steps[0] += level
+        walk = np.cumsum(steps)
+        level = walk[-1]
+        yield offset, np.round(walk, 3)
+
+
+def csv_value_blocks(lines, batch_rows=DEFAULT_BATCH_ROWS):
+    """Yield float64 blocks of the `value` column of CSV text, skipping '#' comment lines and unparsable rows."""
+    rows = csv.reader(line for line in lines if not line.lstrip().startswith("#"))
+    header = next(rows, None)
+    if header is None:
+        return
+    try:
+        column = [name.strip() for name in header].index("value")
+    except ValueError:
+        raise ValueError(f"CSV header has no 'value' column: {header}") from None
+    batch = []
+    for row in rows:
+        try:
+            batch.append(float(row[column]))
+        except (IndexError, ValueError):
+            continue
+        if len(batch) >= batch_rows:
+            yield np.array(batch)
+            batch.clear()
+    if batch:
+        yield np.array(batch)
+
+
+def read_csv_blocks(path, batch_rows=DEFAULT_BATCH_ROWS):
+    with open(path, "r", newline="") as f:
+        yield from csv_value_blocks(f, batch_rows)
+
+
+def read_npz_blocks(source, batch_rows=DEFAULT_BATCH_ROWS):
+    """Yield blocks of the `value` column of an NPZ (path or seekable file) without loading the column whole."""
+    with zipfile.ZipFile(source) as archive, archive.open("value.npy") as member:
+        version = np.lib.format.read_magic(member)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(member)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(member)
+        remaining = math.prod(shape)
+        while remaining:
+            count = min(batch_rows, remaining)
+            data = member.read(count*dtype.itemsize)
+            if len(data) != count*dtype.itemsize:
+                raise ValueError(f"Truncated value column in {source}")
+            yield np.frombuffer(data, dtype=dtype).astype(np.float64)
+            remaining -= count
+
+
+def timescale_conninfo(environ=os.environ):
+    """libpq conninfo from $TIMESCALE_CONN or the TIMESCALE_* variables of scripts/fetch_timescaledb_measurements.py."""
+    if environ.get("TIMESCALE_CONN"):
+        return environ["TIMESCALE_CONN"]
+    required = ("TIMESCALE_HOST", "TIMESCALE_DB", "TIMESCALE_USER", "TIMESCALE_PASSWORD")
+    missing = [name for name in required if not environ.get(name)]
+    if missing:
+        raise RuntimeError("Missing TIMESCALE_CONN or " + ", ".join(missing))
+    return " ".join([
+        f"host={environ['TIMESCALE_HOST']}",
+        f"port={environ.get('TIMESCALE_PORT') or 5432}",
+        f"dbname={environ['TIMESCALE_DB']}",
+        f"user={environ['TIMESCALE_USER']}",
+        f"password={environ['TIMESCALE_PASSWORD']}",
+        f"sslmode={environ.get('TIMESCALE_SSLMODE') or 'require'}",
+    ])
+
+
+def read_timescale_blocks(batch_rows=DEFAULT_BATCH_ROWS, environ=os.environ):
+    """Yield value blocks in time order from a server-side cursor on $TIMESCALE_TABLE.
+
+    $TIMESCALE_LIMIT > 0 restricts the read to the latest rows, as the fetch
+    script does; otherwise the whole table is read.
+    """
+    import psycopg
+    from psycopg import sql
+
+    table = sql.SQL(".").join(
+        sql.Identifier(part.strip())
+        for part in (environ.get("TIMESCALE_TABLE") or "public.measurements").split(".")
+        if part.strip()
+    )
+    columns = {
+        "table": table,
+        "time_col": sql.Identifier(environ.get("TIMESCALE_TIME_COLUMN") or "time"),
+        "value_col": sql.Identifier(environ.get("TIMESCALE_VALUE_COLUMN") or "value"),
+    }
+    limit = int(environ.get("TIMESCALE_LIMIT") or 0)
+    if limit > 0:
+        query = sql.SQL(
+            "SELECT {value_col} FROM ("
+            "SELECT {time_col}, {value_col} FROM {table} ORDER BY {time_col} DESC LIMIT %s"
+            ") AS latest ORDER BY {time_col}"
+        ).format(**columns)
+        params = (limit,)
+    else:
+        query = sql.SQL("SELECT {value_col} FROM {table} ORDER BY {time_col}").format(**columns)
+        params = None
+
+    with psycopg.connect(timescale_conninfo(environ)) as conn:
+        with conn.cursor(name="producer_measurements") as cur:
+            cur.itersize = batch_rows
+            cur.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_rows)
+                if not rows:
+                    break
+                yield np.array([row[0] for row in rows if row[0] is not None], dtype=np.float64)
+
+
+def read_s3_blocks(batch_rows=DEFAULT_BATCH_ROWS, environ=os.environ, client=None):
+    """Yield value blocks from the object $PRODUCER_S3_KEY in $S3_BUCKET.
+
+    CSV objects are streamed line by line; `.npz` objects are downloaded to a
+    temporary file first because the archive needs seeking. Endpoint, region
+    and path-style settings use the variables of scripts/list_s3_objects.py.
+    """
+    bucket = environ.get("S3_BUCKET")
+    key = environ.get("PRODUCER_S3_KEY")
+    if not bucket or not key:
+        raise RuntimeError("Reading measurements from S3 needs S3_BUCKET and PRODUCER_S3_KEY")
+    if client is None:
+        client = _s3_client(environ)
+
+    if key.endswith(".npz"):
+        with tempfile.TemporaryFile() as f:
+            client.download_fileobj(bucket, key, f)
+            f.seek(0)
+            yield from read_npz_blocks(f, batch_rows)
+        return
+    body = client.get_object(Bucket=bucket, Key=key)["Body"]
+    try:
+        yield from csv_value_blocks(codecs.iterdecode(body.iter_lines(), "utf-8"), batch_rows)
+    finally:
+        body.close()
+
+
+def _s3_client(environ):
+    import boto3
+
+    kwargs = {"region_name": environ.get("AWS_REGION") or environ.get("AWS_DEFAULT_REGION") or "us-east-1"}
+    endpoint = environ.get("S3_ENDPOINT") or environ.get("AWS_ENDPOINT_URL_S3") or environ.get("AWS_ENDPOINT_URL")
+    if endpoint:
+        kwargs["endpoint_url"] = endpoint
+    if (environ.get("S3_FORCE_PATH_STYLE") or "").strip().lower() in {"1", "true", "yes", "on"}:
+        from botocore.config import Config
+
+        kwargs["config"] = Config(s3={"addressing_style": "path"})
+    return boto3.session.Session().client("s3", **kwargs)
+
+
+class RunningStatistics:
+    """Mean, population std, min, max and tail mean, updated a block of values at a time.
+
+    Combines each block's mean and sum of squared deviations into the running
+    ones and keeps the last ROLLING_TAIL values in a bounded deque, so memory
+    stays constant however many points are fed.
+    """
+
+    def __init__(self, tail=ROLLING_TAIL):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.vmin = math.inf
+        self.vmax = -math.inf
+        self.tail = deque(maxlen=tail)
+
+    def update(self, values):
+        """Fold a block of values in at once (Chan et al. pairwise combination)."""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        total = self.count + values.size
+        delta = batch_mean - self.mean
+        self.mean += delta*values.size/total
+        self._m2 += batch_m2 + delta*delta*self.count*values.size/total
+        self.count = total
+        self.vmin = min(self.vmin, float(values.min()))
+        self.vmax = max(self.vmax, float(values.max()))
+        self.tail.extend(values[-self.tail.maxlen:].tolist())
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+    @property
+    def rolling_mean(self):
+        return statistics.fmean(self.tail) if self.tail else 0.0
+
 
 class Producer(Fmi2Slave):
 
@@ -19,6 +250,14 @@ class Producer(Fmi2Slave):
 
         # Tunable parameter
         self.num_points = 10000
+        # streaming: compute the statistics while generating instead of re-reading the CSV.
+        self.streaming = True
+        # output_format: OUTPUT_NONE, OUTPUT_CSV or OUTPUT_NPZ (timestamp/value columns)
+        self.output_format = OUTPUT_CSV
+        self.seed = 0
+        # source: SOURCE_GENERATE, or read measurements from SOURCE_CSV/NPZ/TIMESCALE/S3 in batch_rows blocks
+        self.source = SOURCE_GENERATE
+        self.batch_rows = DEFAULT_BATCH_ROWS
 
         self.register_variable(Real("mean", causality=Fmi2Causality.output,
                                     variability=Fmi2Variability.continuous))
@@ -34,9 +273,20 @@ class Producer(Fmi2Slave):
                                        variability=Fmi2Variability.discrete))
         self.register_variable(Integer("num_points", causality=Fmi2Causality.parameter,
                                        variability=Fmi2Variability.fixed, start=self.num_points))
+        self.register_variable(Boolean("streaming", causality=Fmi2Causality.parameter,
+                                       variability=Fmi2Variability.fixed, start=self.streaming))
+        self.register_variable(Integer("output_format", causality=Fmi2Causality.parameter,
+                                       variability=Fmi2Variability.fixed, start=self.output_format))
+        self.register_variable(Integer("seed", causality=Fmi2Causality.parameter,
+                                       variability=Fmi2Variability.fixed, start=self.seed))
+        self.register_variable(Integer("source", causality=Fmi2Causality.parameter,
+                                       variability=Fmi2Variability.fixed, start=self.source))
+        self.register_variable(Integer("batch_rows", causality=Fmi2Causality.parameter,
+                                       variability=Fmi2Variability.fixed, start=self.batch_rows))
 
         # Parameters
         self.csv_path = "data/measurements.csv"
+        self.npz_path = "data/measurements.npz"
         self._has_run = False
 
     def enter_initialization_mode(self):
@@ -47,18 +297,65 @@ class Producer(Fmi2Slave):
             return
         self._generate_csv()
 
-    def _generate_csv(self, num_points=3000):
+    def _generate_csv(self, num_points=3000, stats=None):
         os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
-        start = datetime.now()
-        with open(self.csv_path, "w", newline="") as f:
+        start = np.datetime64(datetime.now(), "us")
+        with open(self.csv_path, "w", newline="", buffering=1 << 20) as f:
             f.write(f"# num_points={num_points}\n")
-            w = csv.writer(f)
-            w.writerow(["timestamp","value"])
-            val = 100.0
-            for i in range(num_points):  # ~num_points points, ~5 min at 0.1s spacing
-                val += random.uniform(-0.5, 0.5) + 0.01*math.sin(i/25.0)
-                t = start + timedelta(seconds=i*0.1)
-                w.writerow([t.isoformat(), f"{val:.3f}"])
+            f.write("timestamp,value\r\n")
+            for offset, values in random_walk_chunks(num_points, int(self.seed)):
+                if stats is not None:
+                    stats.update(values)
+                times = start + np.arange(offset, offset + values.size)*SAMPLE_INTERVAL
+                stamps = np.datetime_as_string(times, unit="us").tolist()
+                f.writelines([f"{t},{v:.3f}\r\n" for t, v in zip(stamps, values.tolist())])
+
+    def _generate_npz(self, num_points, stats):
+        """Write timestamp (datetime64[us]) and value (float64) columns into an uncompressed NPZ."""
+        os.makedirs(os.path.dirname(self.npz_path), exist_ok=True)
+        start = np.datetime64(datetime.now(), "us")
+        with zipfile.ZipFile(self.npz_path, "w", allowZip64=True) as archive:
+            with open_npy_member(archive, "value", np.float64, num_points) as member:
+                for _, values in random_walk_chunks(num_points, int(self.seed)):
+                    stats.update(values)
+                    member.write(values.tobytes())
+            with open_npy_member(archive, "timestamp", "datetime64[us]", num_points) as member:
+                for offset in range(0, num_points, GENERATE_CHUNK):
+                    index = np.arange(offset, min(offset + GENERATE_CHUNK, num_points))
+                    member.write((start + index*SAMPLE_INTERVAL).tobytes())
+
+    def _stream_statistics(self, num_points):
+        """Generate the random walk in blocks straight into RunningStatistics, writing the chosen output file."""
+        stats = RunningStatistics()
+        output_format = int(self.output_format)
+        if output_format == OUTPUT_CSV:
+            self._generate_csv(num_points, stats)
+        elif output_format == OUTPUT_NPZ:
+            self._generate_npz(num_points, stats)
+        elif output_format == OUTPUT_NONE:
+            for _, values in random_walk_chunks(num_points, int(self.seed)):
+                stats.update(values)
+        else:
+            raise ValueError(f"Unknown output_format {output_format}")
+        return stats
+
+    def _read_statistics(self, source):
+        """Feed measurement blocks from the selected reader into RunningStatistics."""
+        batch_rows = max(1, int(self.batch_rows))
+        if source == SOURCE_CSV:
+            blocks = read_csv_blocks(self.csv_path, batch_rows)
+        elif source == SOURCE_NPZ:
+            blocks = read_npz_blocks(self.npz_path, batch_rows)
+        elif source == SOURCE_TIMESCALE:
+            blocks = read_timescale_blocks(batch_rows)
+        elif source == SOURCE_S3:
+            blocks = read_s3_blocks(batch_rows)
+        else:
+            raise ValueError(f"Unknown source {source}")
+        stats = RunningStatistics()
+        for values in blocks:
+            stats.update(values)
+        return stats
 
     def _load_values(self):
         values = []
@@ -83,16 +380,31 @@ class Producer(Fmi2Slave):
         self.vmax = max(values)
         self.std = statistics.pstdev(values)
 
-        tail = values[-100:] if len(values) >= 100 else values
+        tail = values[-ROLLING_TAIL:] if len(values) >= ROLLING_TAIL else values
         self.rollingMean = statistics.fmean(tail)
 
+    def _apply_statistics(self, stats):
+        if not stats.count:
+            raise RuntimeError("No measurement data")
+        self.mean = stats.mean
+        self.std = stats.std
+        self.vmin = stats.vmin
+        self.vmax = stats.vmax
+        self.rollingMean = stats.rolling_mean
+
     def do_step(self, current_time, step_size):
         num_points = max(1, int(self.num_points))
         if not self._has_run:
-            #self._ensure_csv()
-            self._generate_csv(num_points)
-            values = self._load_values()
-            self._update_statistics(values)
+            source = int(self.source)
+            if source != SOURCE_GENERATE:
+                self._apply_statistics(self._read_statistics(source))
+            elif self.streaming:
+                self._apply_statistics(self._stream_statistics(num_points))
+            else:
+                #self._ensure_csv()
+                self._generate_csv(num_points)
+                values = self._load_values()
+                self._update_statistics(values)
             self._has_run = True
         self.done = True
         return True
@@ -0,0 +1,372 @@
+"""In-process executor for workflows that chain STOR-HY replica FMUs.
+
+Reads the same workflow YAML as the Go runner, orders the steps by their
+``start_from`` links and evaluates every step with compute_model_outputs
+instead of loading the FMU. Each step follows the runner's sequence
+(initialization before start values, do_step at the start of every
+communication interval, trace sampling) and its result goes through the
+same number formatting, so result files are byte-identical to the runner's.
+"""
+
+import ast
+import heapq
+import math
+from decimal import Decimal
+from pathlib import Path
+
+from storhy_replica_common import (
+    INTEGER_OUTPUTS,
+    INTEGER_PARAMETERS,
+    OUTPUT_DEFAULTS,
+    PARAMETER_DEFAULTS,
+    compute_model_outputs,
+    get_model,
+)
+
+REPLICA_DIR = Path(__file__).resolve().parent
+ROOT_DIR = REPLICA_DIR.parents[1]
+INTEGER_VARIABLES = INTEGER_PARAMETERS | INTEGER_OUTPUTS
+SYNTHETIC_CASE_STEP = "_synthetic_case"
+
+
+class PipelineError(ValueError):
+    pass
+
+
+def replica_models():
+    """Map replica FMU names (the class names, e.g. "KPIAssessmentReplica") to their MODEL_KEY."""
+    models = {}
+    for path in sorted(REPLICA_DIR.glob("*_fmu.py")):
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for statement in node.body:
+                if (
+                    isinstance(statement, ast.Assign)
+                    and any(isinstance(target, ast.Name) and target.id == "MODEL_KEY" for target in statement.targets)
+                    and isinstance(statement.value, ast.Constant)
+                ):
+                    models[node.name] = statement.value.value
+    return models
+
+
+class PipelineStep:
+    """One workflow step bound to its replica model."""
+
+    def __init__(self, spec, model_key):
+        self.name = spec["name"]
+        self.model_key = model_key
+        self.outputs = list(spec.get("outputs") or [])
+        self.start_time = spec.get("start_time")
+        self.stop_time = spec.get("stop_time")
+        self.step_size = spec.get("step_size")
+        self.start_values = dict(spec.get("start_values") or {})
+        self.start_from = {}
+        for target, reference in (spec.get("start_from") or {}).items():
+            step_name, _, variable = str(reference).partition(".")
+            if not step_name or not variable:
+                raise PipelineError(f"step {self.name}: start_from[{target}] must use format step.variable")
+            self.start_from[target] = (step_name, variable)
+        self.result_path = spec.get("result") or ""
+        self.trace = spec.get("trace")
+        if self.trace is not None:
+            sample_every = self.trace.get("sample_every")
+            if sample_every is not None and sample_every <= 0:
+                raise PipelineError(f"step {self.name}: trace sample_every must be positive")
+            if not self.trace.get("outputs") and not self.trace.get("inputs"):
+                raise PipelineError(f"step {self.name}: trace must request at least one input or output")
+
+    def timings(self):
+        """Start, stop and communication step the runner derives for a replica (no default experiment)."""
+        start = 0.0 if self.start_time is None else float(self.start_time)
+        stop = start + 1.0 if self.stop_time is None else float(self.stop_time)
+        step = max(1e-3, stop - start) if self.step_size is None else float(self.step_size)
+        if step <= 0.0:
+            step = stop - start
+            if step <= 0.0:
+                step = 1.0
+        return start, stop, step
+
+    def run(self, start_values):
+        """Run the step with encoded start values and return its result as the runner reports it."""
+        model = get_model(self.model_key)
+        values = dict(PARAMETER_DEFAULTS)
+        values.update(compute_model_outputs(self.model_key, PARAMETER_DEFAULTS, 0.0))
+        for name in sorted(start_values):
+            if name not in values:
+                raise PipelineError(f"step {self.name}: unknown variable '{name}'")
+            value = start_values[name]
+            values[name] = _llround(value) if name in INTEGER_VARIABLES else value
+
+        start, stop, step_size = self.timings()
+        trace_names = self._trace_names()
+        trace_times = []
+        trace_signals = {name: [] for name in trace_names}
+
+        def capture(time):
+            trace_times.append(time)
+            for name in trace_names:
+                trace_signals[name].append(self._read(values, name))
+
+        # Without input series the parameters are fixed for the whole run, so a
+        # time-invariant model is evaluated once, as ReplicaBase does.
+        params = {name: values[name] for name in PARAMETER_DEFAULTS}
+        computed = False
+
+        def do_step(time):
+            nonlocal computed
+            if model.time_dependent or not computed:
+                values.update(compute_model_outputs(self.model_key, params, time))
+                computed = True
+
+        current = start
+        trace_interval = 0.0
+        if trace_names:
+            trace_interval = float(self.trace.get("sample_every") or step_size)
+            capture(current)
+        next_trace = current + trace_interval
+        while current < stop - 1e-12:
+            upcoming = min(current + step_size, stop)
+            if trace_names and next_trace < upcoming - 1e-12:
+                upcoming = next_trace
+            if upcoming <= current + 1e-12:
+                if trace_names and next_trace <= current + 1e-12:
+                    capture(current)
+                    next_trace += trace_interval
+                    continue
+                raise PipelineError(f"step {self.name}: execution stalled due to zero-length step")
+            do_step(current)
+            current = upcoming
+            if trace_names and next_trace <= current + 1e-12:
+                capture(current)
+                next_trace += trace_interval
+        if trace_names and (not trace_times or abs(trace_times[-1] - stop) > 1e-9):
+            capture(stop)
+
+        result = {name: _runner_value(self._read(values, name)) for name in self.outputs or OUTPUT_DEFAULTS}
+        if trace_times and trace_signals:
+            result["trace"] = {
+                "time": [_runner_value(time) for time in trace_times],
+                "signals": {name: [_runner_value(value) for value in series] for name, series in trace_signals.items()},
+            }
+        return result
+
+    def _trace_names(self):
+        if self.trace is None:
+            return []
+        names = []
+        for name in list(self.trace.get("outputs") or []) + list(self.trace.get("inputs") or []):
+            if name not in names:
+                names.append(name)
+        return names
+
+    def _read(self, values, name):
+        if name not in values:
+            raise PipelineError(f"step {self.name}: variable '{name}' not found")
+        value = values[name]
+        return int(value) if name in INTEGER_VARIABLES else float(value)
+
+
+class ReplicaPipeline:
+    """A replica workflow resolved into a DAG of steps.
+
+    Steps run in dependency order, ties broken by their order in the file, so
+    any workflow the Go runner accepts runs in the same order here.
+    """
+
+    def __init__(self, workflow, root=None):
+        self.root = Path(root or ROOT_DIR).resolve()
+        specs = workflow.get("steps") or []
+        if not specs:
+            raise PipelineError("workflow does not define any steps")
+
+        models = replica_models()
+        self.steps = {}
+        for spec in specs:
+            name = spec.get("name")
+            if not name:
+                raise PipelineError("workflow contains a step without name")
+            if name == SYNTHETIC_CASE_STEP:
+                raise PipelineError(f"workflow step name {SYNTHETIC_CASE_STEP} is reserved")
+            if name in self.steps:
+                raise PipelineError(f"workflow step {name} defined multiple times")
+            if spec.get("input_series"):
+                raise PipelineError(f"step {name}: input_series is not supported in-process")
+            fmu_name = Path(spec.get("fmu") or "").stem
+            if fmu_name not in models:
+                raise PipelineError(f"step {name}: {spec.get('fmu')!r} is not a STOR-HY replica FMU")
+            self.steps[name] = PipelineStep(spec, models[fmu_name])
+        self.order = self._resolve_order()
+
+    @classmethod
+    def from_file(cls, path, root=None):
+        root = Path(root or ROOT_DIR)
+        path = Path(path)
+        yaml = import_yaml()
+        with (path if path.is_absolute() else root / path).open("r", encoding="utf-8") as handle:
+            return cls(yaml.safe_load(handle) or {}, root)
+
+    def _resolve_order(self):
+        position = {name: index for index, name in enumerate(self.steps)}
+        dependents = {name: [] for name in self.steps}
+        pending = {}
+        for name, step in self.steps.items():
+            upstream = set()
+            for target, (step_name, _) in step.start_from.items():
+                if step_name not in self.steps:
+                    raise PipelineError(f"step {name}: start_from[{target}] references unknown step {step_name}")
+                upstream.add(step_name)
+            pending[name] = len(upstream)
+            for step_name in upstream:
+                dependents[step_name].append(name)
+
+        ready = [(position[name], name) for name, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, name = heapq.heappop(ready)
+            order.append(name)
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, (position[dependent], dependent))
+        if len(order) != len(self.steps):
+            cycle = sorted(set(self.steps) - set(order))
+            raise PipelineError(f"start_from links form a cycle between steps {', '.join(cycle)}")
+        return tuple(order)
+
+    def run(self, overrides=None):
+        """Run every step and return ``{step name: result}``.
+
+        ``overrides`` maps step names to extra start values (encoded like
+        YAML start values) that take precedence over start_values and
+        start_from, for what-if evaluation.
+        """
+        overrides = overrides or {}
+        unknown = sorted(set(overrides) - set(self.steps))
+        if unknown:
+            raise PipelineError(f"overrides reference unknown steps: {', '.join(unknown)}")
+
+        results = {}
+        for name in self.order:
+            step = self.steps[name]
+            start_values = {}
+            for key, value in step.start_values.items():
+                start_values[key] = _encode_scalar(value, f"step {name}: start_values[{key}]")
+            for target, (step_name, variable) in step.start_from.items():
+                upstream = results[step_name]
+                if variable not in upstream:
+                    raise PipelineError(
+                        f"step {name}: start_from[{target}] missing variable {variable} in step {step_name}"
+                    )
+                start_values[target] = _encode_scalar(upstream[variable], f"step {name}: start_from[{target}]")
+            for key, value in overrides.get(name, {}).items():
+                start_values[key] = _encode_scalar(value, f"step {name}: override {key}")
+            results[name] = step.run(start_values)
+        return results
+
+    def write_results(self, results):
+        """Write each step's result to its ``result`` path, as the runner does; returns the paths written."""
+        written = []
+        for name in self.order:
+            step = self.steps[name]
+            if not step.result_path:
+                continue
+            path = (self.root / step.result_path).resolve()
+            if not path.is_relative_to(self.root):
+                raise PipelineError(f"step {name}: result path {step.result_path!r} escapes the repository root")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(dump_result_json(results[name]), encoding="utf-8")
+            written.append(path)
+        return written
+
+
+def _encode_scalar(value, where):
+    """Start value as the runner passes it to the FMU: integers exact, floats through %.9g."""
+    if value is None:
+        raise PipelineError(f"{where}: value is null")
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, int):
+        return float(value)
+    if isinstance(value, float):
+        encoded = float(f"{value:.9g}")
+        if not math.isfinite(encoded):
+            raise PipelineError(f"{where}: unable to parse numeric value from '{value:.9g}'")
+        return encoded
+    if isinstance(value, str):
+        raise PipelineError(f"{where}: string values are not supported by the FMIL runner")
+    raise PipelineError(f"{where}: unsupported value type {type(value).__name__}")
+
+
+def _llround(value):
+    return int(math.floor(value + 0.5)) if value >= 0 else -int(math.floor(-value + 0.5))
+
+
+def _runner_value(value):
+    """Round a value the way the runner's JSON does: integers as-is, reals to 6 significant digits."""
+    if isinstance(value, int):
+        return value
+    if not math.isfinite(value):
+        return None
+    return float(f"{value:g}")
+
+
+def dump_result_json(result):
+    """Serialize a step result exactly like the runner's Go encoder (sorted keys, two-space indent)."""
+    return _go_json(result, "") + "\n"
+
+
+def _go_json(value, indent):
+    inner = indent + "  "
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = [f"{inner}{_go_string(key)}: {_go_json(value[key], inner)}" for key in sorted(value)]
+        return "{\n" + ",\n".join(items) + "\n" + indent + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        return "[\n" + ",\n".join(inner + _go_json(item, inner) for item in value) + "\n" + indent + "]"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return _go_number(float(value))
+    return _go_string(str(value))
+
+
+def _go_number(value):
+    # Go decodes every JSON number to float64 and re-encodes it with strconv's shortest form.
+    if value == 0.0:
+        return "-0" if math.copysign(1.0, value) < 0 else "0"
+    if 1e-6 <= abs(value) < 1e21:
+        text = format(Decimal(repr(value)), "f")
+        return text.rstrip("0").rstrip(".") if "." in text else text
+    mantissa, exponent = repr(value).split("e")
+    if exponent.startswith("-0"):
+        exponent = "-" + exponent[2:]
+    return f"{mantissa}e{exponent}"
+
+
+GO_STRING_ESCAPES = (
+    ("\n", "\\n"), ("\r", "\\r"), ("\t", "\\t"), ("<", "\\u003c"), (">", "\\u003e"), ("&", "\\u0026"),
+)
+
+
+def _go_string(text):
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    for char, code in GO_STRING_ESCAPES:
+        escaped = escaped.replace(char, code)
+    return f'"{escaped}"'
+
+
+def import_yaml():
+    try:
+        import yaml
+    except ImportError as exc:  # pragma: no cover - depends on local environment
+        raise PipelineError(
+            "PyYAML is required to read workflow files. Install it with 'python3 -m pip install pyyaml'."
+        ) from exc
+    return yaml
@@ -1,4 +1,8 @@
 import math
+from functools import partial
+from operator import itemgetter
+
+import numpy as np
 
 try:
     from pythonfmu import Fmi2Causality, Fmi2Variability
@@ -59,23 +63,63 @@ OUTPUT_DEFAULTS = {
 INTEGER_PARAMETERS = {"site_id", "scenario_id", "profile_id"}
 INTEGER_OUTPUTS = {"model_code", "status_code", "recommendation_code"}
 
-MODEL_CODES = {
-    "hydro_cascade_dispatch": 101,
-    "start_sequence_wear": 102,
-    "hsc_flexibility": 103,
-    "condition_monitoring": 201,
-    "runner_sediment_wear": 202,
-    "predictive_maintenance": 203,
-    "corrosion_biofouling": 301,
-    "cleaning_interval": 302,
-    "bess_sizing": 401,
-    "hybrid_ems": 402,
-    "fast_service_controller": 403,
-    "miv_regulation": 501,
-    "miv_fatigue": 502,
-    "kpi_assessment": 901,
-    "sustainability_cba": 902,
-}
+COMMON_OUTPUTS = ("model_code", "risk_index", "score", "confidence", "status_code", "recommendation_code", "kpi_score")
+
+
+class ReplicaModel:
+    """A registered replica model.
+
+    ``compute(params, t, ops)`` returns ``(outputs, risk, score, confidence)``,
+    where ``outputs`` holds the model-specific ``outputs`` it declares and
+    ``inputs`` names every parameter it reads. All other outputs keep their
+    OUTPUT_DEFAULTS value; COMMON_OUTPUTS are derived by with_common.
+    ``time_dependent`` is False for models that ignore ``t``. ReplicaBase
+    relies on both declarations to skip steps whose result cannot change.
+    """
+
+    __slots__ = ("key", "code", "compute", "inputs", "outputs", "time_dependent")
+
+    def __init__(self, key, code, compute, inputs=(), outputs=(), time_dependent=True):
+        self.key = key
+        self.code = code
+        self.compute = compute
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.time_dependent = time_dependent
+
+
+# Filled by register_model; MODEL_CODES maps each key to its numeric model_code.
+MODEL_REGISTRY = {}
+MODELS_BY_CODE = {}
+MODEL_CODES = {}
+
+
+def register_model(key, code, inputs=(), outputs=(), time_dependent=True):
+    """Decorator registering ``compute(params, t, ops)`` as replica model ``key``.
+
+    Replica modules can register their own models this way and point
+    ``MODEL_KEY`` at them without touching this file.
+    """
+
+    def decorator(compute):
+        if key in MODEL_REGISTRY or code in MODELS_BY_CODE:
+            raise ValueError(f"replica model {key!r} or code {code} is already registered")
+        unknown = (set(inputs) - set(PARAMETER_DEFAULTS)) | (set(outputs) - set(OUTPUT_DEFAULTS))
+        if unknown:
+            raise ValueError(f"replica model {key!r} declares unknown variables: {sorted(unknown)}")
+        model = ReplicaModel(key, code, compute, inputs, outputs, time_dependent)
+        MODEL_REGISTRY[key] = model
+        MODELS_BY_CODE[code] = model
+        MODEL_CODES[key] = code
+        return compute
+
+    return decorator
+
+
+def get_model(key_or_code):
+    """Look up a model by MODEL_KEY or model_code; unknown models fall back to GENERIC_MODEL."""
+    registry = MODELS_BY_CODE if isinstance(key_or_code, int) else MODEL_REGISTRY
+    return registry.get(key_or_code, GENERIC_MODEL)
 
 
 def clamp(value, minimum, maximum):
@@ -83,7 +127,52 @@ def clamp(value, minimum, maximum):
 
 
 def wave(time, profile_id, scale=1.0, period=24.0):
-    return scale * math.sin((float(time) / max(period, 1e-6)) * 2.0 * math.pi + profile_id * 0.43)
+    return _wave(_ScalarMath, time, profile_id, scale, period)
+
+
+def _wave(ops, time, profile_id, scale=1.0, period=24.0):
+    return scale * ops.sin((ops.float(time) / max(period, 1e-6)) * 2.0 * math.pi + profile_id * 0.43)
+
+
+class _ScalarMath:
+    """Builtin operations for one parameter set; the reference semantics."""
+
+    clamp = staticmethod(clamp)
+    max = staticmethod(max)
+    min = staticmethod(min)
+    sin = staticmethod(math.sin)
+    float = float
+    int = int
+
+
+class _ArrayMath:
+    """Element-wise NumPy counterparts of _ScalarMath.
+
+    max/min mirror the builtins on ties and NaN: ``max(a, b)`` keeps ``a``
+    unless ``b > a``, so e.g. clamp(nan, 0, 1) is 1 on both paths.
+    """
+
+    @staticmethod
+    def clamp(value, minimum, maximum):
+        return _ArrayMath.max(minimum, _ArrayMath.min(maximum, _ArrayMath.float(value)))
+
+    @staticmethod
+    def max(a, b):
+        return np.where(b > a, b, a)
+
+    @staticmethod
+    def min(a, b):
+        return np.where(b < a, b, a)
+
+    sin = staticmethod(np.sin)
+
+    @staticmethod
+    def float(value):
+        return np.asarray(value, dtype=np.float64)
+
+    @staticmethod
+    def int(value):
+        return np.trunc(np.asarray(value, dtype=np.float64))
 
 
 def status_from_risk(risk):
@@ -94,266 +183,655 @@ def status_from_risk(risk):
     return 0
 
 
+def status_from_risk_batch(risk):
+    return np.where(risk >= 0.72, 2, np.where(risk >= 0.42, 1, 0)).astype(np.int64)
+
+
+DISPATCH_MODELS = {"hydro_cascade_dispatch", "hybrid_ems", "hsc_flexibility"}
+WEAR_MODELS = {"start_sequence_wear", "runner_sediment_wear", "miv_fatigue"}
+FOULING_MODELS = {"corrosion_biofouling", "cleaning_interval"}
+
+
 def recommendation_from_outputs(model_key, risk, score):
     if risk >= 0.72:
         return 1
-    if model_key in {"hydro_cascade_dispatch", "hybrid_ems", "hsc_flexibility"} and score < 72.0:
+    if model_key in DISPATCH_MODELS and score < 72.0:
         return 2
-    if model_key in {"start_sequence_wear", "runner_sediment_wear", "miv_fatigue"} and risk >= 0.42:
+    if model_key in WEAR_MODELS and risk >= 0.42:
         return 3
-    if model_key in {"corrosion_biofouling", "cleaning_interval"} and risk >= 0.42:
+    if model_key in FOULING_MODELS and risk >= 0.42:
         return 4
     if model_key == "sustainability_cba" and score < 60.0:
         return 5
     return 0
 
 
+def recommendation_from_outputs_batch(model_key, risk, score):
+    if model_key in DISPATCH_MODELS:
+        code, triggered = 2, score < 72.0
+    elif model_key in WEAR_MODELS:
+        code, triggered = 3, risk >= 0.42
+    elif model_key in FOULING_MODELS:
+        code, triggered = 4, risk >= 0.42
+    elif model_key == "sustainability_cba":
+        code, triggered = 5, score < 60.0
+    else:
+        code, triggered = 0, False
+    return np.where(risk >= 0.72, 1, np.where(triggered, code, 0)).astype(np.int64)
+
+
 def base_inputs(params):
-    site = int(params.get("site_id", 0))
-    scenario = int(params.get("scenario_id", 1))
-    profile = int(params.get("profile_id", 1))
-    stress = clamp(0.16 + scenario * 0.055 + profile * 0.018 + site * 0.008, 0.0, 0.85)
-    confidence = clamp(params.get("input_confidence", 0.78), 0.2, 0.99)
+    return _base_inputs(params, _ScalarMath)
+
+
+def _base_inputs(params, ops):
+    site = ops.int(params.get("site_id", 0))
+    scenario = ops.int(params.get("scenario_id", 1))
+    profile = ops.int(params.get("profile_id", 1))
+    stress = ops.clamp(0.16 + scenario * 0.055 + profile * 0.018 + site * 0.008, 0.0, 0.85)
+    confidence = ops.clamp(params.get("input_confidence", 0.78), 0.2, 0.99)
     return site, scenario, profile, stress, confidence
 
 
 def with_common(model_key, outputs, risk, score, confidence):
     result = dict(OUTPUT_DEFAULTS)
     result.update(outputs)
+    _write_common_outputs(model_key, outputs, result, risk, score, confidence)
+    return result
+
+
+def _write_common_outputs(model_key, outputs, result, risk, score, confidence):
+    """Store COMMON_OUTPUTS into ``result`` by name.
+
+    ``outputs`` is the model's own dict; ``result`` is either a dict or a
+    ReplicaBase slot view, so both paths share this one definition.
+    """
+    risk = clamp(risk, 0.0, 1.0)
+    score = clamp(score, 0.0, 100.0)
     result["model_code"] = MODEL_CODES.get(model_key, 0)
-    result["risk_index"] = clamp(risk, 0.0, 1.0)
-    result["score"] = clamp(score, 0.0, 100.0)
+    result["risk_index"] = risk
+    result["score"] = score
     result["confidence"] = clamp(confidence, 0.0, 1.0)
-    result["status_code"] = status_from_risk(result["risk_index"])
-    result["recommendation_code"] = recommendation_from_outputs(model_key, result["risk_index"], result["score"])
-    if result["kpi_score"] == 0.0:
-        result["kpi_score"] = clamp(100.0 - result["risk_index"] * 55.0 + result["flexibility_delta_percent"], 0.0, 100.0)
-    return result
+    result["status_code"] = status_from_risk(risk)
+    result["recommendation_code"] = recommendation_from_outputs(model_key, risk, score)
+    kpi_score = outputs.get("kpi_score", _DEFAULT_KPI_SCORE)
+    if kpi_score == 0.0:
+        flexibility = outputs.get("flexibility_delta_percent", _DEFAULT_FLEXIBILITY)
+        kpi_score = clamp(100.0 - risk * 55.0 + flexibility, 0.0, 100.0)
+    result["kpi_score"] = kpi_score
+
+
+_DEFAULT_KPI_SCORE = OUTPUT_DEFAULTS["kpi_score"]
+_DEFAULT_FLEXIBILITY = OUTPUT_DEFAULTS["flexibility_delta_percent"]
 
 
 def compute_model_outputs(model_key, params, current_time):
-    site, scenario, profile, stress, confidence = base_inputs(params)
-    t = float(current_time)
-    osc = wave(t, profile, 1.0)
-
-    input_risk = clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
-    input_damage = clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
-    input_score = clamp(params.get("input_score", 72.0), 0.0, 100.0)
-    input_rul = max(0.0, float(params.get("input_rul_days", 900.0)))
-    input_value = float(params.get("input_value_delta_eur", 12000.0))
-    input_opex = float(params.get("input_opex_delta_eur", -3500.0))
-    input_co2 = float(params.get("input_co2_delta_tonnes", 12.0))
-    input_flex = float(params.get("input_flexibility_delta_percent", 4.0))
-    input_availability = float(params.get("input_availability_delta_percent", 2.5))
-
-    if model_key == "hydro_cascade_dispatch":
-        flex = 4.5 + scenario * 1.9 + profile * 0.8
-        risk = clamp(stress * 0.55 + max(0.0, 0.35 - flex / 30.0), 0.0, 1.0)
-        outputs = {
-            "power_mw": 185.0 + 22.0 * osc + scenario * 11.0,
-            "reservoir_level_m": 421.5 + profile * 0.9 + wave(t, profile, 1.7, 72.0),
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": 1.2 + flex * 0.18,
-            "value_delta_eur": 26000.0 + flex * 4200.0,
-            "opex_delta_eur": -4500.0 - flex * 720.0,
-            "co2_delta_tonnes": 6500.0 + flex * 900.0,
-        }
-        return with_common(model_key, outputs, risk, 78.0 + flex * 0.9 - risk * 18.0, confidence)
-
-    if model_key == "start_sequence_wear":
-        damage = clamp(0.12 + stress * 0.52 + max(0.0, scenario - 2) * 0.035 + 0.04 * abs(osc), 0.0, 1.0)
-        outputs = {
-            "damage_index": damage,
-            "risk_index": damage,
-            "rul_days": max(120.0, 1450.0 * (1.0 - damage)),
-            "availability_delta_percent": 2.0 + (1.0 - damage) * 2.5,
-            "flexibility_delta_percent": 3.0 + scenario * 0.9,
-            "value_delta_eur": input_value + 9000.0 + scenario * 1200.0,
-            "opex_delta_eur": input_opex - (1.0 - damage) * 5200.0,
-        }
-        return with_common(model_key, outputs, damage, 91.0 - damage * 52.0, confidence * 0.96)
-
-    if model_key == "hsc_flexibility":
-        flex = clamp(7.0 + scenario * 2.3 + 1.2 * osc, 0.0, 24.0)
-        risk = clamp(0.18 + stress * 0.34 + max(0.0, flex - 15.0) * 0.018, 0.0, 1.0)
-        outputs = {
-            "power_mw": 70.0 + flex * 4.5,
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": input_availability + flex * 0.12,
-            "value_delta_eur": input_value + flex * 5100.0,
-            "opex_delta_eur": input_opex - flex * 450.0,
-            "co2_delta_tonnes": input_co2 + flex * 820.0,
-        }
-        return with_common(model_key, outputs, risk, 72.0 + flex - risk * 18.0, confidence)
-
-    if model_key == "condition_monitoring":
-        sediment = clamp(params.get("input_sediment_exposure", 0.22) + 0.07 * scenario + 0.04 * max(0.0, osc), 0.0, 1.0)
-        corrosion = clamp(params.get("input_corrosion_index", 0.18) + 0.03 * site + 0.02 * abs(osc), 0.0, 1.0)
-        damage = clamp(input_damage * 0.45 + sediment * 0.22 + stress * 0.32, 0.0, 1.0)
-        outputs = {
-            "damage_index": damage,
-            "sediment_exposure": sediment,
-            "corrosion_index": corrosion,
-            "biofouling_index": clamp(params.get("input_biofouling_index", 0.24) + 0.03 * abs(osc), 0.0, 1.0),
-            "rul_days": max(90.0, 1800.0 * (1.0 - damage)),
-            "availability_delta_percent": input_availability,
-        }
-        return with_common(model_key, outputs, damage, 95.0 - damage * 60.0, confidence)
-
-    if model_key == "runner_sediment_wear":
-        sediment = clamp(params.get("input_sediment_exposure", input_risk) + 0.05 * scenario + 0.04 * max(0.0, osc), 0.0, 1.0)
-        damage = clamp(input_damage * 0.35 + sediment * 0.58 + stress * 0.18, 0.0, 1.0)
-        outputs = {
-            "sediment_exposure": sediment,
-            "damage_index": damage,
-            "rul_days": max(80.0, input_rul * (1.0 - damage * 0.42)),
-            "opex_delta_eur": input_opex - max(0.0, 0.55 - damage) * 3600.0,
-        }
-        return with_common(model_key, outputs, damage, 88.0 - damage * 58.0, confidence * 0.93)
-
-    if model_key == "predictive_maintenance":
-        risk = clamp(input_risk * 0.5 + input_damage * 0.32 + max(0.0, 600.0 - input_rul) / 2200.0, 0.0, 1.0)
-        outputs = {
-            "damage_index": clamp(input_damage, 0.0, 1.0),
-            "rul_days": max(60.0, min(input_rul, 1600.0) * (1.0 - risk * 0.22)),
-            "availability_delta_percent": input_availability + max(0.0, 0.65 - risk) * 2.8,
-            "opex_delta_eur": input_opex - max(0.0, 0.65 - risk) * 4500.0,
-        }
-        return with_common(model_key, outputs, risk, input_score * 0.45 + (1.0 - risk) * 55.0, confidence)
-
-    if model_key == "corrosion_biofouling":
-        corrosion = clamp(0.19 + scenario * 0.055 + 0.05 * abs(osc), 0.0, 1.0)
-        fouling = clamp(0.26 + profile * 0.045 + 0.06 * max(0.0, osc), 0.0, 1.0)
-        risk = clamp(corrosion * 0.52 + fouling * 0.4, 0.0, 1.0)
-        outputs = {
-            "corrosion_index": corrosion,
-            "biofouling_index": fouling,
-            "damage_index": risk,
-            "rul_days": 2100.0 * (1.0 - risk * 0.55),
-            "opex_delta_eur": -3500.0 - max(0.0, 0.55 - risk) * 6000.0,
-        }
-        return with_common(model_key, outputs, risk, 92.0 - risk * 50.0, confidence * 0.88)
-
-    if model_key == "cleaning_interval":
-        fouling = clamp(params.get("input_biofouling_index", input_risk), 0.0, 1.0)
-        corrosion = clamp(params.get("input_corrosion_index", input_risk * 0.8), 0.0, 1.0)
-        risk = clamp(fouling * 0.66 + corrosion * 0.18, 0.0, 1.0)
-        interval_days = max(45.0, 730.0 * (1.0 - risk * 0.72))
-        outputs = {
-            "biofouling_index": fouling,
-            "corrosion_index": corrosion,
-            "rul_days": interval_days,
-            "availability_delta_percent": max(0.4, 4.0 * (1.0 - risk)),
-            "value_delta_eur": input_value + (730.0 - interval_days) * 38.0,
-        }
-        return with_common(model_key, outputs, risk, 86.0 - risk * 44.0, confidence)
-
-    if model_key == "bess_sizing":
-        soc = clamp(54.0 + 18.0 * wave(t, profile, 1.0, 12.0), 12.0, 96.0)
-        flex = 5.0 + scenario * 1.8
-        degradation = clamp(0.18 + abs(soc - 55.0) / 180.0 + scenario * 0.025, 0.0, 1.0)
-        outputs = {
-            "soc_percent": soc,
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": input_availability + flex * 0.2,
-            "value_delta_eur": input_value + flex * 6200.0,
-            "damage_index": degradation,
-            "rul_days": 1600.0 * (1.0 - degradation * 0.55),
-        }
-        return with_common(model_key, outputs, degradation, 74.0 + flex * 1.3 - degradation * 22.0, confidence)
-
-    if model_key == "hybrid_ems":
-        soc = clamp(params.get("input_soc_percent", 58.0) + 15.0 * wave(t, profile, 1.0, 24.0), 8.0, 98.0)
-        flex = input_flex + 6.5 + scenario
-        risk = clamp(input_risk * 0.34 + abs(soc - 55.0) / 220.0 + stress * 0.2, 0.0, 1.0)
-        outputs = {
-            "soc_percent": soc,
-            "power_mw": 160.0 + 35.0 * osc + scenario * 8.0,
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": input_availability + flex * 0.25,
-            "value_delta_eur": input_value + flex * 7000.0,
-            "opex_delta_eur": input_opex - max(0.0, 0.75 - risk) * 3800.0,
-        }
-        return with_common(model_key, outputs, risk, 70.0 + flex * 1.5 - risk * 18.0, confidence)
-
-    if model_key == "fast_service_controller":
-        flex = 8.0 + scenario * 1.7 + max(0.0, osc) * 1.5
-        damage = clamp(input_damage * 0.35 + stress * 0.38 + flex * 0.012, 0.0, 1.0)
-        outputs = {
-            "power_mw": 210.0 + flex * 5.0,
-            "damage_index": damage,
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": input_availability + max(0.0, 1.0 - damage) * 2.0,
-            "value_delta_eur": input_value + flex * 6500.0,
-            "rul_days": max(100.0, input_rul * (1.0 - damage * 0.28)),
-        }
-        return with_common(model_key, outputs, damage, 82.0 + flex * 0.8 - damage * 35.0, confidence)
-
-    if model_key == "miv_regulation":
-        valve = clamp(params.get("input_valve_opening_percent", 42.0) + 12.0 * wave(t, profile, 1.0, 8.0), 12.0, 88.0)
-        risk = clamp(0.12 + abs(valve - 50.0) / 140.0 + stress * 0.32, 0.0, 1.0)
-        flex = 4.0 + valve / 8.0
-        outputs = {
-            "valve_opening_percent": valve,
-            "power_mw": 52.0 + valve * 0.74,
-            "flexibility_delta_percent": flex,
-            "availability_delta_percent": input_availability + 1.2,
-            "damage_index": risk,
-        }
-        return with_common(model_key, outputs, risk, 86.0 - risk * 34.0 + flex * 0.7, confidence * 0.92)
-
-    if model_key == "miv_fatigue":
-        valve = clamp(params.get("input_valve_opening_percent", 42.0), 0.0, 100.0)
-        fatigue = clamp(input_damage * 0.42 + abs(valve - 50.0) / 115.0 + input_risk * 0.3, 0.0, 1.0)
-        outputs = {
-            "valve_opening_percent": valve,
-            "damage_index": fatigue,
-            "rul_days": max(75.0, input_rul * (1.0 - fatigue * 0.5)),
-            "opex_delta_eur": input_opex - max(0.0, 0.58 - fatigue) * 3900.0,
-        }
-        return with_common(model_key, outputs, fatigue, 90.0 - fatigue * 58.0, confidence)
-
-    if model_key == "kpi_assessment":
-        score = clamp(input_score * 0.48 + (1.0 - input_risk) * 36.0 + max(0.0, input_flex) * 1.1 + max(0.0, input_availability) * 1.2, 0.0, 100.0)
-        risk = clamp(input_risk * 0.75 + max(0.0, 65.0 - score) / 180.0, 0.0, 1.0)
-        outputs = {
-            "kpi_score": score,
-            "availability_delta_percent": input_availability,
-            "flexibility_delta_percent": input_flex,
-            "value_delta_eur": input_value,
-            "opex_delta_eur": input_opex,
-            "co2_delta_tonnes": input_co2,
-            "rul_days": input_rul,
-        }
-        return with_common(model_key, outputs, risk, score, confidence)
-
-    if model_key == "sustainability_cba":
-        net_value = input_value - max(0.0, -input_opex)
-        score = clamp(55.0 + net_value / 18000.0 + input_co2 / 850.0 + input_availability * 1.2 - input_risk * 18.0, 0.0, 100.0)
-        risk = clamp(input_risk * 0.62 + max(0.0, 52.0 - score) / 150.0, 0.0, 1.0)
-        outputs = {
-            "value_delta_eur": net_value,
-            "opex_delta_eur": input_opex,
-            "co2_delta_tonnes": input_co2,
-            "availability_delta_percent": input_availability,
-            "flexibility_delta_percent": input_flex,
-            "kpi_score": score,
-        }
-        return with_common(model_key, outputs, risk, score, confidence * 0.9)
-
-    return with_common(model_key, {}, input_risk, input_score, confidence)
+    model = MODEL_REGISTRY.get(model_key, GENERIC_MODEL)
+    outputs, risk, score, confidence = model.compute(params, float(current_time), _ScalarMath)
+    return with_common(model_key, outputs, risk, score, confidence)
+
+
+def compute_declared_outputs(model_key, params, current_time):
+    """compute_model_outputs without the outputs the model never changes.
+
+    Returns only the model's declared outputs plus COMMON_OUTPUTS; every
+    other output equals its OUTPUT_DEFAULTS value.
+    """
+    model = MODEL_REGISTRY.get(model_key, GENERIC_MODEL)
+    outputs, risk, score, confidence = model.compute(params, float(current_time), _ScalarMath)
+    _write_common_outputs(model_key, outputs, outputs, risk, score, confidence)
+    return outputs
+
+
+def compute_model_outputs_batch(model_key, params, times):
+    """compute_model_outputs for many parameter sets and times in one NumPy pass.
+
+    ``params`` maps parameter names to scalars or equal-length arrays and
+    ``times`` is a scalar or an array; all are broadcast to a common length.
+    Missing parameters fall back exactly as in the scalar path. Returns one
+    column per OUTPUT_DEFAULTS entry: int64 for INTEGER_OUTPUTS (rounded as
+    ReplicaBase does), float64 otherwise.
+    """
+    params = {name: np.asarray(value) for name, value in params.items()}
+    times = np.asarray(times, dtype=np.float64)
+    size = np.broadcast(times, *params.values()).size if params else times.size
+    model = MODEL_REGISTRY.get(model_key, GENERIC_MODEL)
+    outputs, risk, score, confidence = model.compute(params, times, _ArrayMath)
+
+    columns = {
+        name: np.broadcast_to(np.asarray(outputs.get(name, default), dtype=np.float64), (size,)).copy()
+        for name, default in OUTPUT_DEFAULTS.items()
+    }
+    columns["model_code"] = np.full(size, MODEL_CODES.get(model_key, 0), dtype=np.int64)
+    columns["risk_index"] = np.broadcast_to(_ArrayMath.clamp(risk, 0.0, 1.0), (size,)).copy()
+    columns["score"] = np.broadcast_to(_ArrayMath.clamp(score, 0.0, 100.0), (size,)).copy()
+    columns["confidence"] = np.broadcast_to(_ArrayMath.clamp(confidence, 0.0, 1.0), (size,)).copy()
+    columns["status_code"] = status_from_risk_batch(columns["risk_index"])
+    columns["recommendation_code"] = recommendation_from_outputs_batch(
+        model_key, columns["risk_index"], columns["score"]
+    )
+    kpi_score = columns["kpi_score"]
+    unset = kpi_score == 0.0
+    kpi_score[unset] = _ArrayMath.clamp(
+        100.0 - columns["risk_index"] * 55.0 + columns["flexibility_delta_percent"], 0.0, 100.0
+    )[unset]
+    return columns
+
+
+def _generic(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_score = ops.clamp(params.get("input_score", 72.0), 0.0, 100.0)
+    return {}, input_risk, input_score, confidence
+
+
+# Used for MODEL_KEYs without a registered model (e.g. ReplicaBase's "generic"); model_code 0.
+GENERIC_MODEL = ReplicaModel(
+    "generic",
+    0,
+    _generic,
+    inputs=("site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_score"),
+    time_dependent=False,
+)
+
+
+@register_model(
+    "hydro_cascade_dispatch",
+    101,
+    inputs=("site_id", "scenario_id", "profile_id", "input_confidence"),
+    outputs=(
+        "power_mw", "reservoir_level_m", "flexibility_delta_percent", "availability_delta_percent",
+        "value_delta_eur", "opex_delta_eur", "co2_delta_tonnes",
+    ),
+)
+def _hydro_cascade_dispatch(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    flex = 4.5 + scenario * 1.9 + profile * 0.8
+    risk = ops.clamp(stress * 0.55 + ops.max(0.0, 0.35 - flex / 30.0), 0.0, 1.0)
+    outputs = {
+        "power_mw": 185.0 + 22.0 * osc + scenario * 11.0,
+        "reservoir_level_m": 421.5 + profile * 0.9 + _wave(ops, t, profile, 1.7, 72.0),
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": 1.2 + flex * 0.18,
+        "value_delta_eur": 26000.0 + flex * 4200.0,
+        "opex_delta_eur": -4500.0 - flex * 720.0,
+        "co2_delta_tonnes": 6500.0 + flex * 900.0,
+    }
+    return outputs, risk, 78.0 + flex * 0.9 - risk * 18.0, confidence
+
+
+@register_model(
+    "start_sequence_wear",
+    102,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_value_delta_eur",
+        "input_opex_delta_eur",
+    ),
+    outputs=(
+        "damage_index", "rul_days", "availability_delta_percent", "flexibility_delta_percent",
+        "value_delta_eur", "opex_delta_eur",
+    ),
+)
+def _start_sequence_wear(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    damage = ops.clamp(0.12 + stress * 0.52 + ops.max(0.0, scenario - 2) * 0.035 + 0.04 * abs(osc), 0.0, 1.0)
+    outputs = {
+        "damage_index": damage,
+        "rul_days": ops.max(120.0, 1450.0 * (1.0 - damage)),
+        "availability_delta_percent": 2.0 + (1.0 - damage) * 2.5,
+        "flexibility_delta_percent": 3.0 + scenario * 0.9,
+        "value_delta_eur": input_value + 9000.0 + scenario * 1200.0,
+        "opex_delta_eur": input_opex - (1.0 - damage) * 5200.0,
+    }
+    return outputs, damage, 91.0 - damage * 52.0, confidence * 0.96
+
+
+@register_model(
+    "hsc_flexibility",
+    103,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_value_delta_eur",
+        "input_opex_delta_eur", "input_co2_delta_tonnes", "input_availability_delta_percent",
+    ),
+    outputs=(
+        "power_mw", "flexibility_delta_percent", "availability_delta_percent", "value_delta_eur",
+        "opex_delta_eur", "co2_delta_tonnes",
+    ),
+)
+def _hsc_flexibility(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    input_co2 = ops.float(params.get("input_co2_delta_tonnes", 12.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    flex = ops.clamp(7.0 + scenario * 2.3 + 1.2 * osc, 0.0, 24.0)
+    risk = ops.clamp(0.18 + stress * 0.34 + ops.max(0.0, flex - 15.0) * 0.018, 0.0, 1.0)
+    outputs = {
+        "power_mw": 70.0 + flex * 4.5,
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": input_availability + flex * 0.12,
+        "value_delta_eur": input_value + flex * 5100.0,
+        "opex_delta_eur": input_opex - flex * 450.0,
+        "co2_delta_tonnes": input_co2 + flex * 820.0,
+    }
+    return outputs, risk, 72.0 + flex - risk * 18.0, confidence
+
+
+@register_model(
+    "condition_monitoring",
+    201,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_damage_index",
+        "input_availability_delta_percent", "input_sediment_exposure", "input_corrosion_index",
+        "input_biofouling_index",
+    ),
+    outputs=(
+        "damage_index", "sediment_exposure", "corrosion_index", "biofouling_index", "rul_days",
+        "availability_delta_percent",
+    ),
+)
+def _condition_monitoring(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_damage = ops.clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    sediment = ops.clamp(params.get("input_sediment_exposure", 0.22) + 0.07 * scenario + 0.04 * ops.max(0.0, osc), 0.0, 1.0)
+    corrosion = ops.clamp(params.get("input_corrosion_index", 0.18) + 0.03 * site + 0.02 * abs(osc), 0.0, 1.0)
+    damage = ops.clamp(input_damage * 0.45 + sediment * 0.22 + stress * 0.32, 0.0, 1.0)
+    outputs = {
+        "damage_index": damage,
+        "sediment_exposure": sediment,
+        "corrosion_index": corrosion,
+        "biofouling_index": ops.clamp(params.get("input_biofouling_index", 0.24) + 0.03 * abs(osc), 0.0, 1.0),
+        "rul_days": ops.max(90.0, 1800.0 * (1.0 - damage)),
+        "availability_delta_percent": input_availability,
+    }
+    return outputs, damage, 95.0 - damage * 60.0, confidence
+
+
+@register_model(
+    "runner_sediment_wear",
+    202,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_damage_index",
+        "input_rul_days", "input_opex_delta_eur", "input_sediment_exposure",
+    ),
+    outputs=("sediment_exposure", "damage_index", "rul_days", "opex_delta_eur"),
+)
+def _runner_sediment_wear(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_damage = ops.clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
+    input_rul = ops.max(0.0, ops.float(params.get("input_rul_days", 900.0)))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    sediment = ops.clamp(params.get("input_sediment_exposure", input_risk) + 0.05 * scenario + 0.04 * ops.max(0.0, osc), 0.0, 1.0)
+    damage = ops.clamp(input_damage * 0.35 + sediment * 0.58 + stress * 0.18, 0.0, 1.0)
+    outputs = {
+        "sediment_exposure": sediment,
+        "damage_index": damage,
+        "rul_days": ops.max(80.0, input_rul * (1.0 - damage * 0.42)),
+        "opex_delta_eur": input_opex - ops.max(0.0, 0.55 - damage) * 3600.0,
+    }
+    return outputs, damage, 88.0 - damage * 58.0, confidence * 0.93
+
+
+@register_model(
+    "predictive_maintenance",
+    203,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_damage_index",
+        "input_score", "input_rul_days", "input_opex_delta_eur", "input_availability_delta_percent",
+    ),
+    outputs=("damage_index", "rul_days", "availability_delta_percent", "opex_delta_eur"),
+    time_dependent=False,
+)
+def _predictive_maintenance(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_damage = ops.clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
+    input_score = ops.clamp(params.get("input_score", 72.0), 0.0, 100.0)
+    input_rul = ops.max(0.0, ops.float(params.get("input_rul_days", 900.0)))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    risk = ops.clamp(input_risk * 0.5 + input_damage * 0.32 + ops.max(0.0, 600.0 - input_rul) / 2200.0, 0.0, 1.0)
+    outputs = {
+        "damage_index": ops.clamp(input_damage, 0.0, 1.0),
+        "rul_days": ops.max(60.0, ops.min(input_rul, 1600.0) * (1.0 - risk * 0.22)),
+        "availability_delta_percent": input_availability + ops.max(0.0, 0.65 - risk) * 2.8,
+        "opex_delta_eur": input_opex - ops.max(0.0, 0.65 - risk) * 4500.0,
+    }
+    return outputs, risk, input_score * 0.45 + (1.0 - risk) * 55.0, confidence
+
+
+@register_model(
+    "corrosion_biofouling",
+    301,
+    inputs=("site_id", "scenario_id", "profile_id", "input_confidence"),
+    outputs=("corrosion_index", "biofouling_index", "damage_index", "rul_days", "opex_delta_eur"),
+)
+def _corrosion_biofouling(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    corrosion = ops.clamp(0.19 + scenario * 0.055 + 0.05 * abs(osc), 0.0, 1.0)
+    fouling = ops.clamp(0.26 + profile * 0.045 + 0.06 * ops.max(0.0, osc), 0.0, 1.0)
+    risk = ops.clamp(corrosion * 0.52 + fouling * 0.4, 0.0, 1.0)
+    outputs = {
+        "corrosion_index": corrosion,
+        "biofouling_index": fouling,
+        "damage_index": risk,
+        "rul_days": 2100.0 * (1.0 - risk * 0.55),
+        "opex_delta_eur": -3500.0 - ops.max(0.0, 0.55 - risk) * 6000.0,
+    }
+    return outputs, risk, 92.0 - risk * 50.0, confidence * 0.88
+
+
+@register_model(
+    "cleaning_interval",
+    302,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_value_delta_eur",
+        "input_biofouling_index", "input_corrosion_index",
+    ),
+    outputs=(
+        "biofouling_index", "corrosion_index", "rul_days", "availability_delta_percent", "value_delta_eur",
+    ),
+    time_dependent=False,
+)
+def _cleaning_interval(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    fouling = ops.clamp(params.get("input_biofouling_index", input_risk), 0.0, 1.0)
+    corrosion = ops.clamp(params.get("input_corrosion_index", input_risk * 0.8), 0.0, 1.0)
+    risk = ops.clamp(fouling * 0.66 + corrosion * 0.18, 0.0, 1.0)
+    interval_days = ops.max(45.0, 730.0 * (1.0 - risk * 0.72))
+    outputs = {
+        "biofouling_index": fouling,
+        "corrosion_index": corrosion,
+        "rul_days": interval_days,
+        "availability_delta_percent": ops.max(0.4, 4.0 * (1.0 - risk)),
+        "value_delta_eur": input_value + (730.0 - interval_days) * 38.0,
+    }
+    return outputs, risk, 86.0 - risk * 44.0, confidence
+
+
+@register_model(
+    "bess_sizing",
+    401,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_value_delta_eur",
+        "input_availability_delta_percent",
+    ),
+    outputs=(
+        "soc_percent", "flexibility_delta_percent", "availability_delta_percent", "value_delta_eur",
+        "damage_index", "rul_days",
+    ),
+)
+def _bess_sizing(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    soc = ops.clamp(54.0 + 18.0 * _wave(ops, t, profile, 1.0, 12.0), 12.0, 96.0)
+    flex = 5.0 + scenario * 1.8
+    degradation = ops.clamp(0.18 + abs(soc - 55.0) / 180.0 + scenario * 0.025, 0.0, 1.0)
+    outputs = {
+        "soc_percent": soc,
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": input_availability + flex * 0.2,
+        "value_delta_eur": input_value + flex * 6200.0,
+        "damage_index": degradation,
+        "rul_days": 1600.0 * (1.0 - degradation * 0.55),
+    }
+    return outputs, degradation, 74.0 + flex * 1.3 - degradation * 22.0, confidence
+
+
+@register_model(
+    "hybrid_ems",
+    402,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_value_delta_eur",
+        "input_opex_delta_eur", "input_flexibility_delta_percent", "input_availability_delta_percent",
+        "input_soc_percent",
+    ),
+    outputs=(
+        "soc_percent", "power_mw", "flexibility_delta_percent", "availability_delta_percent", "value_delta_eur",
+        "opex_delta_eur",
+    ),
+)
+def _hybrid_ems(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    input_flex = ops.float(params.get("input_flexibility_delta_percent", 4.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    soc = ops.clamp(params.get("input_soc_percent", 58.0) + 15.0 * _wave(ops, t, profile, 1.0, 24.0), 8.0, 98.0)
+    flex = input_flex + 6.5 + scenario
+    risk = ops.clamp(input_risk * 0.34 + abs(soc - 55.0) / 220.0 + stress * 0.2, 0.0, 1.0)
+    outputs = {
+        "soc_percent": soc,
+        "power_mw": 160.0 + 35.0 * osc + scenario * 8.0,
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": input_availability + flex * 0.25,
+        "value_delta_eur": input_value + flex * 7000.0,
+        "opex_delta_eur": input_opex - ops.max(0.0, 0.75 - risk) * 3800.0,
+    }
+    return outputs, risk, 70.0 + flex * 1.5 - risk * 18.0, confidence
+
+
+@register_model(
+    "fast_service_controller",
+    403,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_damage_index", "input_rul_days",
+        "input_value_delta_eur", "input_availability_delta_percent",
+    ),
+    outputs=(
+        "power_mw", "damage_index", "flexibility_delta_percent", "availability_delta_percent",
+        "value_delta_eur", "rul_days",
+    ),
+)
+def _fast_service_controller(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    osc = _wave(ops, t, profile, 1.0)
+    input_damage = ops.clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
+    input_rul = ops.max(0.0, ops.float(params.get("input_rul_days", 900.0)))
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    flex = 8.0 + scenario * 1.7 + ops.max(0.0, osc) * 1.5
+    damage = ops.clamp(input_damage * 0.35 + stress * 0.38 + flex * 0.012, 0.0, 1.0)
+    outputs = {
+        "power_mw": 210.0 + flex * 5.0,
+        "damage_index": damage,
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": input_availability + ops.max(0.0, 1.0 - damage) * 2.0,
+        "value_delta_eur": input_value + flex * 6500.0,
+        "rul_days": ops.max(100.0, input_rul * (1.0 - damage * 0.28)),
+    }
+    return outputs, damage, 82.0 + flex * 0.8 - damage * 35.0, confidence
+
+
+@register_model(
+    "miv_regulation",
+    501,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_availability_delta_percent",
+        "input_valve_opening_percent",
+    ),
+    outputs=(
+        "valve_opening_percent", "power_mw", "flexibility_delta_percent", "availability_delta_percent",
+        "damage_index",
+    ),
+)
+def _miv_regulation(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    valve = ops.clamp(params.get("input_valve_opening_percent", 42.0) + 12.0 * _wave(ops, t, profile, 1.0, 8.0), 12.0, 88.0)
+    risk = ops.clamp(0.12 + abs(valve - 50.0) / 140.0 + stress * 0.32, 0.0, 1.0)
+    flex = 4.0 + valve / 8.0
+    outputs = {
+        "valve_opening_percent": valve,
+        "power_mw": 52.0 + valve * 0.74,
+        "flexibility_delta_percent": flex,
+        "availability_delta_percent": input_availability + 1.2,
+        "damage_index": risk,
+    }
+    return outputs, risk, 86.0 - risk * 34.0 + flex * 0.7, confidence * 0.92
+
+
+@register_model(
+    "miv_fatigue",
+    502,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_damage_index",
+        "input_rul_days", "input_opex_delta_eur", "input_valve_opening_percent",
+    ),
+    outputs=("valve_opening_percent", "damage_index", "rul_days", "opex_delta_eur"),
+    time_dependent=False,
+)
+def _miv_fatigue(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_damage = ops.clamp(params.get("input_damage_index", 0.2), 0.0, 1.0)
+    input_rul = ops.max(0.0, ops.float(params.get("input_rul_days", 900.0)))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    valve = ops.clamp(params.get("input_valve_opening_percent", 42.0), 0.0, 100.0)
+    fatigue = ops.clamp(input_damage * 0.42 + abs(valve - 50.0) / 115.0 + input_risk * 0.3, 0.0, 1.0)
+    outputs = {
+        "valve_opening_percent": valve,
+        "damage_index": fatigue,
+        "rul_days": ops.max(75.0, input_rul * (1.0 - fatigue * 0.5)),
+        "opex_delta_eur": input_opex - ops.max(0.0, 0.58 - fatigue) * 3900.0,
+    }
+    return outputs, fatigue, 90.0 - fatigue * 58.0, confidence
+
+
+@register_model(
+    "kpi_assessment",
+    901,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_score",
+        "input_rul_days", "input_value_delta_eur", "input_opex_delta_eur", "input_co2_delta_tonnes",
+        "input_flexibility_delta_percent", "input_availability_delta_percent",
+    ),
+    outputs=(
+        "kpi_score", "availability_delta_percent", "flexibility_delta_percent", "value_delta_eur",
+        "opex_delta_eur", "co2_delta_tonnes", "rul_days",
+    ),
+    time_dependent=False,
+)
+def _kpi_assessment(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_score = ops.clamp(params.get("input_score", 72.0), 0.0, 100.0)
+    input_rul = ops.max(0.0, ops.float(params.get("input_rul_days", 900.0)))
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    input_co2 = ops.float(params.get("input_co2_delta_tonnes", 12.0))
+    input_flex = ops.float(params.get("input_flexibility_delta_percent", 4.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    score = ops.clamp(input_score * 0.48 + (1.0 - input_risk) * 36.0 + ops.max(0.0, input_flex) * 1.1 + ops.max(0.0, input_availability) * 1.2, 0.0, 100.0)
+    risk = ops.clamp(input_risk * 0.75 + ops.max(0.0, 65.0 - score) / 180.0, 0.0, 1.0)
+    outputs = {
+        "kpi_score": score,
+        "availability_delta_percent": input_availability,
+        "flexibility_delta_percent": input_flex,
+        "value_delta_eur": input_value,
+        "opex_delta_eur": input_opex,
+        "co2_delta_tonnes": input_co2,
+        "rul_days": input_rul,
+    }
+    return outputs, risk, score, confidence
+
+
+@register_model(
+    "sustainability_cba",
+    902,
+    inputs=(
+        "site_id", "scenario_id", "profile_id", "input_confidence", "input_risk_index", "input_value_delta_eur",
+        "input_opex_delta_eur", "input_co2_delta_tonnes", "input_flexibility_delta_percent",
+        "input_availability_delta_percent",
+    ),
+    outputs=(
+        "value_delta_eur", "opex_delta_eur", "co2_delta_tonnes", "availability_delta_percent",
+        "flexibility_delta_percent", "kpi_score",
+    ),
+    time_dependent=False,
+)
+def _sustainability_cba(params, t, ops):
+    site, scenario, profile, stress, confidence = _base_inputs(params, ops)
+    input_risk = ops.clamp(params.get("input_risk_index", 0.28), 0.0, 1.0)
+    input_value = ops.float(params.get("input_value_delta_eur", 12000.0))
+    input_opex = ops.float(params.get("input_opex_delta_eur", -3500.0))
+    input_co2 = ops.float(params.get("input_co2_delta_tonnes", 12.0))
+    input_flex = ops.float(params.get("input_flexibility_delta_percent", 4.0))
+    input_availability = ops.float(params.get("input_availability_delta_percent", 2.5))
+    net_value = input_value - ops.max(0.0, -input_opex)
+    score = ops.clamp(55.0 + net_value / 18000.0 + input_co2 / 850.0 + input_availability * 1.2 - input_risk * 18.0, 0.0, 100.0)
+    risk = ops.clamp(input_risk * 0.62 + ops.max(0.0, 52.0 - score) / 150.0, 0.0, 1.0)
+    outputs = {
+        "value_delta_eur": net_value,
+        "opex_delta_eur": input_opex,
+        "co2_delta_tonnes": input_co2,
+        "availability_delta_percent": input_availability,
+        "flexibility_delta_percent": input_flex,
+        "kpi_score": score,
+    }
+    return outputs, risk, score, confidence * 0.9
+
+
+class SlotView:
+    """Name-keyed access to a replica's value list.
+
+    Models read parameters through ``get`` exactly as from a dict, and
+    _write_common_outputs stores outputs through ``__setitem__``, without a
+    per-step dict being built.
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values, index):
+        self._values = values
+        self._index = index
+
+    def get(self, name, default=None):
+        slot = self._index.get(name)
+        return default if slot is None else self._values[slot]
+
+    def __getitem__(self, name):
+        return self._values[self._index[name]]
+
+    def __setitem__(self, name, value):
+        self._values[self._index[name]] = value
 
 
 if PYTHONFMU_AVAILABLE:
 
     class ReplicaBase(Fmi2Slave):
+        """Python FMU running the replica model registered as MODEL_KEY.
+
+        Parameter and output values live in one preallocated list indexed by
+        value reference; the FMI getters and setters read and write it
+        directly and do_step overwrites the model's outputs in place. A step
+        whose model inputs (and time, for time-dependent models) equal those
+        of the previous computation keeps the outputs already stored.
+        """
+
         MODEL_KEY = "generic"
 
         def __init__(self, **kwargs):
+            self._values = []
+            self._value_refs = {}
             super().__init__(**kwargs)
 
             for name, default in PARAMETER_DEFAULTS.items():
-                setattr(self, name, default)
                 if name in INTEGER_PARAMETERS:
                     variable = Integer(
                         name,
@@ -368,10 +846,9 @@ if PYTHONFMU_AVAILABLE:
                         variability=Fmi2Variability.tunable,
                         start=float(default),
                     )
-                self.register_variable(variable)
+                self._register_slot(variable, default)
 
             for name, default in OUTPUT_DEFAULTS.items():
-                setattr(self, name, default)
                 if name in INTEGER_OUTPUTS:
                     variable = Integer(
                         name,
@@ -384,7 +861,42 @@ if PYTHONFMU_AVAILABLE:
                         causality=Fmi2Causality.output,
                         variability=Fmi2Variability.continuous,
                     )
-                self.register_variable(variable)
+                self._register_slot(variable, default)
+
+            value_refs = self._value_refs
+            self._parameters = SlotView(self._values, {name: value_refs[name] for name in PARAMETER_DEFAULTS})
+            self._outputs = SlotView(self._values, {name: value_refs[name] for name in OUTPUT_DEFAULTS})
+            self._model = get_model(self.MODEL_KEY)
+            self._model_output_refs = tuple((name, value_refs[name]) for name in self._model.outputs)
+            input_refs = [value_refs[name] for name in self._model.inputs]
+            self._read_inputs = itemgetter(*input_refs) if input_refs else lambda values: ()
+            self._invalidate_outputs()
+
+        def _register_slot(self, variable, default):
+            self.register_variable(variable)
+            value_ref = variable.value_reference
+            values = self._values
+            if value_ref >= len(values):
+                values.extend([None] * (value_ref + 1 - len(values)))
+            values[value_ref] = default
+            variable.getter = partial(values.__getitem__, value_ref)
+            variable.setter = partial(values.__setitem__, value_ref)
+            self._value_refs[variable.name] = value_ref
+
+        # The FMU variables stay readable and writable as attributes, backed by _values.
+        def __getattr__(self, name):
+            if not name.startswith("_"):
+                value_ref = self._value_refs.get(name)
+                if value_ref is not None:
+                    return self._values[value_ref]
+            raise AttributeError(name)
+
+        def __setattr__(self, name, value):
+            value_ref = None if name.startswith("_") else self._value_refs.get(name)
+            if value_ref is None:
+                super().__setattr__(name, value)
+            else:
+                self._values[value_ref] = value
 
         def enter_initialization_mode(self):
             self._update_outputs(0.0)
@@ -393,15 +905,27 @@ if PYTHONFMU_AVAILABLE:
             self._update_outputs(current_time)
             return True
 
-        def _parameter_values(self):
-            return {name: getattr(self, name) for name in PARAMETER_DEFAULTS}
+        def _set_fmu_state(self, state):
+            super()._set_fmu_state(state)
+            self._invalidate_outputs()
+
+        def _invalidate_outputs(self):
+            self._computed_inputs = None
+            self._computed_time = None
 
         def _update_outputs(self, current_time):
-            outputs = compute_model_outputs(self.MODEL_KEY, self._parameter_values(), current_time)
-            for name in OUTPUT_DEFAULTS:
-                value = outputs.get(name, OUTPUT_DEFAULTS[name])
-                if name in INTEGER_OUTPUTS:
-                    value = int(round(value))
-                else:
-                    value = float(value)
-                setattr(self, name, value)
+            current_time = float(current_time)
+            inputs = self._read_inputs(self._values)
+            if inputs == self._computed_inputs and (
+                not self._model.time_dependent or current_time == self._computed_time
+            ):
+                return
+
+            # Outputs outside the model's declared set keep the defaults assigned in __init__.
+            outputs, risk, score, confidence = self._model.compute(self._parameters, current_time, _ScalarMath)
+            values = self._values
+            for name, value_ref in self._model_output_refs:
+                values[value_ref] = float(outputs[name])
+            _write_common_outputs(self.MODEL_KEY, outputs, self._outputs, risk, score, confidence)
+            self._computed_inputs = inputs
+            self._computed_time = current_time
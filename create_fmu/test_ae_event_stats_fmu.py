@@ -1,17 +1,44 @@
+import os
 import tempfile
 import unittest
 import sys
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import numpy as np
+
+import ae_event_stats_fmu
 from ae_event_stats_fmu import (
+    CACHE_DIR_ENV,
+    AEEventTable,
+    DatasetCatalog,
+    EventHistograms,
+    EventTableFollower,
+    PYTHONFMU_AVAILABLE,
+    QuantileSketch,
+    RollingWindow,
+    TABLE_COLUMNS,
+    channels_overlap,
+    compute_rolling_trace,
+    is_current_conversion,
+    load_cached_event_table,
     load_event_table,
+    merge_event_tables,
+    open_event_table,
+    open_rolling_trace,
     parse_arrival_time,
+    parse_arrival_times,
     percentile,
+    percentiles,
     resolve_dataset_path,
+    rolling_trace_path,
     rolling_metrics,
+    save_event_table,
+    save_rolling_trace,
     summarize_events,
+    summarize_file,
 )
 
 
@@ -22,6 +49,33 @@ class AEEventStatsTest(unittest.TestCase):
             (((4 * 24 + 22) * 60 + 12) * 60 + 35) + 0.527071,
         )
 
+    def test_parse_arrival_times_matches_scalar_bit_for_bit(self):
+        raw_values = [
+            " 4:22:12:35:527 071000",
+            "23:10:42:54:856 774800",
+            "0:00:00:00:000 000000",
+            "1:00:00:00:",
+            "1:00:00:00:527.071",
+            "\t1:00:00:01:5",
+            "+1:00:00:01:5",
+            "1: 2:03:04:5",
+            "1:2:3:4:123456789012345678",
+            "bad-time",
+            "1:2:3:4",
+            "1:2:3:4:5:6",
+            "",
+        ]
+        seconds, valid = parse_arrival_times(raw_values)
+
+        for raw, value, is_valid in zip(raw_values, seconds, valid):
+            try:
+                expected = parse_arrival_time(raw)
+            except ValueError:
+                self.assertFalse(is_valid, raw)
+                continue
+            self.assertTrue(is_valid, raw)
+            self.assertEqual(np.float64(expected).tobytes(), value.tobytes(), raw)
+
     def test_loads_ch2_and_ch6_fixture_counts(self):
         ch2 = load_event_table(resolve_dataset_path(2, root=Path.cwd()))
         ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
@@ -36,6 +90,20 @@ class AEEventStatsTest(unittest.TestCase):
         self.assertEqual(ch6.metadata["Sensor location"], "MIV S6")
         self.assertAlmostEqual(ch6.events[-1].elapsed_seconds, 6550.0264236)
 
+    def test_table_columns_are_contiguous_float64_with_event_view(self):
+        ch2 = load_event_table(resolve_dataset_path(2, root=Path.cwd()))
+
+        for name in TABLE_COLUMNS:
+            column = ch2.column(name)
+            self.assertEqual(column.dtype, np.float64)
+            self.assertTrue(column.flags["C_CONTIGUOUS"])
+            self.assertEqual(len(column), len(ch2))
+        self.assertIs(ch2.times, ch2.column("elapsed_seconds"))
+        self.assertEqual(ch2.events[10].amplitude, ch2.column("amplitude")[10])
+
+        rebuilt = AEEventTable.from_events(ch2.events, ch2.invalid_rows, ch2.metadata, ch2.source_path)
+        self.assertEqual(summarize_events(rebuilt), summarize_events(ch2))
+
     def test_summarizes_expected_core_metrics(self):
         ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
         summary = summarize_events(ch6)
@@ -55,10 +123,33 @@ class AEEventStatsTest(unittest.TestCase):
         self.assertGreater(values["rolling_amplitude_p95"], 0.0)
         self.assertGreaterEqual(values["cumulative_energy"], 0.0)
 
+    def test_rolling_window_matches_stateless_rolling_metrics(self):
+        ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
+        window = RollingWindow(ch6, window_seconds=300.0)
+        sample_times = [float(t) for t in range(0, 6601, 60)] + [120.0, 6600.0]
+
+        for current_time in sample_times:
+            expected = rolling_metrics(ch6, current_time, 300.0)
+            actual = window.update(current_time)
+            for name, value in expected.items():
+                if name == "cumulative_energy":
+                    self.assertAlmostEqual(actual[name], value, places=12)
+                else:
+                    self.assertEqual(actual[name], value, (current_time, name))
+
     def test_percentile_uses_linear_interpolation(self):
         self.assertEqual(percentile([10.0, 20.0, 30.0], 50), 20.0)
         self.assertEqual(percentile([0.0, 100.0], 95), 95.0)
 
+    def test_percentiles_share_one_pass_and_skip_non_finite_values(self):
+        values = [5.0, float("nan"), 1.0, 4.0, float("inf"), 2.0, 3.0]
+        results, maximum = percentiles(values, (50, 95), with_max=True)
+
+        self.assertEqual(results, [percentile(values, 50), percentile(values, 95)])
+        self.assertEqual(results[0], 3.0)
+        self.assertEqual(maximum, 5.0)
+        self.assertEqual(percentiles([], (50,), with_max=True), ([0.0], 0.0))
+
     def test_invalid_rows_are_counted_and_skipped(self):
         content = """Sensor location:,demo
 
@@ -76,6 +167,452 @@ bad-time,11,1,1,0.1,1,1,0.3,21,0,0,0,0,0,101,51,0,0,0,0,0,41,41,41
         self.assertEqual(table.invalid_rows, 1)
         self.assertAlmostEqual(table.events[-1].elapsed_seconds, 1.0)
 
+    def test_chunked_parsing_is_independent_of_chunk_size(self):
+        path = resolve_dataset_path(2, root=Path.cwd())
+        whole = load_event_table(path)
+        chunked = load_event_table(path, chunk_rows=7)
+
+        self.assertEqual(chunked.metadata, whole.metadata)
+        self.assertEqual(chunked.invalid_rows, whole.invalid_rows)
+        for name in TABLE_COLUMNS:
+            np.testing.assert_array_equal(chunked.column(name), whole.column(name))
+
+    def test_cached_tables_are_memory_mapped_and_invalidated_on_change(self):
+        source = resolve_dataset_path(2, root=Path.cwd())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "events.csv"
+            cache_dir = Path(tmpdir) / "cache"
+            path.write_bytes(source.read_bytes())
+
+            parsed = load_cached_event_table(path, cache_dir=cache_dir)
+            cached = load_cached_event_table(path, cache_dir=cache_dir)
+            self.assertIsInstance(cached.times, np.memmap)
+            self.assertEqual(cached.metadata, parsed.metadata)
+            self.assertEqual(summarize_events(cached), summarize_events(parsed))
+
+            lines = path.read_text().splitlines()
+            path.write_text("\n".join(lines[:-1]) + "\n")
+            shorter = load_cached_event_table(path, cache_dir=cache_dir)
+            self.assertEqual(len(shorter), len(parsed) - 1)
+            self.assertEqual(len(list(cache_dir.iterdir())), 1)
+
+    def test_cache_eviction_keeps_total_size_bounded(self):
+        source = resolve_dataset_path(2, root=Path.cwd())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = Path(tmpdir) / "cache"
+            for index in range(3):
+                path = Path(tmpdir) / f"events_{index}.csv"
+                path.write_bytes(source.read_bytes())
+                load_cached_event_table(path, cache_dir=cache_dir, max_bytes=1)
+
+            self.assertEqual(len(list(cache_dir.iterdir())), 1)
+
+    def test_converted_tables_are_memory_mapped_without_resorting(self):
+        source = resolve_dataset_path(6, root=Path.cwd())
+        parsed = load_event_table(source)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_event_table(parsed, tmpdir)
+            converted = open_event_table(tmpdir, source)
+
+            self.assertTrue(is_current_conversion(tmpdir, source))
+            self.assertIsInstance(converted.times, np.memmap)
+            sorted_values, ranks = converted.ranked["amplitude"]
+            self.assertIsInstance(sorted_values, np.memmap)
+            self.assertIsInstance(ranks, np.memmap)
+            self.assertNotIn("energy", converted.ranked)
+            self.assertFalse((Path(tmpdir) / "energy.sorted.npy").exists())
+            self.assertEqual(summarize_events(converted), summarize_events(parsed))
+
+            window = RollingWindow(converted, window_seconds=300.0)
+            for current_time in (60.0, 3600.0, 6600.0):
+                expected = rolling_metrics(parsed, current_time, 300.0)
+                actual = window.update(current_time)
+                self.assertEqual(actual["rolling_amplitude_p95"], expected["rolling_amplitude_p95"])
+                self.assertEqual(actual["rolling_asl_p95"], expected["rolling_asl_p95"])
+
+    def test_dataset_catalog_reads_manifest_groups_and_indexes_channel_files(self):
+        source = resolve_dataset_path(2, root=Path.cwd())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ae_dir = Path(tmpdir) / "data" / "ae_event_statistics"
+            (ae_dir / "raw").mkdir(parents=True)
+            (ae_dir / "raw" / "miv_a_CH11.csv").write_bytes(source.read_bytes())
+            (ae_dir / "raw" / "listed.csv").write_bytes(source.read_bytes())
+            (ae_dir / "datasets.json").write_text(
+                '{"datasets": {"40": {"file": "raw/listed.csv"}},'
+                ' "groups": {"7": {"datasets": [11, 40]}}}'
+            )
+            catalog = DatasetCatalog.discover([tmpdir])
+
+            self.assertEqual(catalog.ids(), [11, 40])
+            self.assertEqual(catalog.group(7), [11, 40])
+            self.assertEqual(catalog.get(11).sensor_location, "MIV S2")
+            self.assertEqual(catalog.get(40).sampling_rate_hz, 1_000_000.0)
+            with self.assertRaises(ValueError):
+                catalog.get(3)
+
+    def test_merged_channels_share_the_acquisition_clock(self):
+        ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
+        # Even and odd hits as two channels recorded together on one clock.
+        even, odd = (
+            AEEventTable(
+                {name: column[offset::2] for name, column in ch6.columns.items()},
+                0,
+                dict(ch6.metadata, **{"Sensor location": f"channel {offset}"}),
+                ch6.source_path,
+                start_seconds=ch6.start_seconds,
+            )
+            for offset in (0, 1)
+        )
+        merged = merge_event_tables([odd, even])
+
+        self.assertEqual(len(merged), len(ch6))
+        self.assertEqual(merged.start_seconds, ch6.start_seconds)
+        np.testing.assert_array_equal(merged.times, ch6.times)
+        self.assertEqual(merged.metadata["Demonstrator"], "LeCheylas")
+        self.assertNotIn("Sensor location", merged.metadata)
+        self.assertAlmostEqual(merged.column("energy").sum(), ch6.column("energy").sum())
+
+    def test_channels_from_separate_captures_are_not_merged(self):
+        ch2 = load_event_table(resolve_dataset_path(2, root=Path.cwd()))
+        ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
+        self.assertFalse(channels_overlap([ch2, ch6]))
+        self.assertTrue(channels_overlap([ch6, ch6]))
+        with self.assertRaisesRegex(ValueError, "separate captures"):
+            merge_event_tables([ch2, ch6])
+
+    def test_approximate_percentiles_stay_within_relative_error_bound(self):
+        ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
+        exact = summarize_events(ch6)
+        approximate = summarize_events(ch6, quantile_accuracy=0.01)
+
+        for name in ("amplitude_p50", "amplitude_p95", "rms_p95", "asl_p50", "frequency_centroid_p50"):
+            self.assertLessEqual(abs(approximate[name] - exact[name]), 0.01 * abs(exact[name]), name)
+        self.assertEqual(approximate["amplitude_max"], exact["amplitude_max"])
+
+        exact_window = RollingWindow(ch6, window_seconds=300.0)
+        sketch_window = RollingWindow(ch6, window_seconds=300.0, quantile_accuracy=0.01)
+        for current_time in range(0, 6601, 300):
+            expected = exact_window.update(float(current_time))["rolling_amplitude_p95"]
+            actual = sketch_window.update(float(current_time))["rolling_amplitude_p95"]
+            self.assertLessEqual(abs(actual - expected), 0.01 * abs(expected), current_time)
+
+    def test_quantile_sketches_merge_and_remove_values(self):
+        values = np.linspace(-50.0, 150.0, 4001)
+        whole = QuantileSketch(0.02)
+        whole.add(values)
+        left, right = QuantileSketch(0.02), QuantileSketch(0.02)
+        left.add(values[:1500])
+        right.add(values[1500:])
+
+        merged = left.merge(right)
+        self.assertEqual(merged.count, len(values))
+        self.assertEqual(merged.quantile(95), whole.quantile(95))
+
+        merged.remove(values[:1500])
+        self.assertEqual(merged.count, len(values) - 1500)
+        self.assertAlmostEqual(merged.quantile(50), percentile(values[1500:], 50), delta=0.02 * 100.0)
+        with self.assertRaises(ValueError):
+            whole.merge(QuantileSketch(0.05))
+
+    def test_parallel_file_summary_matches_whole_table_summary(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lines = resolve_dataset_path(6, root=Path.cwd()).read_bytes().splitlines(keepends=True)
+            lines.insert(len(lines) // 2, b"bad-time,1,2\r\n")
+            path = Path(tmpdir) / "AE_CH6.csv"
+            path.write_bytes(b"".join(lines))
+            table = load_event_table(path)
+
+            for quantile_accuracy in (0.0, 0.01):
+                expected = summarize_events(table, quantile_accuracy=quantile_accuracy)
+                actual = summarize_file(path, workers=3, quantile_accuracy=quantile_accuracy, min_range_bytes=1)
+                self.assertEqual(list(actual), list(expected))
+                self.assertEqual(actual["invalid_rows"], 1)
+                self.assertAlmostEqual(actual.pop("energy_sum"), expected.pop("energy_sum"), places=12)
+                self.assertEqual(actual, expected)
+
+    def test_follower_parses_only_appended_complete_lines(self):
+        data = resolve_dataset_path(6, root=Path.cwd()).read_bytes()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "AE_CH6.csv"
+            path.write_bytes(b"")
+            follower = EventTableFollower(path)
+            window = None
+            current_time = 0.0
+            for start in range(0, len(data), 100_000):
+                with path.open("ab") as handle:
+                    handle.write(data[start : start + 100_000])
+                first_changed = follower.poll()
+                if not len(follower.table):
+                    continue
+                if window is None:
+                    window = RollingWindow(follower.table, window_seconds=300.0, follow=True)
+                elif first_changed is not None:
+                    window.extend(follower.table, first_changed)
+                current_time = min(current_time + 600.0, float(follower.table.times[-1]))
+                expected = rolling_metrics(follower.table, current_time, 300.0)
+                for name, value in window.update(current_time).items():
+                    self.assertAlmostEqual(value, expected[name], places=9, msg=name)
+
+            self.assertEqual(follower.offset, len(data))
+            self.assertIsNone(follower.poll())
+            table = load_event_table(path)
+            for name in TABLE_COLUMNS:
+                np.testing.assert_array_equal(follower.table.column(name), table.column(name))
+            self.assertEqual(follower.summary(), summarize_events(table))
+
+    def test_follower_folds_late_hits_into_the_window_and_summary(self):
+        text = resolve_dataset_path(6, root=Path.cwd()).read_text(encoding="utf-8-sig")
+        lines = text.splitlines(keepends=True)
+        header_end = next(index for index, line in enumerate(lines) if line.startswith("Arrival time,")) + 1
+        rows = lines[header_end:]
+        # Every third block of hits reaches the file one block late.
+        blocks = [rows[start : start + 400] for start in range(0, len(rows), 400)]
+        for index in range(0, len(blocks) - 1, 3):
+            blocks[index], blocks[index + 1] = blocks[index + 1], blocks[index]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "AE_CH6.csv"
+            path.write_text("".join(lines[:header_end]), encoding="utf-8")
+            follower = EventTableFollower(path)
+            window = None
+            late_polls = 0
+            for block in blocks:
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.writelines(block)
+                previous_count = len(follower.table)
+                first_changed = follower.poll()
+                if window is None:
+                    window = RollingWindow(follower.table, window_seconds=300.0, follow=True)
+                else:
+                    late_polls += first_changed < previous_count
+                    window.extend(follower.table, first_changed, follower.appended)
+                current_time = float(follower.table.times[-1])
+                expected = rolling_metrics(follower.table, current_time, 300.0)
+                for name, value in window.update(current_time).items():
+                    self.assertAlmostEqual(value, expected[name], places=6, msg=name)
+
+            self.assertGreater(late_polls, 0)
+            expected = summarize_events(follower.table)
+            actual = follower.summary()
+            self.assertAlmostEqual(actual.pop("energy_sum"), expected.pop("energy_sum"), places=9)
+            self.assertEqual(actual, expected)
+
+    def test_precomputed_rolling_trace_matches_rolling_window(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "AE_CH6.csv"
+            source.write_bytes(resolve_dataset_path(6, root=Path.cwd()).read_bytes())
+            ch6 = load_event_table(source)
+            save_rolling_trace(compute_rolling_trace(ch6, 300.0, 60.0), Path(tmpdir) / "trace", source)
+            trace = open_rolling_trace(Path(tmpdir) / "trace", source, 300.0, 60.0)
+            self.assertIsInstance(trace.values, np.memmap)
+            self.assertIsNone(open_rolling_trace(Path(tmpdir) / "trace", source, 300.0000001, 60.0))
+            self.assertIsNone(open_rolling_trace(Path(tmpdir) / "trace", source, 300.0, 60.0000001))
+            self.assertNotEqual(rolling_trace_path(source, 300.0, 60.0), rolling_trace_path(source, 300.0000001, 60.0))
+
+            window = RollingWindow(ch6, window_seconds=300.0)
+            duration = float(ch6.times[-1])
+            for step in range(0, 112):
+                expected = window.update(min(step * 60.0, duration))
+                actual = trace.sample(step * 60.0)
+                for name, value in expected.items():
+                    self.assertAlmostEqual(actual[name], value, places=9, msg=name)
+            self.assertIsNone(trace.sample(90.0))
+
+            with source.open("ab") as handle:
+                handle.write(b" 1:00:00:00:000 000000,30,1,1,1,1,1,1,1,1,1,1,1\r\n")
+            self.assertIsNone(open_rolling_trace(Path(tmpdir) / "trace", source))
+
+    def test_event_histograms_bin_time_energy_and_frequency_bands(self):
+        ch6 = load_event_table(resolve_dataset_path(6, root=Path.cwd()))
+        histograms = EventHistograms.from_table(ch6, bin_seconds=60.0)
+
+        expected_counts, _ = np.histogram(ch6.times, bins=np.arange(len(histograms.counts) + 1) * 60.0)
+        np.testing.assert_array_equal(histograms.counts, expected_counts)
+        self.assertAlmostEqual(float(np.sum(histograms.energy)), float(np.sum(ch6.column("energy"))))
+        for name, counts in histograms.band_counts.items():
+            self.assertEqual(int(counts.sum()), len(ch6))
+            self.assertEqual(
+                int(counts[1]), int(np.count_nonzero((ch6.column(name) >= 100.0) & (ch6.column(name) < 200.0)))
+            )
+        self.assertEqual(histograms.completed_bin(120.0), (int(expected_counts[1]), float(histograms.energy[1])))
+        self.assertEqual(histograms.completed_bin(0.0), (0, 0.0))
+
+        split = EventHistograms(bin_seconds=60.0)
+        split.add({name: column[:5000] for name, column in ch6.columns.items()})
+        split.add({name: column[5000:] for name, column in ch6.columns.items()})
+        np.testing.assert_array_equal(split.counts, histograms.counts)
+        self.assertEqual(split.to_dict()["band_counts"], histograms.to_dict()["band_counts"])
+
+
+@unittest.skipUnless(PYTHONFMU_AVAILABLE, "pythonfmu is not installed")
+class AEEventStatsFmuTest(unittest.TestCase):
+    """Drives the AEEventStats slave through each mode on a copy of the CH6 fixture."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        raw_dir = Path(tmpdir.name) / "data" / "ae_event_statistics" / "raw"
+        raw_dir.mkdir(parents=True)
+        self.data = resolve_dataset_path(6, root=Path.cwd()).read_bytes()
+        self.source = raw_dir / "AE_CH6.csv"
+        self.source.write_bytes(self.data)
+        (raw_dir / "AE_CH2.csv").write_bytes(resolve_dataset_path(2, root=Path.cwd()).read_bytes())
+
+        # Even and odd hits of CH6 as two channels recorded together, grouped as dataset_group 1;
+        # group 2 holds the separate CH2 and CH6 captures.
+        lines = self.data.decode("utf-8-sig").splitlines(keepends=True)
+        header_end = next(index for index, line in enumerate(lines) if line.startswith("Arrival time,")) + 1
+        for dataset_id, offset in ((31, 0), (32, 1)):
+            rows = lines[header_end:][offset::2]
+            (raw_dir / f"AE_CH{dataset_id}.csv").write_text("".join(lines[:header_end] + rows), encoding="utf-8")
+        (raw_dir.parent / "datasets.json").write_text('{"datasets": {}, "groups": {"1": {"datasets": [31, 32]}, "2": {"datasets": [2, 6]}}}')
+
+        catalog = DatasetCatalog.discover([tmpdir.name])
+        for patcher in (
+            mock.patch.object(ae_event_stats_fmu, "dataset_catalog", lambda root=None: catalog),
+            mock.patch.dict(os.environ, {CACHE_DIR_ENV: "off"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.ch6 = load_event_table(self.source)
+
+    def test_window_mode_reports_summary_rolling_bin_and_band_outputs(self):
+        fmu = self._fmu(dataset_id=6, window_seconds=300.0, bin_seconds=60.0)
+        expected_summary = summarize_events(self.ch6)
+        window = RollingWindow(self.ch6, window_seconds=300.0)
+        histograms = EventHistograms.from_table(self.ch6, bin_seconds=60.0)
+
+        self.assertEqual(fmu.channel_count, 1)
+        for name, value in expected_summary.items():
+            self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+        for column, counts in histograms.band_counts.items():
+            for label, count in zip(histograms.band_labels(), counts.tolist()):
+                self.assertEqual(getattr(fmu, f"{column}_band_{label}_count"), count)
+
+        for step in range(0, 112):
+            fmu.do_step(step * 60.0, 60.0)
+            current_time = (step + 1) * 60.0
+            for name, value in window.update(min(current_time, float(self.ch6.times[-1]))).items():
+                self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+            count, energy = histograms.completed_bin(current_time)
+            self.assertEqual((fmu.bin_event_count, fmu.bin_energy_sum), (count, energy))
+            self.assertAlmostEqual(fmu.bin_event_rate_hz, count / 60.0)
+
+    def test_precomputed_trace_is_served_only_for_its_exact_parameters(self):
+        save_rolling_trace(
+            compute_rolling_trace(self.ch6, 300.0, 60.0), rolling_trace_path(self.source, 300.0, 60.0), self.source
+        )
+        window = RollingWindow(self.ch6, window_seconds=300.0)
+
+        fmu = self._fmu(dataset_id=6, window_seconds=300.0)
+        for step in range(0, 112):
+            fmu.do_step(step * 60.0, 60.0)
+            self.assertIsNotNone(fmu._trace)
+            expected = window.update(min((step + 1) * 60.0, float(self.ch6.times[-1])))
+            for name, value in expected.items():
+                self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+
+        mismatches = (({"window_seconds": 300.0001}, 60.0), ({}, 60.0001), ({"quantile_accuracy": 0.01}, 60.0))
+        for parameters, step_size in mismatches:
+            fmu = self._fmu(dataset_id=6, **{"window_seconds": 300.0, **parameters})
+            fmu.do_step(0.0, step_size)
+            self.assertIsNone(fmu._trace, parameters)
+
+    def test_sketch_mode_percentiles_stay_within_quantile_accuracy(self):
+        fmu = self._fmu(dataset_id=6, quantile_accuracy=0.01)
+        exact = summarize_events(self.ch6)
+        self.assertEqual(fmu.event_count, exact["event_count"])
+        for name in ("amplitude_p50", "amplitude_p95", "rms_p95", "asl_p95", "frequency_centroid_p50"):
+            self.assertLessEqual(abs(getattr(fmu, name) - exact[name]), 0.01 * abs(exact[name]), name)
+
+        window = RollingWindow(self.ch6, window_seconds=300.0)
+        for step in range(0, 112, 10):
+            fmu.do_step(step * 60.0, 60.0)
+            expected = window.update(min((step + 1) * 60.0, float(self.ch6.times[-1])))
+            self.assertEqual(fmu.rolling_event_rate_hz, expected["rolling_event_rate_hz"])
+            for name in ("rolling_amplitude_p95", "rolling_rms_p95", "rolling_asl_p95"):
+                self.assertLessEqual(abs(getattr(fmu, name) - expected[name]), 0.01 * abs(expected[name]), name)
+
+    def test_follow_mode_picks_up_hits_appended_between_steps(self):
+        self.source.write_bytes(self.data[: len(self.data) // 2])
+        fmu = self._fmu(dataset_id=6, follow=1)
+        partial = load_event_table(self.source)
+        self.assertEqual(fmu.event_count, len(partial))
+
+        fmu.do_step(0.0, 600.0)
+        with self.source.open("ab") as handle:
+            handle.write(self.data[len(self.data) // 2 :])
+        fmu.do_step(600.0, 600.0)
+
+        for name, value in summarize_events(self.ch6).items():
+            self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+        expected = RollingWindow(self.ch6, window_seconds=300.0).update(1200.0)
+        for name, value in expected.items():
+            self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+        self.assertEqual(
+            fmu.frequency_centroid_band_100_200khz_count, self._band_count("frequency_centroid", 100.0, 200.0)
+        )
+
+    def test_dataset_group_merges_channels_and_reports_each_channel(self):
+        fmu = self._fmu(dataset_group=1)
+        self.assertEqual((fmu.channel_count, fmu.channels_merged), (2, 1))
+        for name, value in summarize_events(self.ch6).items():
+            self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+        self._assert_channel_outputs(fmu, (31, 32), 0.0)
+
+        fmu.do_step(0.0, 600.0)
+        expected = RollingWindow(self.ch6, window_seconds=300.0).update(600.0)
+        for name, value in expected.items():
+            self.assertAlmostEqual(getattr(fmu, name), value, places=9, msg=name)
+        self.assertEqual(
+            fmu.frequency_centroid_band_100_200khz_count, self._band_count("frequency_centroid", 100.0, 200.0)
+        )
+        self._assert_channel_outputs(fmu, (31, 32), 600.0)
+
+    def test_dataset_group_of_separate_captures_reports_each_channel_on_its_own_clock(self):
+        fmu = self._fmu(dataset_group=2)
+        self.assertEqual((fmu.channel_count, fmu.channels_merged), (2, 0))
+        self.assertEqual((fmu.event_count, fmu.rolling_event_rate_hz, fmu.bin_event_count), (0, 0.0, 0))
+        for current_time in (0.0, 600.0, 7200.0, 40020.0):
+            if current_time:
+                fmu.do_step(0.0, current_time)
+            self.assertEqual(fmu.current_time_seconds, current_time)
+            self._assert_channel_outputs(fmu, (2, 6), current_time)
+
+    def _assert_channel_outputs(self, fmu, dataset_ids, current_time):
+        for index, dataset_id in enumerate(dataset_ids, start=1):
+            table = load_event_table(resolve_dataset_path(dataset_id))
+            self.assertEqual(getattr(fmu, f"channel{index}_dataset_id"), dataset_id)
+            for name, value in summarize_events(table).items():
+                self.assertAlmostEqual(getattr(fmu, f"channel{index}_{name}"), value, places=9, msg=name)
+            bounded_time = min(current_time, float(table.times[-1]))
+            for name, value in RollingWindow(table, window_seconds=300.0).update(bounded_time).items():
+                if name != "current_time_seconds":
+                    self.assertAlmostEqual(getattr(fmu, f"channel{index}_{name}"), value, places=9, msg=name)
+            count, energy = EventHistograms.from_table(table, bin_seconds=60.0).completed_bin(current_time)
+            self.assertEqual(getattr(fmu, f"channel{index}_bin_event_count"), count)
+            self.assertAlmostEqual(getattr(fmu, f"channel{index}_bin_energy_sum"), energy)
+
+    def test_non_positive_bin_seconds_is_rejected_when_set(self):
+        fmu = ae_event_stats_fmu.AEEventStats(instance_name="ae")
+        refs = {variable.name: ref for ref, variable in fmu.vars.items()}
+        for value in (0.0, -60.0, float("nan")):
+            with self.assertRaisesRegex(ValueError, "bin_seconds"):
+                fmu.set_real([refs["bin_seconds"]], [value])
+        fmu.set_real([refs["bin_seconds"]], [30.0])
+        self.assertEqual(fmu.get_real([refs["bin_seconds"]]), [30.0])
+
+    def _fmu(self, **parameters):
+        fmu = ae_event_stats_fmu.AEEventStats(instance_name="ae")
+        for name, value in parameters.items():
+            setattr(fmu, name, value)
+        fmu.enter_initialization_mode()
+        fmu.exit_initialization_mode()
+        return fmu
+
+    def _band_count(self, name, low, high):
+        column = self.ch6.column(name)
+        return int(np.count_nonzero((column >= low) & (column < high)))
+
 
 if __name__ == "__main__":
     unittest.main()
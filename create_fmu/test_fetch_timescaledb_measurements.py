@@ -0,0 +1,172 @@
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+try:
+    import fetch_timescaledb_measurements as export
+except ImportError:  # pragma: no cover - psycopg is optional in the test environment
+    export = None
+
+# A libpq conninfo for a scratch database enables the tests that talk to PostgreSQL.
+TEST_CONNINFO = os.environ.get("TIMESCALE_TEST_CONN")
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def rows(start, count, step_seconds=1.0):
+    return [(START + timedelta(seconds=(start + index) * step_seconds), float(start + index)) for index in range(count)]
+
+
+@unittest.skipIf(export is None, "psycopg is not installed")
+class TimescaleExportFileTests(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+        self.output = self.tmpdir / "m.csv"
+
+    def test_write_csv_replaces_then_appends_without_a_header(self):
+        self.output.write_text("stale\n")
+        count, last = export.write_csv(str(self.output), [rows(0, 3), rows(3, 2)])
+        self.assertEqual((count, last), (5, rows(4, 1)[0][0]))
+        count, last = export.write_csv(str(self.output), [rows(5, 2)], append=True)
+        self.assertEqual((count, last), (2, rows(6, 1)[0][0]))
+
+        lines = self.output.read_text().splitlines()
+        self.assertEqual(lines[0], "timestamp,value")
+        self.assertEqual(lines[1:], [f"{timestamp.isoformat()},{value}" for timestamp, value in rows(0, 7)])
+        self.assertEqual(sorted(path.name for path in self.tmpdir.iterdir()), ["m.csv"])
+
+    def test_write_csv_leaves_the_target_untouched_on_failure(self):
+        export.write_csv(str(self.output), [rows(0, 3)])
+        original = self.output.read_bytes()
+
+        def failing():
+            yield rows(3, 2)
+            raise RuntimeError("connection lost")
+
+        for append in (False, True):
+            with self.subTest(append=append), self.assertRaises(RuntimeError):
+                export.write_csv(str(self.output), failing(), append=append)
+            self.assertEqual(self.output.read_bytes(), original)
+        self.assertEqual(export.write_csv(str(self.output), [], append=True), (0, None))
+        self.assertEqual(self.output.read_bytes(), original)
+
+        def partial_copy(source, target):
+            target.write(source.read(10))
+            raise OSError("disk full")
+
+        with mock.patch.object(export.shutil, "copyfileobj", partial_copy), self.assertRaises(OSError):
+            export.write_csv(str(self.output), [rows(3, 2)], append=True)
+        self.assertEqual(self.output.read_bytes(), original)
+        self.assertEqual(sorted(path.name for path in self.tmpdir.iterdir()), ["m.csv"])
+
+    def test_state_round_trips_and_rejects_other_tables(self):
+        path = self.tmpdir / "m.csv.state.json"
+        self.assertIsNone(export.read_state(path, "public.measurements", "time"))
+
+        state = {"table": "public.measurements", "time_column": "time", "last_timestamp": "2026-01-01T00:00:04+00:00"}
+        export.write_state(path, state)
+        self.assertEqual(export.read_state(path, "public.measurements", "time"), dict(state, rows=0))
+        self.assertEqual(sorted(entry.name for entry in self.tmpdir.iterdir()), [path.name])
+
+        with self.assertRaisesRegex(ValueError, "public.other.time"):
+            export.read_state(path, "public.other", "time")
+        path.write_text(json.dumps(dict(state, last_timestamp=None)))
+        with self.assertRaisesRegex(ValueError, "last_timestamp"):
+            export.read_state(path, "public.measurements", "time")
+
+    def test_truncate_to_state_drops_rows_appended_after_the_saved_state(self):
+        export.write_csv(str(self.output), [rows(0, 3)])
+        state = {"csv_bytes": self.output.stat().st_size}
+        original = self.output.read_bytes()
+        export.write_csv(str(self.output), [rows(3, 2)], append=True)
+        appended = self.output.stat().st_size - len(original)
+
+        self.assertEqual(export.truncate_to_state(self.output, state), appended)
+        self.assertEqual(self.output.read_bytes(), original)
+        self.assertEqual(export.truncate_to_state(self.output, state), 0)
+        self.assertEqual(export.truncate_to_state(self.output, {}), 0)
+        with self.assertRaisesRegex(ValueError, "shorter"):
+            export.truncate_to_state(self.output, {"csv_bytes": len(original) + 1})
+
+
+@unittest.skipIf(export is None, "psycopg is not installed")
+@unittest.skipUnless(TEST_CONNINFO, "TIMESCALE_TEST_CONN is not set")
+class TimescaleExportDatabaseTests(unittest.TestCase):
+    def setUp(self):
+        self.conn = export.psycopg.connect(TEST_CONNINFO)
+        self.addCleanup(self.conn.close)
+        self.conn.execute("CREATE TEMP TABLE export_test (time timestamptz NOT NULL, value double precision)")
+        self.table = export.build_table_identifier("export_test")
+        self.columns = (export.sql.Identifier("time"), export.sql.Identifier("value"))
+
+    def _insert(self, values):
+        with self.conn.cursor() as cur:
+            cur.executemany("INSERT INTO export_test VALUES (%s, %s)", values)
+
+    def _stream(self, limit, batch_size, **bounds):
+        batches = export.stream_rows(self.conn, self.table, *self.columns, limit, batch_size, **bounds)
+        return [row for batch in batches for row in batch]
+
+    def test_export_reads_batches_through_a_server_side_cursor_into_the_same_csv(self):
+        self._insert(rows(0, 2500, step_seconds=0.1))
+        cases = (
+            ({"limit": 1000}, "ORDER BY time DESC LIMIT 1000", [400, 400, 200]),
+            (
+                {"limit": None, "since": START + timedelta(seconds=10), "until": START + timedelta(seconds=200)},
+                "WHERE time >= %(since)s AND time < %(until)s ORDER BY time DESC",
+                [400] * 4 + [300],
+            ),
+        )
+        for arguments, query, batch_sizes in cases:
+            with self.subTest(query=query), tempfile.TemporaryDirectory() as tmpdir:
+                # What the export wrote before it streamed: the newest rows via fetchall, reversed.
+                expected = io.StringIO(newline="")
+                writer = csv.writer(expected)
+                writer.writerow(["timestamp", "value"])
+                reference = self.conn.execute(f"SELECT time, value FROM export_test {query}", arguments).fetchall()
+                for timestamp, value in reversed(reference):
+                    writer.writerow([export.serialize_value(timestamp), export.serialize_value(value)])
+
+                sizes = []
+                open_cursors = []
+
+                def batches():
+                    bounds = {name: value for name, value in arguments.items() if name != "limit"}
+                    stream = export.stream_rows(self.conn, self.table, *self.columns, arguments["limit"], 400, **bounds)
+                    for batch in stream:
+                        sizes.append(len(batch))
+                        query = "SELECT count(*) FROM pg_cursors WHERE name = 'timescale_export'"
+                        open_cursors.append(self.conn.execute(query).fetchone()[0])
+                        yield batch
+
+                output = Path(tmpdir) / "m.csv"
+                count, _ = export.write_csv(str(output), batches())
+                self.assertEqual(count, len(reference))
+                self.assertEqual(sizes, batch_sizes)
+                self.assertEqual(open_cursors, [1] * len(batch_sizes))
+                self.assertEqual(output.read_bytes(), expected.getvalue().encode())
+
+    def test_incremental_limit_keeps_rows_sharing_the_last_timestamp_together(self):
+        # Five rows share the third timestamp; a cap of 4 lands inside that group.
+        tied = [(START + timedelta(seconds=2), float(value)) for value in range(5)]
+        self._insert(rows(0, 2) + tied + rows(3, 3))
+
+        first = self._stream(4, 2, oldest_first=True)
+        self.assertEqual(sorted(first), rows(0, 2) + tied)
+        second = self._stream(4, 2, after=first[-1][0], oldest_first=True)
+        self.assertEqual(second, rows(3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
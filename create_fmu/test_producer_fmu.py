@@ -0,0 +1,199 @@
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+try:
+    import producer_fmu
+except ImportError:  # pragma: no cover - pythonfmu is optional in the test environment
+    producer_fmu = None
+
+# A libpq conninfo for a scratch database enables the Timescale source test.
+TEST_CONNINFO = os.environ.get("TIMESCALE_TEST_CONN")
+
+
+@unittest.skipIf(producer_fmu is None, "pythonfmu is not installed")
+class ProducerTests(unittest.TestCase):
+    def test_running_statistics_match_batch_statistics(self):
+        rng = random.Random(3)
+        values = [round(100.0 + rng.uniform(-50.0, 50.0), 3) for _ in range(1234)]
+        for splits in ([], [1], [1, 70, 700, 1233]):
+            with self.subTest(splits=splits):
+                stats = producer_fmu.RunningStatistics()
+                for block in np.array_split(np.asarray(values), splits):
+                    stats.update(block)
+
+                self.assertEqual(stats.count, len(values))
+                self.assertAlmostEqual(stats.mean, statistics.fmean(values), places=9)
+                self.assertAlmostEqual(stats.std, statistics.pstdev(values), places=9)
+                self.assertEqual(stats.vmin, min(values))
+                self.assertEqual(stats.vmax, max(values))
+                self.assertEqual(list(stats.tail), values[-100:])
+                self.assertAlmostEqual(stats.rolling_mean, statistics.fmean(values[-100:]), places=12)
+
+    def test_random_walk_is_seeded_and_independent_of_chunk_size(self):
+        whole = np.concatenate([v for _, v in producer_fmu.random_walk_chunks(10000, seed=7)])
+        chunked = np.concatenate([v for _, v in producer_fmu.random_walk_chunks(10000, seed=7, chunk_size=999)])
+        other = np.concatenate([v for _, v in producer_fmu.random_walk_chunks(10000, seed=8)])
+
+        np.testing.assert_array_equal(whole, chunked)
+        for chunk_size in (1, 7, 4096):
+            blocks = producer_fmu.random_walk_chunks(10000, seed=7, chunk_size=chunk_size)
+            np.testing.assert_array_equal(np.concatenate([v for _, v in blocks]), whole)
+        self.assertFalse(np.array_equal(whole, other))
+        self.assertTrue(np.array_equal(whole, np.round(whole, 3)))
+
+    def test_streaming_mode_matches_file_round_trip(self):
+        outputs = {
+            "legacy": (False, producer_fmu.OUTPUT_CSV),
+            "csv": (True, producer_fmu.OUTPUT_CSV),
+            "npz": (True, producer_fmu.OUTPUT_NPZ),
+            "none": (True, producer_fmu.OUTPUT_NONE),
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for label, (streaming, output_format) in outputs.items():
+                producer = producer_fmu.Producer(instance_name="producer")
+                producer.csv_path = os.path.join(tmpdir, f"{label}.csv")
+                producer.npz_path = os.path.join(tmpdir, f"{label}.npz")
+                producer.num_points = 2500
+                producer.seed = 11
+                producer.streaming = streaming
+                producer.output_format = output_format
+                producer.enter_initialization_mode()
+                producer.do_step(0.0, 1.0)
+                self.assertTrue(producer.done)
+                results[label] = (producer.mean, producer.std, producer.vmin, producer.vmax, producer.rollingMean)
+
+            with open(os.path.join(tmpdir, "legacy.csv"), newline="") as f1, open(
+                os.path.join(tmpdir, "csv.csv"), newline=""
+            ) as f2:
+                self.assertEqual([line.split(",")[-1] for line in f1], [line.split(",")[-1] for line in f2])
+            with np.load(os.path.join(tmpdir, "npz.npz")) as columns:
+                self.assertEqual(columns["value"].shape, (2500,))
+                self.assertEqual(np.diff(columns["timestamp"])[0], np.timedelta64(100, "ms"))
+                self.assertAlmostEqual(float(columns["value"].mean()), results["legacy"][0], places=9)
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["csv.csv", "legacy.csv", "npz.npz"])
+
+        for label in ("csv", "npz", "none"):
+            for expected, actual in zip(results["legacy"], results[label]):
+                self.assertAlmostEqual(expected, actual, places=9)
+
+    def test_file_sources_feed_the_same_statistics(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            generated = {}
+            for output_format in (producer_fmu.OUTPUT_CSV, producer_fmu.OUTPUT_NPZ):
+                producer = self._producer(tmpdir, seed=4, output_format=output_format)
+                producer.do_step(0.0, 1.0)
+                generated[output_format] = self._outputs(producer)
+
+            for source in (producer_fmu.SOURCE_CSV, producer_fmu.SOURCE_NPZ):
+                producer = self._producer(tmpdir, source=source, batch_rows=333)
+                producer.do_step(0.0, 1.0)
+                for expected, actual in zip(generated[source], self._outputs(producer)):
+                    self.assertAlmostEqual(expected, actual, places=9)
+
+            objects = {}
+            for name in ("m.csv", "m.npz"):
+                with open(os.path.join(tmpdir, name), "rb") as f:
+                    objects[f"runs/{name}"] = f.read()
+
+            client = _FakeS3Client(objects)
+            keys = {"runs/m.csv": producer_fmu.OUTPUT_CSV, "runs/m.npz": producer_fmu.OUTPUT_NPZ}
+            for key, output_format in keys.items():
+                with self.subTest(key=key), mock.patch.object(producer_fmu, "_s3_client", lambda environ: client):
+                    with mock.patch.dict(os.environ, {"S3_BUCKET": "bucket", "PRODUCER_S3_KEY": key}):
+                        producer = self._producer(tmpdir, source=producer_fmu.SOURCE_S3, batch_rows=500)
+                        producer.do_step(0.0, 1.0)
+                    for expected, actual in zip(generated[output_format], self._outputs(producer)):
+                        self.assertAlmostEqual(expected, actual, places=9)
+
+    @unittest.skipUnless(TEST_CONNINFO, "TIMESCALE_TEST_CONN is not set")
+    def test_timescale_source_reads_the_table_in_time_order(self):
+        import psycopg
+
+        table = f"producer_test_{os.getpid()}"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            producer = self._producer(tmpdir, seed=9, output_format=producer_fmu.OUTPUT_CSV)
+            producer.do_step(0.0, 1.0)
+            values = np.concatenate(list(producer_fmu.read_csv_blocks(os.path.join(tmpdir, "m.csv"))))
+
+            with psycopg.connect(TEST_CONNINFO, autocommit=True) as conn:
+                conn.execute(f"CREATE TABLE {table} (time timestamptz NOT NULL, value double precision)")
+                self.addCleanup(self._drop_table, table)
+                # Inserted newest first, so only the query's ORDER BY puts them back in order.
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        f"INSERT INTO {table} VALUES (timestamptz '2026-01-01' + %s * interval '100 ms', %s)",
+                        [(index, value) for index, value in reversed(list(enumerate(values.tolist())))],
+                    )
+
+            for limit, expected in ((None, values), (1000, values[-1000:])):
+                environ = {"TIMESCALE_CONN": TEST_CONNINFO, "TIMESCALE_TABLE": f"public.{table}"}
+                if limit:
+                    environ["TIMESCALE_LIMIT"] = str(limit)
+                with self.subTest(limit=limit), mock.patch.dict(os.environ, environ):
+                    producer = self._producer(tmpdir, source=producer_fmu.SOURCE_TIMESCALE, batch_rows=333)
+                    producer.do_step(0.0, 1.0)
+                    self.assertAlmostEqual(producer.mean, float(expected.mean()), places=9)
+                    self.assertAlmostEqual(producer.std, float(expected.std()), places=9)
+                    self.assertEqual((producer.vmin, producer.vmax), (float(expected.min()), float(expected.max())))
+                    self.assertAlmostEqual(producer.rollingMean, float(expected[-100:].mean()), places=9)
+
+    @staticmethod
+    def _drop_table(table):
+        import psycopg
+
+        with psycopg.connect(TEST_CONNINFO, autocommit=True) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def test_csv_reader_skips_comments_and_bad_rows(self):
+        lines = ["# num_points=4\n", "timestamp,value\n", "t0,1.5\n", "t1,oops\n", "t2\n", "t3,2.5\n", "t4,3.0\n"]
+        blocks = list(producer_fmu.csv_value_blocks(lines, batch_rows=2))
+        self.assertEqual([block.tolist() for block in blocks], [[1.5, 2.5], [3.0]])
+        with self.assertRaises(ValueError):
+            list(producer_fmu.csv_value_blocks(["timestamp,reading\n", "t0,1\n"]))
+
+    def _producer(self, tmpdir, **parameters):
+        producer = producer_fmu.Producer(instance_name="producer")
+        producer.csv_path = os.path.join(tmpdir, "m.csv")
+        producer.npz_path = os.path.join(tmpdir, "m.npz")
+        producer.num_points = 2500
+        for name, value in parameters.items():
+            setattr(producer, name, value)
+        producer.enter_initialization_mode()
+        return producer
+
+    @staticmethod
+    def _outputs(producer):
+        return producer.mean, producer.std, producer.vmin, producer.vmax, producer.rollingMean
+
+
+class _FakeS3Body:
+    def __init__(self, data):
+        self._lines = data.splitlines()
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        pass
+
+
+class _FakeS3Client:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_object(self, Bucket, Key):
+        return {"Body": _FakeS3Body(self.objects[Key])}
+
+    def download_fileobj(self, Bucket, Key, Fileobj):
+        Fileobj.write(self.objects[Key])
+
+
+if __name__ == "__main__":
+    unittest.main()
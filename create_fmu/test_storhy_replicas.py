@@ -1,13 +1,33 @@
 import math
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
 
 REPLICA_DIR = Path(__file__).resolve().parent / "storhy_replicas"
 sys.path.insert(0, str(REPLICA_DIR))
+sys.path.insert(0, str(REPLICA_DIR.parents[1] / "scripts"))
 
-from storhy_replica_common import MODEL_CODES, OUTPUT_DEFAULTS, compute_model_outputs  # noqa: E402
+import numpy as np  # noqa: E402
+
+from storhy_replica_common import (  # noqa: E402
+    COMMON_OUTPUTS,
+    INTEGER_OUTPUTS,
+    MODEL_CODES,
+    MODEL_REGISTRY,
+    MODELS_BY_CODE,
+    OUTPUT_DEFAULTS,
+    PARAMETER_DEFAULTS,
+    PYTHONFMU_AVAILABLE,
+    compute_declared_outputs,
+    compute_model_outputs,
+    compute_model_outputs_batch,
+    get_model,
+    register_model,
+)
+from replica_pipeline import PipelineError, ReplicaPipeline, dump_result_json  # noqa: E402
+from sweep_storhy_replicas import run_sweep, sweep_plan  # noqa: E402
 
 
 class StorhyReplicaTests(unittest.TestCase):
@@ -71,6 +91,249 @@ class StorhyReplicaTests(unittest.TestCase):
         self.assertGreater(high_risk["risk_index"], low_risk["risk_index"])
         self.assertGreaterEqual(high_risk["status_code"], low_risk["status_code"])
 
+    def test_batch_outputs_match_scalar_path_for_every_model(self):
+        rng = np.random.default_rng(7)
+        size = 256
+        columns = {
+            name: rng.integers(0, 6, size) if name in ("site_id", "scenario_id", "profile_id")
+            else default * rng.uniform(-0.5, 2.0, size)
+            for name, default in PARAMETER_DEFAULTS.items()
+        }
+        columns["input_risk_index"][:3] = (np.nan, 1.4, -0.2)
+        del columns["input_sediment_exposure"]
+        times = rng.uniform(0.0, 96.0, size)
+
+        for model_key in MODEL_CODES:
+            with self.subTest(model_key=model_key):
+                batch = compute_model_outputs_batch(model_key, columns, times)
+                self.assertEqual(set(batch), set(OUTPUT_DEFAULTS))
+                for row in range(size):
+                    params = {name: column[row].item() for name, column in columns.items()}
+                    expected = compute_model_outputs(model_key, params, times[row])
+                    for name, value in expected.items():
+                        if name in INTEGER_OUTPUTS:
+                            self.assertEqual(batch[name][row], value, name)
+                        else:
+                            self.assertAlmostEqual(batch[name][row], value, delta=1e-9 * max(1.0, abs(value)), msg=name)
+
+    def test_sweep_rows_match_model_outputs(self):
+        specs = (
+            {
+                "model": "hydro_cascade_dispatch",
+                "times": 6.0,
+                "parameters": {"scenario_id": [1, 2], "input_confidence": {"min": 0.5, "max": 1.0, "num": 3}},
+            },
+            {
+                "model": "predictive_maintenance",
+                "sampling": "lhs",
+                "samples": 5,
+                "seed": 7,
+                "times": [0.0, 12.0],
+                "parameters": {"input_risk_index": {"min": 0.0, "max": 1.0}, "profile_id": {"min": 1, "max": 4}},
+            },
+        )
+        for spec in specs:
+            with self.subTest(model_key=spec["model"]), tempfile.TemporaryDirectory() as tmpdir:
+                plan = sweep_plan(spec)
+                output = Path(tmpdir) / "sweep.npz"
+                self.assertEqual(run_sweep(plan, output, workers=1, chunk_rows=4), plan.rows)
+                with np.load(output) as results:
+                    columns = {name: results[name] for name in results.files}
+                self.assertEqual(len(columns["time"]), plan.rows)
+                self.assertEqual(set(np.unique(columns["time"])), set(np.atleast_1d(spec["times"])))
+
+                inputs = get_model(spec["model"]).inputs
+                for row in range(plan.rows):
+                    params = {name: columns[name][row].item() for name in inputs}
+                    expected = compute_model_outputs(spec["model"], params, columns["time"][row].item())
+                    for name, value in expected.items():
+                        self.assertAlmostEqual(columns[name][row], value, delta=1e-9 * max(1.0, abs(value)), msg=name)
+
+        with self.assertRaises(ValueError):
+            sweep_plan({"model": "predictive_maintenance", "times": []})
+
+    def test_registry_declares_every_input_and_output_a_model_uses(self):
+        self.assertEqual(len(MODEL_REGISTRY), 15)
+        params = {
+            name: default + 1 if name in ("site_id", "scenario_id", "profile_id") else default * 1.3
+            for name, default in PARAMETER_DEFAULTS.items()
+        }
+
+        for model_key, code in MODEL_CODES.items():
+            with self.subTest(model_key=model_key):
+                model = get_model(model_key)
+                self.assertIs(get_model(code), model)
+                expected = compute_model_outputs(model_key, params, current_time=7.0)
+
+                declared_params = {name: params[name] for name in model.inputs}
+                self.assertEqual(compute_model_outputs(model_key, declared_params, current_time=7.0), expected)
+
+                declared = compute_declared_outputs(model_key, declared_params, current_time=7.0)
+                self.assertEqual(set(declared), set(model.outputs) | set(COMMON_OUTPUTS))
+                for name, value in expected.items():
+                    self.assertEqual(declared.get(name, OUTPUT_DEFAULTS[name]), value, name)
+
+    def test_models_can_be_registered_from_other_modules(self):
+        @register_model("test_plant", 990, inputs=("input_score",), outputs=("power_mw",))
+        def test_plant(params, t, ops):
+            return {"power_mw": 2.0 * t}, 0.5, params.get("input_score", 72.0), 0.9
+
+        try:
+            outputs = compute_model_outputs("test_plant", {"input_score": 64.0}, current_time=3.0)
+            self.assertEqual(outputs["model_code"], 990)
+            self.assertEqual(outputs["power_mw"], 6.0)
+            self.assertEqual(outputs["status_code"], 1)
+            with self.assertRaises(ValueError):
+                register_model("test_plant", 991)(test_plant)
+        finally:
+            del MODEL_REGISTRY["test_plant"], MODELS_BY_CODE[990], MODEL_CODES["test_plant"]
+
+    @unittest.skipUnless(PYTHONFMU_AVAILABLE, "pythonfmu is not installed")
+    def test_replica_fmu_steps_match_model_outputs(self):
+        from storhy_replica_common import ReplicaBase
+
+        for model_key in MODEL_CODES:
+            with self.subTest(model_key=model_key):
+                replica = type("Replica", (ReplicaBase,), {"MODEL_KEY": model_key})(instance_name="test")
+                refs = {variable.name: ref for ref, variable in replica.vars.items()}
+                replica.set_integer([refs["scenario_id"]], [3])
+                replica.set_real([refs["input_risk_index"]], [0.61])
+                replica.enter_initialization_mode()
+                params = dict(PARAMETER_DEFAULTS, scenario_id=3, input_risk_index=0.61)
+
+                for current_time in (0.0, 5.5, 11.0):
+                    replica.do_step(current_time, 5.5)
+                    expected = compute_model_outputs(model_key, params, current_time)
+                    for name, value in expected.items():
+                        getter = replica.get_integer if name in INTEGER_OUTPUTS else replica.get_real
+                        self.assertEqual(getter([refs[name]]), [value], name)
+                        self.assertEqual(getattr(replica, name), value, name)
+                self.assertEqual(replica.scenario_id, 3)
+
+    @unittest.skipUnless(PYTHONFMU_AVAILABLE, "pythonfmu is not installed")
+    def test_replica_slots_follow_value_references(self):
+        from pythonfmu import Fmi2Causality
+        from pythonfmu.fmi2slave import Fmi2Slave
+        from pythonfmu.variables import Real
+        from storhy_replica_common import ReplicaBase
+
+        # A base class that registers its own variable first shifts every replica value reference.
+        class Prefixed(Fmi2Slave):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.extra = 1.5
+                self.register_variable(Real("extra", causality=Fmi2Causality.local))
+
+        replica = type("Replica", (ReplicaBase, Prefixed), {"MODEL_KEY": "kpi_assessment"})(instance_name="test")
+        refs = {variable.name: ref for ref, variable in replica.vars.items()}
+        self.assertEqual(refs["extra"], 0)
+        replica.set_integer([refs["scenario_id"]], [3])
+        replica.set_real([refs["input_risk_index"]], [0.61])
+        self.assertEqual((replica.scenario_id, replica.input_risk_index), (3, 0.61))
+        replica.enter_initialization_mode()
+
+        params = dict(PARAMETER_DEFAULTS, scenario_id=3, input_risk_index=0.61)
+        expected = compute_model_outputs("kpi_assessment", params, 0.0)
+        self.assertEqual(replica.get_real([refs["score"]]), [expected["score"]])
+        self.assertEqual(replica.score, expected["score"])
+        self.assertEqual(replica.get_real([refs["extra"]]), [1.5])
+
+    def test_time_invariant_models_ignore_current_time(self):
+        params = dict(PARAMETER_DEFAULTS, scenario_id=4, profile_id=3)
+        for model_key in MODEL_CODES:
+            if get_model(model_key).time_dependent:
+                continue
+            with self.subTest(model_key=model_key):
+                self.assertEqual(
+                    compute_model_outputs(model_key, params, current_time=0.0),
+                    compute_model_outputs(model_key, params, current_time=37.25),
+                )
+
+    @unittest.skipUnless(PYTHONFMU_AVAILABLE, "pythonfmu is not installed")
+    def test_replica_fmu_recomputes_only_when_inputs_or_used_time_change(self):
+        from storhy_replica_common import ReplicaBase
+
+        # The first step at t=0 repeats the initialization time, so it is skipped for both models.
+        for model_key, expected_calls in (("kpi_assessment", 1), ("hydro_cascade_dispatch", 12)):
+            with self.subTest(model_key=model_key):
+                replica = type("Replica", (ReplicaBase,), {"MODEL_KEY": model_key})(instance_name="test")
+                model = replica._model
+                calls = []
+
+                def compute(params, t, ops, model=model, calls=calls):
+                    calls.append(t)
+                    return model.compute(params, t, ops)
+
+                replica._model = type(model)(
+                    model.key, model.code, compute, model.inputs, model.outputs, model.time_dependent
+                )
+                replica.enter_initialization_mode()
+                for step in range(12):
+                    replica.do_step(step * 2.0, 2.0)
+                self.assertEqual(len(calls), expected_calls)
+
+                refs = {variable.name: ref for ref, variable in replica.vars.items()}
+                replica.set_integer([refs["scenario_id"]], [5])
+                replica.do_step(24.0, 2.0)
+                self.assertEqual(len(calls), expected_calls + 1)
+                params = dict(PARAMETER_DEFAULTS, scenario_id=5)
+                self.assertEqual(replica.score, compute_model_outputs(model_key, params, 24.0)["score"])
+
+    def test_pipeline_chains_start_from_links_like_the_runner(self):
+        pipeline = ReplicaPipeline.from_file("workflows/common/decision_support/degradation_cost_benefit.yaml")
+        self.assertEqual(pipeline.order, ("condition_monitoring", "predictive_maintenance", "sustainability_cba"))
+        results = pipeline.run()
+
+        upstream = results["condition_monitoring"]
+        params = dict(
+            PARAMETER_DEFAULTS,
+            input_score=upstream["score"],
+            input_confidence=upstream["confidence"],
+            input_risk_index=upstream["risk_index"],
+            input_damage_index=upstream["damage_index"],
+            input_rul_days=upstream["rul_days"],
+            input_availability_delta_percent=upstream["availability_delta_percent"],
+        )
+        expected = compute_model_outputs("predictive_maintenance", params, current_time=23.0)
+        self.assertEqual(results["predictive_maintenance"]["opex_delta_eur"], float(f"{expected['opex_delta_eur']:g}"))
+        self.assertEqual(set(results["predictive_maintenance"]), set(pipeline.steps["predictive_maintenance"].outputs))
+
+        trace = results["sustainability_cba"]["trace"]
+        self.assertEqual(trace["time"], [float(t) for t in range(25)])
+        self.assertEqual(set(trace["signals"]), {"risk_index", "kpi_score", "value_delta_eur"})
+
+    def test_pipeline_orders_steps_by_dependency_and_rejects_cycles(self):
+        def step(name, fmu, **start_from):
+            return {"name": name, "fmu": f"fmu/models/{fmu}.fmu", "outputs": ["score"], "start_from": start_from}
+
+        pipeline = ReplicaPipeline(
+            {
+                "steps": [
+                    step("kpi", "KPIAssessmentReplica", input_score="monitoring.score"),
+                    step("monitoring", "ConditionMonitoringReplica"),
+                ]
+            }
+        )
+        self.assertEqual(pipeline.order, ("monitoring", "kpi"))
+
+        with self.assertRaises(PipelineError):
+            ReplicaPipeline(
+                {
+                    "steps": [
+                        step("a", "KPIAssessmentReplica", input_score="b.score"),
+                        step("b", "ConditionMonitoringReplica", input_score="a.score"),
+                    ]
+                }
+            )
+
+    def test_pipeline_result_json_matches_the_runner_encoding(self):
+        result = {"score": 81.25, "status_code": 2, "value_delta_eur": 1234570.0, "tiny": 1e-07, "trace": {"time": []}}
+        self.assertEqual(
+            dump_result_json(result),
+            '{\n  "score": 81.25,\n  "status_code": 2,\n  "tiny": 1e-7,\n  "trace": {\n    "time": []\n  },\n'
+            '  "value_delta_eur": 1234570\n}\n',
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -331,8 +331,7 @@ steps:
 	}
 	if err := os.WriteFile(filepath.Join(root, "workflows", "tests", "ae_event_statistics.yaml"), []byte(`
 steps:
-  - name: ae_ch2
-  - name: ae_ch6
+  - name: ae_channels
 `), 0o644); err != nil {
 		t.Fatalf("write ae_event_statistics workflow: %v", err)
 	}
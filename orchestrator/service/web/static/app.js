@@ -2290,13 +2290,15 @@ function renderAeEventStats(targetContainer = null) {
   }
 
   const stepResults = aeStats.payload?.stepResults || {};
-  const channels = [
-    buildAeChannel("CH2", "ae_ch2", stepResults.ae_ch2, paletteColor(0)),
-    buildAeChannel("CH6", "ae_ch6", stepResults.ae_ch6, paletteColor(1)),
-  ].filter(Boolean);
+  const channels = stepResults.ae_channels
+    ? buildAeGroupChannels("ae_channels", stepResults.ae_channels)
+    : [
+        buildAeChannel("CH2", "ae_ch2", stepResults.ae_ch2, paletteColor(0)),
+        buildAeChannel("CH6", "ae_ch6", stepResults.ae_ch6, paletteColor(1)),
+      ].filter(Boolean);
 
   if (channels.length === 0) {
-    container.innerHTML = '<div class="empty-state">The latest AE statistics result does not include CH2 or CH6 step output.</div>';
+    container.innerHTML = '<div class="empty-state">The latest AE statistics result does not include AE channel step output.</div>';
     return;
   }
 
@@ -2364,6 +2366,50 @@ function buildAeChannel(label, stepName, stepResult, color) {
   };
 }
 
+// A dataset_group step reports channel<k>_* values; split them into one channel per dataset so
+// the cards and traces read the same names as a single-dataset step.
+function buildAeGroupChannels(stepName, stepResult) {
+  if (!stepResult || typeof stepResult !== "object") {
+    return [];
+  }
+  const trace = extractSimulinkTrace(stepResult);
+  const channels = [];
+  for (let index = 1; stepResult[`channel${index}_dataset_id`] !== undefined; index += 1) {
+    const prefix = `channel${index}_`;
+    const result = {};
+    for (const [name, value] of Object.entries(stepResult)) {
+      if (name.startsWith(prefix)) {
+        result[name.slice(prefix.length)] = value;
+      }
+    }
+    channels.push({
+      label: `CH${result.dataset_id}`,
+      stepName,
+      color: paletteColor(index - 1),
+      result,
+      trace: trace && splitAeChannelTrace(trace, prefix, Number(result.duration_seconds)),
+    });
+  }
+  return channels;
+}
+
+// Separate captures hold their last values once they end; stop each trace one sample after its
+// own duration so shorter channels are not drawn as flat lines across the longest one.
+function splitAeChannelTrace(trace, prefix, durationSeconds) {
+  let count = trace.times.length;
+  if (Number.isFinite(durationSeconds)) {
+    const end = trace.times.findIndex((time) => time >= durationSeconds);
+    count = end === -1 ? count : end + 1;
+  }
+  const signals = {};
+  for (const [name, values] of Object.entries(trace.signals)) {
+    if (name.startsWith(prefix) && Array.isArray(values)) {
+      signals[name.slice(prefix.length)] = values.slice(0, count);
+    }
+  }
+  return { times: trace.times.slice(0, count), signals };
+}
+
 function renderAeChannelCard(channel) {
   const result = channel.result;
   const metrics = [
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the AE event statistics FMU helpers.
+
+- `load`: load time and peak resident memory of the AE event loader. Each
+  measurement runs in a fresh child process so peak RSS reflects a single
+  load. Besides the raw CH2/CH6 fixtures, the script can write synthetic
+  copies scaled by repeating every hit with shifted arrival times
+  (e.g. `--scale 10 100`).
+- `summarize`: summarize_events against a sort-per-percentile reference.
+- `parallel`: summarize_file scaling across worker processes, next to the
+  single-process load_event_table + summarize_events path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import math
+import os
+import resource
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu"))
+
+from ae_event_stats_fmu import (  # noqa: E402
+    DEFAULT_CHUNK_ROWS,
+    SUMMARY_MAXIMA,
+    SUMMARY_PERCENTILES,
+    load_event_table,
+    parse_arrival_time,
+    resolve_dataset_path,
+    summarize_events,
+    summarize_file,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load = subparsers.add_parser("load", help="Load time and peak RSS per file.")
+    load.add_argument(
+        "--dataset",
+        type=int,
+        nargs="+",
+        default=[6],
+        help="AE dataset ids to benchmark (default: %(default)s).",
+    )
+    load.add_argument(
+        "--scale",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Synthetic scale factors; 1 uses the raw file (default: %(default)s).",
+    )
+    load.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows parsed per chunk (default: %(default)s).",
+    )
+    load.add_argument(
+        "--workdir",
+        default=None,
+        help="Directory for scaled files (default: a temporary directory).",
+    )
+
+    summarize = subparsers.add_parser("summarize", help="summarize_events microbenchmark.")
+    summarize.add_argument(
+        "--dataset",
+        type=int,
+        nargs="+",
+        default=[6],
+        help="AE dataset ids to benchmark (default: %(default)s).",
+    )
+    summarize.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timed repetitions; the best one is reported (default: %(default)s).",
+    )
+
+    parallel = subparsers.add_parser("parallel", help="summarize_file scaling across workers.")
+    parallel.add_argument(
+        "--dataset",
+        type=int,
+        nargs="+",
+        default=[6],
+        help="AE dataset ids to benchmark (default: %(default)s).",
+    )
+    parallel.add_argument(
+        "--scale",
+        type=int,
+        nargs="+",
+        default=[100],
+        help="Synthetic scale factors; 1 uses the raw file (default: %(default)s).",
+    )
+    parallel.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="Worker process counts to measure (default: %(default)s).",
+    )
+    parallel.add_argument(
+        "--quantile-accuracy",
+        type=float,
+        default=0.0,
+        help="Sketch relative accuracy; 0 keeps exact percentiles (default: %(default)s).",
+    )
+    parallel.add_argument(
+        "--workdir",
+        default=None,
+        help="Directory for scaled files (default: a temporary directory).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "summarize":
+        return run_summarize(args)
+    if args.command == "parallel":
+        return run_parallel(args)
+    return run_load(args)
+
+
+def run_load(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(args.workdir or tmpdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for dataset_id in args.dataset:
+            source = resolve_dataset_path(dataset_id)
+            for scale in args.scale:
+                path = source if scale <= 1 else write_scaled_copy(source, workdir, scale)
+                result = measure_load(path, args.chunk_rows)
+                result.update({"dataset_id": dataset_id, "scale": max(1, scale)})
+                print(json.dumps(result))
+    return 0
+
+
+def run_summarize(args: argparse.Namespace) -> int:
+    for dataset_id in args.dataset:
+        table = load_event_table(resolve_dataset_path(dataset_id))
+        if summarize_events(table) != summarize_events_sorted(table):
+            print(f"[benchmark] dataset {dataset_id}: summaries differ", file=sys.stderr)
+            return 1
+        current = min(timeit.repeat(lambda: summarize_events(table), number=1, repeat=args.repeat))
+        reference = min(timeit.repeat(lambda: summarize_events_sorted(table), number=1, repeat=args.repeat))
+        print(
+            json.dumps(
+                {
+                    "dataset_id": dataset_id,
+                    "events": len(table),
+                    "summarize_seconds": current,
+                    "sorted_reference_seconds": reference,
+                    "speedup": reference / current if current > 0 else 0.0,
+                }
+            )
+        )
+    return 0
+
+
+def run_parallel(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(args.workdir or tmpdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for dataset_id in args.dataset:
+            source = resolve_dataset_path(dataset_id)
+            for scale in args.scale:
+                path = source if scale <= 1 else write_scaled_copy(source, workdir, scale)
+                started = time.perf_counter()
+                serial = summarize_events(load_event_table(path), quantile_accuracy=args.quantile_accuracy)
+                serial_seconds = time.perf_counter() - started
+                for workers in args.workers:
+                    started = time.perf_counter()
+                    summary = summarize_file(
+                        path, workers=workers, quantile_accuracy=args.quantile_accuracy
+                    )
+                    elapsed = time.perf_counter() - started
+                    if summary["event_count"] != serial["event_count"]:
+                        print(f"[benchmark] {path}: event counts differ", file=sys.stderr)
+                        return 1
+                    print(
+                        json.dumps(
+                            {
+                                "dataset_id": dataset_id,
+                                "scale": max(1, scale),
+                                "workers": workers,
+                                "events": summary["event_count"],
+                                "summarize_file_seconds": elapsed,
+                                "serial_seconds": serial_seconds,
+                                "speedup": serial_seconds / elapsed if elapsed > 0 else 0.0,
+                            }
+                        )
+                    )
+    return 0
+
+
+def summarize_events_sorted(table) -> dict:
+    """Previous summarize_events: a filtered copy and a full sort for every percentile."""
+
+    def sorted_percentile(values, q):
+        values = np.sort(values[np.isfinite(values)])
+        if not len(values):
+            return 0.0
+        rank = (q / 100.0) * (len(values) - 1)
+        lower, upper = math.floor(rank), math.ceil(rank)
+        if lower == upper:
+            return float(values[lower])
+        weight = rank - lower
+        return float(values[lower]) * (1.0 - weight) + float(values[upper]) * weight
+
+    times = table.times
+    duration = float(times[-1]) if len(times) else 0.0
+    summary = {
+        "event_count": len(times),
+        "invalid_rows": table.invalid_rows,
+        "duration_seconds": duration,
+        "event_rate_hz": len(times) / duration if duration > 0 else 0.0,
+        "energy_sum": float(np.sum(table.column("energy"))),
+    }
+    for name, quantiles in SUMMARY_PERCENTILES.items():
+        values = table.column(name)
+        for q in quantiles:
+            summary[f"{name}_p{q}"] = sorted_percentile(values, q)
+        if name in SUMMARY_MAXIMA:
+            summary[f"{name}_max"] = float(np.max(values)) if len(values) else 0.0
+    return summary
+
+
+def measure_load(path: Path, chunk_rows: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_load_in_child, (str(path), chunk_rows))
+
+
+def _load_in_child(path: str, chunk_rows: int) -> dict:
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    table = load_event_table(path, chunk_rows=chunk_rows)
+    elapsed = time.perf_counter() - started
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "path": path,
+        "file_mib": Path(path).stat().st_size / 2**20,
+        "events": len(table),
+        "invalid_rows": table.invalid_rows,
+        "load_seconds": elapsed,
+        "events_per_second": len(table) / elapsed if elapsed > 0 else 0.0,
+        "baseline_rss_mib": baseline_kib / 1024.0,
+        "peak_rss_mib": peak_kib / 1024.0,
+    }
+
+
+def write_scaled_copy(source: Path, workdir: Path, scale: int) -> Path:
+    """Repeat every hit `scale` times, shifting each copy past the end of the previous one."""
+    target = workdir / f"{source.stem}_x{scale}.csv"
+    if target.exists():
+        return target
+
+    with source.open("r", encoding="utf-8-sig", errors="replace", newline="") as handle:
+        lines = handle.read().splitlines()
+    header_index = next(i for i, line in enumerate(lines) if line.startswith("Arrival time,"))
+    rows = [line.split(",", 1) for line in lines[header_index + 1 :] if line.strip()]
+    times = [parse_arrival_time(arrival) for arrival, _ in rows]
+    span = max(times) - min(times) + 1.0
+
+    with target.open("w", encoding="utf-8", newline="") as out:
+        out.write("\n".join(lines[: header_index + 1]) + "\n")
+        for copy in range(scale):
+            offset = copy * span
+            for (_, rest), seconds in zip(rows, times):
+                out.write(f"{format_arrival_time(seconds + offset)},{rest}\n")
+    return target
+
+
+def format_arrival_time(seconds: float) -> str:
+    whole = int(seconds)
+    micros = int(round((seconds - whole) * 1_000_000))
+    if micros >= 1_000_000:
+        whole += 1
+        micros -= 1_000_000
+    minutes, second = divmod(whole, 60)
+    hours, minute = divmod(minutes, 60)
+    day, hour = divmod(hours, 24)
+    return f"{day}:{hour:02d}:{minute:02d}:{second:02d}:{micros // 1000:03d} {micros % 1000:03d}000"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the STOR-HY replica FMUs.
+
+- `step`: per-step time and Python allocations of ReplicaBase.do_step for
+  every registered model, next to the previous dict-based step (a parameter
+  dict, the model's output dict and one setattr per output). Allocations are
+  reported as the tracemalloc high-water mark of a single step above the
+  memory already in use, and as the net change in allocated blocks per step
+  (which stays at 0 unless a step leaks). Parameters are held constant, so
+  for models that are not time dependent every do_step after the first
+  reuses the stored outputs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu" / "storhy_replicas"))
+
+from storhy_replica_common import (  # noqa: E402
+    INTEGER_OUTPUTS,
+    MODEL_CODES,
+    OUTPUT_DEFAULTS,
+    PARAMETER_DEFAULTS,
+    ReplicaBase,
+    compute_declared_outputs,
+    get_model,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    step = subparsers.add_parser("step", help="Per-step time and allocations of do_step.")
+    step.add_argument(
+        "--model",
+        nargs="+",
+        default=sorted(MODEL_CODES),
+        help="MODEL_KEYs to benchmark (default: every registered model).",
+    )
+    step.add_argument(
+        "--steps",
+        type=int,
+        default=20000,
+        help="Timed steps per model (default: %(default)s).",
+    )
+    step.add_argument(
+        "--allocation-steps",
+        type=int,
+        default=200,
+        help="Steps traced with tracemalloc per model (default: %(default)s).",
+    )
+    step.add_argument(
+        "--step-size",
+        type=float,
+        default=0.25,
+        help="Communication step size in hours (default: %(default)s).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    return run_step(args)
+
+
+def run_step(args: argparse.Namespace) -> int:
+    for model_key in args.model:
+        replica = type("BenchmarkReplica", (ReplicaBase,), {"MODEL_KEY": model_key})(instance_name="benchmark")
+        replica.enter_initialization_mode()
+        reference = SimpleNamespace(**PARAMETER_DEFAULTS, **OUTPUT_DEFAULTS)
+        paths = {
+            "slots": lambda t: replica.do_step(t, args.step_size),
+            "dict": lambda t: dict_step(reference, model_key, t),
+        }
+        for path, step in paths.items():
+            result = measure_step(step, args.steps, args.allocation_steps, args.step_size)
+            result.update({"model_key": model_key, "path": path})
+            print(json.dumps(result))
+    return 0
+
+
+def dict_step(state, model_key: str, current_time: float) -> None:
+    """Previous ReplicaBase step: attribute-backed state rebuilt through dicts every step."""
+    params = {name: getattr(state, name) for name in get_model(model_key).inputs}
+    for name, value in compute_declared_outputs(model_key, params, current_time).items():
+        if name in INTEGER_OUTPUTS:
+            value = int(round(value))
+        else:
+            value = float(value)
+        setattr(state, name, value)
+
+
+def measure_step(step, steps: int, allocation_steps: int, step_size: float) -> dict:
+    times = [index * step_size for index in range(max(steps, allocation_steps))]
+    step(0.0)
+
+    started = time.perf_counter()
+    for current_time in times[:steps]:
+        step(current_time)
+    elapsed = time.perf_counter() - started
+
+    blocks_before = sys.getallocatedblocks()
+    for current_time in times[:steps]:
+        step(current_time)
+    net_blocks = sys.getallocatedblocks() - blocks_before
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for current_time in times[:allocation_steps]:
+            tracemalloc.reset_peak()
+            in_use, _ = tracemalloc.get_traced_memory()
+            step(current_time)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - in_use)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "steps": steps,
+        "step_microseconds": elapsed / steps * 1e6 if steps else 0.0,
+        "steps_per_second": steps / elapsed if elapsed > 0 else 0.0,
+        "peak_bytes_per_step": statistics.median(peaks) if peaks else 0,
+        "max_peak_bytes_per_step": max(peaks, default=0),
+        "net_blocks_per_step": net_blocks / steps if steps else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the replica models and the AE event statistics.
+
+Times, per case, the best and median seconds per call:
+
+- `replica.compute_model_outputs.<model>`: one scalar evaluation per model.
+- `replica.step_horizon.<model>`: `--horizon` ReplicaBase.do_step calls
+  (needs pythonfmu).
+- `ae.load_event_table|summarize_events|rolling_metrics.<dataset>`: on the
+  raw CH2/CH6 files and on copies of them scaled by `--scale`.
+
+Results are written as JSON with `--output`. With `--baseline` every case is
+compared against a stored result file and the script exits with status 1
+when one is more than `--threshold` slower; `--save-baseline` writes the run
+as that baseline instead. Baselines are only comparable on the machine that
+recorded them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from functools import cache, partial
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu"))
+sys.path.insert(0, str(ROOT_DIR / "create_fmu" / "storhy_replicas"))
+
+from ae_event_stats_fmu import (  # noqa: E402
+    load_event_table,
+    resolve_dataset_path,
+    rolling_metrics,
+    summarize_events,
+)
+from benchmark_ae_event_stats import write_scaled_copy  # noqa: E402
+from storhy_replica_common import (  # noqa: E402
+    MODEL_CODES,
+    PARAMETER_DEFAULTS,
+    PYTHONFMU_AVAILABLE,
+    compute_model_outputs,
+)
+
+AE_DATASETS = {"ch2": 2, "ch6": 6}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        default=[],
+        help="Only run cases whose name contains one of these substrings.",
+    )
+    parser.add_argument("--output", default=None, help="Write the results JSON here.")
+    parser.add_argument("--baseline", default=None, help="Baseline results JSON to compare against.")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run to --baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown versus the baseline as a fraction (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timed repetitions per case (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=10000,
+        help="do_step calls per replica stepping case (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        nargs="*",
+        default=[10],
+        help="Synthetic AE scale factors besides the raw files (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="Directory for scaled AE files (default: a temporary directory).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.save_baseline and not args.baseline:
+        print("[benchmark] --save-baseline needs --baseline", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(args.workdir or tmpdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = {}
+        for name, setup in benchmark_cases(args, workdir):
+            if args.filter and not any(pattern in name for pattern in args.filter):
+                continue
+            results[name] = time_case(setup(), args.repeat)
+            print(f"[benchmark] {name}: {format_seconds(results[name]['best_seconds'])}", file=sys.stderr)
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    if args.output:
+        write_json(Path(args.output), report)
+    if args.save_baseline:
+        write_json(Path(args.baseline), report)
+        print(f"[benchmark] Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if args.baseline:
+        return compare_with_baseline(results, Path(args.baseline), args.threshold)
+    return 0
+
+
+def benchmark_cases(args: argparse.Namespace, workdir: Path):
+    """Yield (name, setup) pairs; setup() prepares the inputs and returns the timed callable."""
+    for model_key in sorted(MODEL_CODES):
+        yield f"replica.compute_model_outputs.{model_key}", lambda key=model_key: (
+            lambda: compute_model_outputs(key, PARAMETER_DEFAULTS, 12.0)
+        )
+    if PYTHONFMU_AVAILABLE:
+        for model_key in sorted(MODEL_CODES):
+            yield f"replica.step_horizon.{model_key}", lambda key=model_key: step_horizon(key, args.horizon)
+
+    datasets = {}
+    for label, dataset_id in AE_DATASETS.items():
+        source = resolve_dataset_path(dataset_id)
+        datasets[label] = lambda source=source: source
+        for scale in args.scale:
+            if scale > 1:
+                # Built on first use and shared by the three AE cases of the dataset.
+                datasets[f"{label}_x{scale}"] = cache(partial(write_scaled_copy, source, workdir, scale))
+    for label, path in datasets.items():
+        yield f"ae.load_event_table.{label}", lambda path=path: (lambda resolved=path(): load_event_table(resolved))
+        yield f"ae.summarize_events.{label}", lambda path=path: (
+            lambda table=load_event_table(path()): summarize_events(table)
+        )
+        yield f"ae.rolling_metrics.{label}", lambda path=path: rolling_sweep(load_event_table(path()))
+
+
+def step_horizon(model_key: str, horizon: int):
+    from storhy_replica_common import ReplicaBase
+
+    replica_class = type("BenchmarkReplica", (ReplicaBase,), {"MODEL_KEY": model_key})
+
+    def run():
+        replica = replica_class(instance_name="benchmark")
+        replica.enter_initialization_mode()
+        for index in range(horizon):
+            replica.do_step(index * 0.25, 0.25)
+
+    return run
+
+
+def rolling_sweep(table, points: int = 200, window_seconds: float = 300.0):
+    """rolling_metrics at evenly spaced times across the table, as an FMU run queries it."""
+    duration = float(table.times[-1]) if len(table) else 0.0
+    times = np.linspace(0.0, duration, points)
+
+    def run():
+        for current_time in times:
+            rolling_metrics(table, float(current_time), window_seconds)
+
+    return run
+
+
+def time_case(function, repeat: int) -> dict:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    samples = [elapsed / number for elapsed in timer.repeat(repeat=max(1, repeat), number=number)]
+    return {
+        "best_seconds": min(samples),
+        "median_seconds": statistics.median(samples),
+        "number": number,
+        "repeat": len(samples),
+    }
+
+
+def compare_with_baseline(results: dict, path: Path, threshold: float) -> int:
+    try:
+        baseline = json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+    except (OSError, KeyError, json.JSONDecodeError) as exc:
+        print(f"[benchmark] Cannot read baseline {path}: {exc}", file=sys.stderr)
+        return 1
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"[benchmark] {name}: not in baseline", file=sys.stderr)
+            continue
+        ratio = result["best_seconds"] / baseline[name]["best_seconds"]
+        status = "REGRESSION" if ratio > 1.0 + threshold else "ok"
+        print(f"[benchmark] {name}: {ratio:.2f}x baseline {status}", file=sys.stderr)
+        if status != "ok":
+            regressions.append(name)
+    if regressions:
+        print(
+            f"[benchmark] {len(regressions)} case(s) slower than {1.0 + threshold:.2f}x baseline: "
+            + ", ".join(regressions),
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def write_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Convert raw AE hit CSVs into memory-mappable column directories.
+
+Each dataset is parsed once and written next to the raw files under
+`data/ae_event_statistics/converted/<file stem>/`. The AEEventStats FMU opens
+an up-to-date conversion with numpy.memmap instead of parsing the CSV, so
+parallel FMU instances share the dataset pages through the OS page cache.
+
+With `--rolling-window` the rolling_* and cumulative_energy series are also
+precomputed on the `--trace-step` grid; the FMU serves those by index when its
+window_seconds and step size match.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu"))
+
+from ae_event_stats_fmu import (  # noqa: E402
+    compute_rolling_trace,
+    converted_dataset_path,
+    dataset_catalog,
+    load_event_table,
+    resolve_dataset_path,
+    rolling_trace_path,
+    save_event_table,
+    save_rolling_trace,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Pre-convert AE hit CSVs for memory-mapped access by the AE stats FMU."
+    )
+    parser.add_argument(
+        "--dataset",
+        type=int,
+        nargs="*",
+        default=None,
+        help="AE dataset ids to convert (default: every id in the dataset catalog).",
+    )
+    parser.add_argument(
+        "--input",
+        nargs="*",
+        default=[],
+        help="Additional raw CSV files to convert next to their source.",
+    )
+    parser.add_argument(
+        "--root",
+        default=str(ROOT_DIR),
+        help="Repository root used to resolve dataset ids (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--rolling-window",
+        type=float,
+        nargs="*",
+        default=[],
+        help="window_seconds values to precompute rolling traces for (default: none).",
+    )
+    parser.add_argument(
+        "--trace-step",
+        type=float,
+        default=60.0,
+        help="FMU step size of the precomputed trace grid (default: %(default)s).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    dataset_ids = dataset_catalog(args.root).ids() if args.dataset is None else args.dataset
+    sources = [resolve_dataset_path(dataset_id, root=args.root) for dataset_id in dataset_ids]
+    sources.extend(Path(path) for path in args.input)
+    if not sources:
+        print("[ae-convert] Nothing to convert.", file=sys.stderr)
+        return 0
+
+    for source in sources:
+        if not source.is_file():
+            print(f"[ae-convert] Missing source file: {source}", file=sys.stderr)
+            return 1
+        started = time.perf_counter()
+        table = load_event_table(source)
+        target = converted_dataset_path(source)
+        save_event_table(table, target)
+        print(
+            f"[ae-convert] {source.name}: {len(table)} events -> {target} "
+            f"({time.perf_counter() - started:.2f}s)",
+            file=sys.stderr,
+        )
+        for window_seconds in args.rolling_window:
+            started = time.perf_counter()
+            trace = compute_rolling_trace(table, window_seconds, args.trace_step)
+            trace_dir = rolling_trace_path(source, window_seconds, args.trace_step)
+            save_rolling_trace(trace, trace_dir, source)
+            print(
+                f"[ae-convert] {source.name}: {len(trace.values)} rolling samples -> {trace_dir} "
+                f"({time.perf_counter() - started:.2f}s)",
+                file=sys.stderr,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
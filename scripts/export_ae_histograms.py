@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Add AE hit histograms to a workflow result file.
+
+Bins a dataset (or a dataset group) with the same EventHistograms engine the
+AEEventStats FMU uses: hit counts and energy per `--bin-seconds` time bin and
+hit counts per frequency band for frequency_centroid and peak_frequency. The
+section is stored under the `histograms` key of the result JSON, which is
+created when it does not exist yet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu"))
+
+from ae_event_stats_fmu import (  # noqa: E402
+    EventHistograms,
+    dataset_catalog,
+    merge_event_tables,
+    open_dataset,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write AE hit histograms into a workflow result JSON.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dataset", type=int, help="AE dataset id to bin.")
+    source.add_argument("--group", type=int, help="Dataset group id; its channels are binned as one stream.")
+    parser.add_argument(
+        "--bin-seconds",
+        type=float,
+        default=60.0,
+        help="Width of the time bins in seconds (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--result",
+        required=True,
+        help="Result JSON to update, e.g. data/ae_event_statistics/ae_channels_result.json.",
+    )
+    parser.add_argument(
+        "--root",
+        default=str(ROOT_DIR),
+        help="Repository root used to resolve dataset ids (default: %(default)s).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.bin_seconds <= 0:
+        print("[ae-histograms] --bin-seconds must be positive", file=sys.stderr)
+        return 2
+    try:
+        if args.group is not None:
+            dataset_ids = dataset_catalog(args.root).group(args.group)
+        else:
+            dataset_ids = [args.dataset]
+        table = merge_event_tables(open_dataset(dataset_id, root=args.root) for dataset_id in dataset_ids)
+        histograms = EventHistograms.from_table(table, args.bin_seconds)
+    except ValueError as exc:
+        print(f"[ae-histograms] {exc}", file=sys.stderr)
+        return 2
+
+    result_path = Path(args.result)
+    result = {}
+    if result_path.exists():
+        try:
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            print(f"[ae-histograms] Cannot parse {result_path}: {exc}", file=sys.stderr)
+            return 1
+    result["histograms"] = histograms.to_dict()
+    result_path.parent.mkdir(parents=True, exist_ok=True)
+    result_path.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"[ae-histograms] {len(table)} events in {len(histograms.counts)} bins -> {result_path}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,20 +2,41 @@
 """
 Pulls the most recent measurement rows from a TimescaleDB/PostgreSQL instance
 and renders them as a CSV that the Producer FMU already understands.
+
+Rows are read through a server-side cursor in `--batch-size` round trips and
+written in chronological order as they arrive, so memory use does not grow
+with `--limit`. The CSV is written to a temporary file next to `--output` and
+only replaces it once the export completes.
+
+`--since`/`--until` restrict the export to a time window. With
+`--incremental`, the last exported timestamp is kept in a sidecar state file
+(`<output>.state.json` by default) and later runs append only rows newer than
+it to the existing CSV; without a state file or CSV the first run exports the
+whole window. The state also records the CSV size it covers, so rows appended
+by a run that failed before saving its state are cut off again by the next
+run. Against a local PostgreSQL:
+
+    fetch_timescaledb_measurements.py --conninfo "host=localhost dbname=demo user=postgres sslmode=disable"
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import json
 import os
+import shutil
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Iterable, Sequence, Tuple
+from typing import Iterable, Iterator, Sequence, Tuple
 
 import psycopg
 from psycopg import sql
 
+DEFAULT_LIMIT = 1000
+
 
 def _env_default(name: str, fallback: str) -> str:
     value = os.environ.get(name)
@@ -50,8 +71,40 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--limit",
         type=int,
-        default=int(_env_default("TIMESCALE_LIMIT", "1000")),
-        help="Number of latest rows to pull (default: %(default)s or $TIMESCALE_LIMIT).",
+        default=int(_env_default("TIMESCALE_LIMIT", "0")) or None,
+        help=f"Number of latest rows to pull (default: {DEFAULT_LIMIT}, or every row when "
+        "--since/--until/--incremental is given; $TIMESCALE_LIMIT). In incremental mode "
+        "this caps the rows per run, oldest first, so later runs catch up; rows sharing "
+        "the last timestamp are always exported together, even past the cap.",
+    )
+    parser.add_argument(
+        "--since",
+        default=os.environ.get("TIMESCALE_SINCE"),
+        help="Only rows at or after this time, e.g. 2026-01-01T00:00:00+00:00 "
+        "(default: $TIMESCALE_SINCE). Parsed by the server like a literal of the time column.",
+    )
+    parser.add_argument(
+        "--until",
+        default=os.environ.get("TIMESCALE_UNTIL"),
+        help="Only rows before this time (default: $TIMESCALE_UNTIL).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Append only rows newer than the timestamp recorded in --state-file. "
+        "Rows inserted later with a timestamp at or before it are not picked up.",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=None,
+        help="Sidecar state for --incremental (default: <output>.state.json).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=int(_env_default("TIMESCALE_BATCH_SIZE", "10000")),
+        help="Rows fetched per round trip from the server-side cursor "
+        "(default: %(default)s or $TIMESCALE_BATCH_SIZE).",
     )
     parser.add_argument(
         "--conninfo",
@@ -95,9 +148,12 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    if args.limit <= 0:
+    if args.limit is not None and args.limit <= 0:
         print("[timescale] --limit must be positive", file=sys.stderr)
         return 2
+    if args.batch_size <= 0:
+        print("[timescale] --batch-size must be positive", file=sys.stderr)
+        return 2
 
     conninfo = args.conninfo or build_conninfo(args)
     if not conninfo:
@@ -107,31 +163,82 @@ def main() -> int:
         )
         return 2
 
+    windowed = bool(args.since or args.until or args.incremental)
+    limit = args.limit or (None if windowed else DEFAULT_LIMIT)
+    state_path = Path(args.state_file or f"{args.output}.state.json")
+    state = None
+    if args.incremental and Path(args.output).exists():
+        try:
+            state = read_state(state_path, args.table, args.time_column)
+        except (OSError, ValueError) as exc:
+            print(f"[timescale] Cannot use state file {state_path}: {exc}", file=sys.stderr)
+            return 2
+    elif args.incremental:
+        # The state of a CSV that is gone would not match the fresh export replacing it.
+        state_path.unlink(missing_ok=True)
+    after = state["last_timestamp"] if state else None
+    if state is not None:
+        try:
+            dropped = truncate_to_state(Path(args.output), state)
+        except (OSError, ValueError) as exc:
+            print(f"[timescale] Cannot append to {args.output}: {exc}", file=sys.stderr)
+            return 2
+        if dropped:
+            print(
+                f"[timescale] Dropped {dropped} bytes appended to {args.output} after the last saved state.",
+                file=sys.stderr,
+            )
+
     table_sql = build_table_identifier(args.table)
     time_identifier = sql.Identifier(args.time_column)
     value_identifier = sql.Identifier(args.value_column)
 
     print("[timescale] Connecting to database…", file=sys.stderr)
+    started = time.perf_counter()
     try:
-        with psycopg.connect(conninfo, autocommit=True) as conn:
-            rows = fetch_rows(
+        # Server-side cursors live inside a transaction, so no autocommit here.
+        with psycopg.connect(conninfo) as conn:
+            batches = stream_rows(
                 conn,
                 table_sql,
                 time_identifier,
                 value_identifier,
-                args.limit,
+                limit,
+                args.batch_size,
+                since=args.since,
+                until=args.until,
+                after=after,
+                oldest_first=args.incremental,
             )
+            count, last_timestamp = write_csv(args.output, batches, append=state is not None)
     except Exception as exc:  # pragma: no cover - logged by caller
         print(f"[timescale] Query failed: {exc}", file=sys.stderr)
         return 1
+    elapsed = time.perf_counter() - started
 
-    if not rows:
-        print("[timescale] No rows returned; nothing to write.", file=sys.stderr)
+    if not count:
+        if after is not None:
+            print(f"[timescale] No rows newer than {after}; nothing to append.", file=sys.stderr)
+        else:
+            print("[timescale] No rows returned; nothing to write.", file=sys.stderr)
         return 0
 
-    write_csv(args.output, rows)
+    if args.incremental:
+        write_state(
+            state_path,
+            {
+                "table": args.table,
+                "time_column": args.time_column,
+                "last_timestamp": serialize_value(last_timestamp),
+                "rows": (state["rows"] if state else 0) + count,
+                "csv_bytes": Path(args.output).stat().st_size,
+            },
+        )
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    action = "Appended" if state is not None else "Wrote"
     print(
-        f"[timescale] Wrote {len(rows)} rows to {args.output}",
+        f"[timescale] {action} {count} rows to {args.output} in {elapsed:.2f} s ({rate:,.0f} rows/s)",
         file=sys.stderr,
     )
     return 0
@@ -170,42 +277,158 @@ def build_table_identifier(identifier: str) -> sql.Composed:
     return sql.SQL(".").join(identifiers)
 
 
-def fetch_rows(
+def stream_rows(
     conn: psycopg.Connection,
     table_sql: sql.Composed,
     time_column: sql.Identifier,
     value_column: sql.Identifier,
-    limit: int,
-) -> Sequence[Tuple[object, object]]:
-    stmt = (
-        sql.SQL(
+    limit: int | None,
+    batch_size: int,
+    since: str | None = None,
+    until: str | None = None,
+    after: str | None = None,
+    oldest_first: bool = False,
+) -> Iterator[Sequence[Tuple[object, object]]]:
+    """Yield rows oldest-first, `batch_size` at a time.
+
+    `since` (inclusive), `until` (exclusive) and `after` (exclusive) bound
+    the time column. `limit` keeps the latest rows of that range, or the
+    earliest ones with `oldest_first`; None reads the whole range. With
+    `oldest_first` the rows tied with the last one's timestamp all come
+    along, so a later `after` bound on that timestamp skips none of them.
+    """
+    conditions = []
+    params: list[object] = []
+    for operator, bound in ((">=", since), ("<", until), (">", after)):
+        if bound is not None:
+            conditions.append(sql.SQL("{time_col} " + operator + " %s").format(time_col=time_column))
+            params.append(bound)
+    where = sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("")
+
+    if limit is None or oldest_first:
+        template = "SELECT {time_col}, {value_col} FROM {table}{where} ORDER BY {time_col}"
+        if limit is not None:
+            template += " FETCH FIRST %s ROWS WITH TIES"
+    else:
+        # The inner query picks the newest rows; the outer one hands them out chronologically.
+        template = (
+            "SELECT {time_col}, {value_col} FROM ("
             "SELECT {time_col}, {value_col} "
-            "FROM {table} "
+            "FROM {table}{where} "
             "ORDER BY {time_col} DESC "
             "LIMIT %s"
+            ") AS latest "
+            "ORDER BY {time_col}"
         )
-        .format(
-            time_col=time_column,
-            value_col=value_column,
-            table=table_sql,
-        )
+    if limit is not None:
+        params.append(limit)
+    stmt = sql.SQL(template).format(
+        time_col=time_column,
+        value_col=value_column,
+        table=table_sql,
+        where=where,
     )
-    with conn.cursor() as cur:
-        cur.execute(stmt, (limit,))
-        rows = cur.fetchall()
-    # Query sorted newest-first; reverse so CSV is chronological.
-    rows.reverse()
-    return rows
+    with conn.cursor(name="timescale_export") as cur:
+        cur.itersize = batch_size
+        cur.execute(stmt, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
 
+def write_csv(
+    path: str,
+    batches: Iterable[Sequence[Tuple[object, object]]],
+    append: bool = False,
+) -> Tuple[int, object]:
+    """Write the row batches to `path`, or append them without a header.
 
-def write_csv(path: str, rows: Iterable[Tuple[object, object]]) -> None:
+    Returns the row count and the last row's timestamp; nothing is written
+    for zero rows. Rows are staged in a temporary file first, so a failed
+    export leaves `path` untouched; an append that fails part-way is
+    truncated back to the original size.
+    """
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w", newline="") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(["timestamp", "value"])
-        for timestamp, value in rows:
-            writer.writerow([serialize_value(timestamp), serialize_value(value)])
+    count = 0
+    last_timestamp = None
+    with tempfile.NamedTemporaryFile(
+        "w", newline="", dir=target.parent, prefix=f".{target.name}.", delete=False
+    ) as handle:
+        try:
+            writer = csv.writer(handle)
+            if not append:
+                writer.writerow(["timestamp", "value"])
+            for rows in batches:
+                writer.writerows(
+                    [serialize_value(timestamp), serialize_value(value)] for timestamp, value in rows
+                )
+                count += len(rows)
+                last_timestamp = rows[-1][0]
+        except BaseException:
+            handle.close()
+            os.unlink(handle.name)
+            raise
+    if not count:
+        os.unlink(handle.name)
+    elif append:
+        try:
+            with open(handle.name, "rb") as staged, target.open("ab") as output:
+                size = output.tell()
+                try:
+                    shutil.copyfileobj(staged, output)
+                    output.flush()
+                except BaseException:
+                    output.truncate(size)
+                    raise
+        finally:
+            os.unlink(handle.name)
+    else:
+        os.replace(handle.name, target)
+    return count, last_timestamp
+
+
+def read_state(path: Path, table: str, time_column: str) -> dict | None:
+    """Load the incremental state, or None when there is none yet."""
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("table") != table or state.get("time_column") != time_column:
+        raise ValueError(
+            f"it tracks {state.get('table')}.{state.get('time_column')}, not {table}.{time_column}; "
+            "remove it to start a fresh export"
+        )
+    if not state.get("last_timestamp"):
+        raise ValueError("missing last_timestamp")
+    state.setdefault("rows", 0)
+    return state
+
+
+def truncate_to_state(path: Path, state: dict) -> int:
+    """Cut `path` back to the size recorded in `state`; returns the bytes dropped.
+
+    A larger file holds rows appended by a run that stopped before saving
+    its state; they are dropped so the next append does not repeat them.
+    """
+    recorded = state.get("csv_bytes")
+    if recorded is None:
+        return 0
+    size = path.stat().st_size
+    if size < recorded:
+        raise ValueError(f"it is shorter than the {recorded} bytes in the state file; remove the state to re-export")
+    if size > recorded:
+        with path.open("r+b") as handle:
+            handle.truncate(recorded)
+    return size - recorded
+
+
+def write_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staged = path.with_name(f".{path.name}.tmp")
+    staged.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    os.replace(staged, path)
 
 
 def serialize_value(value: object) -> str:
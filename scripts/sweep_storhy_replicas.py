@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Evaluate a STOR-HY replica model over a parameter sweep.
+
+The sweep is described by a YAML spec:
+
+    model: predictive_maintenance
+    sampling: grid            # or lhs (Latin hypercube)
+    samples: 1000             # lhs only
+    seed: 7                   # lhs only
+    times: [0.0, 12.0, 24.0]  # every point is evaluated at each time (default: [0.0])
+    parameters:
+      scenario_id: [1, 2, 3, 4]
+      input_risk_index: {min: 0.0, max: 1.0, num: 21}
+      input_score: 78.0
+
+A list gives discrete values and `{min, max, num}` a range: `num` evenly
+spaced values on a grid, a continuous interval under lhs (integer parameters
+take whole numbers; `num` may be omitted for them). Scalars are held fixed and
+model inputs the spec leaves out keep their PARAMETER_DEFAULTS value; a scalar
+`times` evaluates every point at that one time.
+
+Rows are evaluated in chunks with compute_model_outputs_batch, the vectorised
+form of compute_model_outputs, across a process pool. Chunks are spooled to
+disk as they complete and packed into an NPZ file with one column per model
+input, `time` and every replica output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "create_fmu"))
+sys.path.insert(0, str(ROOT_DIR / "create_fmu" / "storhy_replicas"))
+
+from npz_stream import open_npy_member  # noqa: E402
+from storhy_replica_common import (  # noqa: E402
+    INTEGER_PARAMETERS,
+    MODEL_REGISTRY,
+    PARAMETER_DEFAULTS,
+    compute_model_outputs_batch,
+)
+
+
+@dataclass(frozen=True)
+class SweepPlan:
+    """Rows of a sweep as the product of its dimensions.
+
+    Each dimension maps column names to equal-length value arrays; a grid
+    has one dimension per swept parameter, a Latin hypercube one joint
+    dimension, and `time` is always the last (fastest varying) dimension.
+    """
+
+    model_key: str
+    dimensions: tuple
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(next(iter(dimension.values()))) for dimension in self.dimensions)
+
+    @property
+    def rows(self) -> int:
+        return math.prod(self.shape)
+
+    def columns(self, start: int, stop: int) -> dict:
+        indices = np.unravel_index(np.arange(start, stop), self.shape)
+        return {
+            name: values[index]
+            for dimension, index in zip(self.dimensions, indices)
+            for name, values in dimension.items()
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("spec", help="Sweep spec YAML file.")
+    parser.add_argument("--output", required=True, help="NPZ file to write.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes; 1 evaluates in this process (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=65536,
+        help="Rows evaluated per batch (default: %(default)s).",
+    )
+    parser.add_argument("--compress", action="store_true", help="Deflate the NPZ members.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        plan = load_sweep_plan(args.spec)
+    except (OSError, ValueError) as exc:
+        print(f"[sweep] {exc}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    rows = run_sweep(plan, Path(args.output), args.workers, args.chunk_rows, args.compress)
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[sweep] {plan.model_key}: {rows} evaluations in {elapsed:.2f} s ({rate:,.0f} evals/s) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def load_sweep_plan(path) -> SweepPlan:
+    yaml = import_yaml()
+    with open(path, "r", encoding="utf-8") as handle:
+        spec = yaml.safe_load(handle) or {}
+    return sweep_plan(spec)
+
+
+def sweep_plan(spec: dict) -> SweepPlan:
+    model_key = spec.get("model")
+    model = MODEL_REGISTRY.get(model_key)
+    if model is None:
+        raise ValueError(f"unknown replica model {model_key!r}")
+    parameters = dict(spec.get("parameters") or {})
+    unused = sorted(set(parameters) - set(model.inputs))
+    if unused:
+        raise ValueError(f"{model_key} does not read {', '.join(unused)}")
+    for name in model.inputs:
+        parameters.setdefault(name, PARAMETER_DEFAULTS[name])
+
+    fixed = {name: value for name, value in parameters.items() if not isinstance(value, (list, dict))}
+    swept = {name: value for name, value in parameters.items() if name not in fixed}
+    sampling = spec.get("sampling", "grid")
+    if sampling == "grid":
+        dimensions = [{name: grid_values(name, value)} for name, value in swept.items()]
+    elif sampling == "lhs":
+        samples = int(spec.get("samples", 0))
+        if samples <= 0:
+            raise ValueError("lhs sampling needs a positive 'samples' count")
+        dimensions = [latin_hypercube(swept, samples, np.random.default_rng(spec.get("seed")))] if swept else []
+    else:
+        raise ValueError(f"unknown sampling {sampling!r}; expected grid or lhs")
+
+    if fixed:
+        dimensions.append({name: column(name, [value]) for name, value in fixed.items()})
+    times = np.atleast_1d(np.asarray(spec.get("times", [0.0]), dtype=np.float64))
+    if times.ndim != 1 or not times.size:
+        raise ValueError("'times' must be a number or a non-empty list of numbers")
+    dimensions.append({"time": times})
+    return SweepPlan(model_key, tuple(dimensions))
+
+
+def grid_values(name: str, value) -> np.ndarray:
+    if isinstance(value, list):
+        return column(name, value)
+    low, high = float(value["min"]), float(value["max"])
+    if name in INTEGER_PARAMETERS:
+        num = value.get("num", int(high - low) + 1)
+        return column(name, np.round(np.linspace(low, high, num)))
+    if "num" not in value:
+        raise ValueError(f"grid range for {name} needs 'num'")
+    return column(name, np.linspace(low, high, int(value["num"])))
+
+
+def latin_hypercube(swept: dict, samples: int, rng: np.random.Generator) -> dict:
+    """One stratified draw per sample and parameter, with the strata shuffled independently."""
+    dimension = {}
+    for name, value in swept.items():
+        quantiles = (rng.permutation(samples) + rng.random(samples)) / samples
+        if isinstance(value, list):
+            choices = column(name, value)
+            dimension[name] = choices[(quantiles * len(choices)).astype(np.int64)]
+        elif name in INTEGER_PARAMETERS:
+            low, high = int(value["min"]), int(value["max"])
+            dimension[name] = column(name, low + np.floor(quantiles * (high - low + 1)))
+        else:
+            low, high = float(value["min"]), float(value["max"])
+            dimension[name] = column(name, low + quantiles * (high - low))
+    return dimension
+
+
+def column(name: str, values) -> np.ndarray:
+    return np.asarray(values, dtype=np.int64 if name in INTEGER_PARAMETERS else np.float64)
+
+
+def evaluate_chunk(plan: SweepPlan, start: int, stop: int) -> dict:
+    columns = plan.columns(start, stop)
+    times = columns.pop("time")
+    outputs = compute_model_outputs_batch(plan.model_key, columns, times)
+    return {**columns, "time": times, **outputs}
+
+
+def run_sweep(plan: SweepPlan, output: Path, workers: int, chunk_rows: int, compress: bool = False) -> int:
+    bounds = [(start, min(start + chunk_rows, plan.rows)) for start in range(0, plan.rows, chunk_rows)]
+    with tempfile.TemporaryDirectory(dir=output.parent if output.parent.exists() else None) as spool_dir:
+        spool = ColumnSpool(Path(spool_dir))
+        if workers <= 1 or len(bounds) <= 1:
+            for start, stop in bounds:
+                spool.append(evaluate_chunk(plan, start, stop))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                starts, stops = zip(*bounds)
+                for columns in executor.map(evaluate_chunk, [plan] * len(bounds), starts, stops):
+                    spool.append(columns)
+        spool.write_npz(output, compress)
+    return plan.rows
+
+
+class ColumnSpool:
+    """Append-only raw column files packed into an NPZ at the end.
+
+    Keeps memory bounded by one chunk; the NPZ members are written by
+    streaming each spooled column behind its .npy header.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.dtypes = {}
+        self.rows = 0
+
+    def append(self, columns: dict) -> None:
+        for name, values in columns.items():
+            values = np.ascontiguousarray(values)
+            self.dtypes.setdefault(name, values.dtype)
+            with open(self.directory / name, "ab") as handle:
+                handle.write(values.astype(self.dtypes[name], copy=False).tobytes())
+        self.rows += len(next(iter(columns.values())))
+
+    def write_npz(self, path: Path, compress: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(path, "w", compression=compression, allowZip64=True) as archive:
+            for name, dtype in self.dtypes.items():
+                with open_npy_member(archive, name, dtype, self.rows) as member:
+                    with open(self.directory / name, "rb") as handle:
+                        shutil.copyfileobj(handle, member)
+
+
+def import_yaml():
+    try:
+        import yaml
+    except ImportError as exc:  # pragma: no cover - depends on local environment
+        print(
+            "[sweep] PyYAML is required for sweep specs. Install it with 'python3 -m pip install pyyaml'.",
+            file=sys.stderr,
+        )
+        raise SystemExit(1) from exc
+    return yaml
+
+
+if __name__ == "__main__":
+    sys.exit(main())